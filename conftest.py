@@ -0,0 +1,10 @@
+"""
+Keeps pytest runs out of the repo's .cache: data_version reads
+FINANCE_CACHE_DIR once, when the first test module imports it, so the
+temporary directory has to be set before any test module is collected
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp(prefix='finance-tests-'))
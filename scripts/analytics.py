@@ -0,0 +1,89 @@
+"""
+In-process analytics for Personal Finance Dashboard
+Builds dashboard frames from the lean grouped results returned by the named queries
+"""
+
+import numpy as np
+import pandas as pd
+from compact import compact_frame, from_cents
+
+# Bucket column produced by each view's queries
+BUCKETS = {'monthly': 'month', 'weekly': 'week', 'daily': 'day'}
+
+
+def balance_matrix(amounts, bucket, opening=None):
+    """
+    Turns long-form (bucket, account, amount) rows into running balances:
+    one row per bucket, one column per account, plus net_worth.
+    Works for whatever accounts exist in the data. opening holds
+    (account, amount) balances from before the first bucket, for when
+    the rows only cover part of the history.
+    """
+    if amounts.empty:
+        return pd.DataFrame(columns=[bucket, 'net_worth'])
+
+    all_accounts = amounts['account']
+    if opening is not None and not opening.empty:
+        all_accounts = pd.concat([all_accounts, opening['account']], ignore_index=True)
+    bucket_codes, buckets = pd.factorize(amounts[bucket], sort=True)
+    codes, accounts = pd.factorize(all_accounts, sort=True)
+    account_codes = codes[:len(amounts)]
+
+    matrix = np.zeros((len(buckets), len(accounts)))
+    np.add.at(matrix, (bucket_codes, account_codes), amounts['amount'].to_numpy(dtype=float))
+    np.cumsum(matrix, axis=0, out=matrix)
+    if len(codes) > len(amounts):
+        start = np.zeros(len(accounts))
+        np.add.at(start, codes[len(amounts):], opening['amount'].to_numpy(dtype=float))
+        matrix += start
+
+    balances = pd.DataFrame(matrix, columns=list(accounts))
+    balances.insert(0, 'net_worth', matrix.sum(axis=1))
+    balances.insert(0, bucket, buckets)
+    balances.index = range(1, len(balances) + 1)
+    return balances
+
+
+def account_columns(balances):
+    """Return the plottable balance columns of a balance matrix"""
+    return list(balances.columns[1:])
+
+
+def _totals_by(rows, key, txn_type, value_name):
+    """ROUND(ABS(SUM(amount))) of one transaction type grouped by key, largest first"""
+    subset = rows.loc[rows['type'] == txn_type]
+    totals = subset.groupby(key, sort=False, observed=True)['amount_cents'].sum()
+    totals = from_cents(totals[totals != 0]).abs().round()
+    frame = totals.sort_values(ascending=False).rename(value_name).reset_index()
+    frame.index = range(1, len(frame) + 1)
+    return frame
+
+
+def split_snapshot(rows, bucket, opening=None):
+    """
+    Splits one grouped (bucket, type, account, category, amount) result into
+    every Dashboard tab frame, so all panels come from a single consistent read.
+    opening is passed on to balance_matrix when the rows start mid-history.
+    The rows are grouped in the compact layout: categorical labels and
+    exact integer cents.
+    """
+    if rows.empty:
+        rows = pd.DataFrame(columns=[bucket, 'type', 'account', 'category', 'amount'], dtype=float)
+    rows = compact_frame(rows)
+
+    account_amounts = rows.groupby([bucket, 'account'], sort=False, observed=True)['amount_cents'].sum()
+    account_amounts = from_cents(account_amounts).round().rename('amount').reset_index()
+
+    expenses = rows.loc[rows['type'] == 'Expense'].groupby(bucket)['amount_cents'].sum()
+    expenses = from_cents(expenses).abs().round()
+    expenses = expenses.rename('expenses').reset_index()
+    expenses.index = range(1, len(expenses) + 1)
+
+    return {
+        'balances': balance_matrix(account_amounts, bucket, opening),
+        'payment_methods': _totals_by(rows, 'account', 'Expense', 'amount'),
+        'receiving_methods': _totals_by(rows, 'account', 'Income', 'amount'),
+        'expenses_per_category': _totals_by(rows, 'category', 'Expense', 'expenses'),
+        'income_per_category': _totals_by(rows, 'category', 'Income', 'income'),
+        'expenses': expenses,
+    }
@@ -1,7 +1,16 @@
-from database_mysql import extract, transform, load, drop, create_database
-from read_queries_mysql import query
+from database_mysql import get_mysql_connection, stream_load, load_files, drop, create_database
+from read_queries_mysql import query, amount_over_time, dashboard_snapshot, filter_options, explain, QUERY_FILE
+from sidebar_filters import sidebar_filters
+from analytics import account_columns
+from etl_jobs import submit_upload, upload_progress
+from query_registry import get_registry
+from query_stats import query_stats
+from result_cache import result_cache
+from engine_registry import pool_metrics
+from dashboard_cache import app_resources, frame, figure
+from transaction_browser import transaction_browser
+import pandas as pd
 import streamlit as st
-import plotly.express as px
 from PIL import Image
 from dotenv import load_dotenv
 import os
@@ -9,38 +18,76 @@ import os
 # Load environment variables
 load_dotenv()
 
+TIMING_COLUMNS = ['kind', 'name', 'wall_ms', 'db_ms', 'rows', 'bytes', 'cache']
+
+def performance_tab(run_id):
+    """Timings of this rerun, the slowest queries of the rolling window and query plans"""
+    st.subheader('This Rerun')
+    timings = pd.DataFrame(query_stats.records(run_id), columns=TIMING_COLUMNS)
+    if not timings.empty:
+        st.caption(f"{len(timings)} timings, {timings['wall_ms'].sum():.0f} ms in total")
+        st.dataframe(timings, use_container_width=True)
+    else:
+        st.info("Nothing was timed in this rerun.")
+
+    st.subheader('Slowest Queries')
+    slowest = pd.DataFrame(query_stats.slowest(limit=10))
+    if not slowest.empty:
+        st.dataframe(slowest[['name', 'calls', 'cache_hits', 'avg_ms', 'max_ms']], use_container_width=True)
+    else:
+        st.info("No queries recorded yet.")
+
+    st.subheader('Query Plan')
+    query_name = st.selectbox('Named query:', get_registry(QUERY_FILE).names())
+    if st.button('EXPLAIN'):
+        try:
+            st.dataframe(explain(query_name), use_container_width=True)
+        except Exception as e:
+            st.error(f"EXPLAIN failed: {str(e)}")
+
+    p1, p2 = st.columns(2)
+    with p1:
+        st.markdown("###### Connection Pool")
+        st.json(pool_metrics())
+    with p2:
+        st.markdown("###### Result Cache")
+        st.json(result_cache.stats())
+
 def main():
     # ----- PAGE SETUP -----
     st.set_page_config(page_title='Personal Finance Dashboard - MySQL Version',
                     page_icon=':money_with_wings:',
                     layout='wide')
+    run_id = query_stats.start_run()
+    app_resources(get_mysql_connection(), QUERY_FILE)
 
     # ----- TITLE & TABS -----
     st.title('Personal Finance Dashboard - MySQL Version')
-    tab1, tab2, tab3, tab4 = st.tabs(['Home', 'Data', 'Dashboard', 'Documentation'])
+    # Switching tabs reruns the app, so only the open tab's data path runs
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(['Home', 'Data', 'Dashboard', 'Documentation', 'Performance'],
+                                           key='tab', on_change='rerun')
 
     # ----- SIDE BAR ----- 
     with st.sidebar:
         st.header('Filters')
-        # Accounts filter
-        column_options = [
-            'net_worth', 'wallet', 'unionbank', 'seabank', 'seabank_credit', 'gcash',
-            'maya', 'maya_easy_credit', 'grabpay', 'shopeepay', 'spaylater', 'sloan',
-            'binance', 'ronin', 'bdo', 'bpi', 'borrowed_money', 'loaned_money', 'school_loans'
-        ]
-        selected_columns = st.multiselect('Select accounts to display:', column_options, default=['net_worth'])
         # Views filter
         view = st.radio("Select view:", ["monthly", "weekly", "daily"], index=1, horizontal = True, key = "sidebar")
+        # Data filters (bound into the queries as WHERE predicates)
+        filters = sidebar_filters(frame(filter_options))
+        # Accounts filter (options come from the accounts present in the data)
+        snapshot = frame(dashboard_snapshot, view, filters)
+        balances = snapshot['balances']
+        column_options = account_columns(balances)
+        selected_columns = st.multiselect('Select accounts to display:', column_options, default=['net_worth'])
         
         st.markdown("---")
         st.subheader("MySQL Connection")
         if st.button("Test MySQL Connection"):
             try:
-                from database_mysql import get_mysql_connection
-                from sqlalchemy import create_engine, text
+                from engine_registry import connect
+                from sqlalchemy import text
                 conn_uri = get_mysql_connection()
-                engine = create_engine(conn_uri)
-                with engine.connect() as connection:
+                with connect(conn_uri) as connection:
                     result = connection.execute(text("SELECT 1"))
                 st.success("✅ MySQL connection successful!")
             except Exception as e:
@@ -86,188 +133,163 @@ def main():
     try:
         # ----- DATA TAB -----
         with tab2:
-            # File input
-            file = st.file_uploader("Upload file here")
+            if tab2.open:
+                # File input
+                files = st.file_uploader("Upload file here", accept_multiple_files=True)
 
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Generate Dashboard"):
-                    if file is not None:
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("Generate Dashboard"):
+                        if files:
+                            # The upload runs as a background job; its id in the URL
+                            # brings its progress back after a browser refresh
+                            st.query_params['job'] = submit_upload([(file.name, file.getvalue()) for file in files],
+                                                                   stream_load, load_files, get_mysql_connection())
+                        else:
+                            st.error("Please upload a file before generating the dashboard.")
+            
+                with col2:
+                    if st.button("Setup Database"):
                         try:
-                            raw_transactions = extract(file)
-                            load(raw_transactions, "raw_transactions")
-                            cleaned_transactions = transform(raw_transactions)
-                            load(cleaned_transactions, "transactions")
-                            st.success("Dashboard generated successfully!")
+                            create_database()
+                            st.success("Database setup completed!")
                         except Exception as e:
-                            st.error(f"Error processing file: {str(e)}")
-                    else:
-                        st.error("Please upload a file before generating the dashboard.")
+                            st.error(f"Database setup error: {str(e)}")
+
+                if 'job' in st.query_params:
+                    upload_progress(st.query_params['job'])
             
-            with col2:
-                if st.button("Setup Database"):
+                if st.button("Clear Data"):
                     try:
-                        create_database()
-                        st.success("Database setup completed!")
+                        drop("raw_transactions")
+                        drop("transactions")
+                        st.success("Data cleared successfully!")
                     except Exception as e:
-                        st.error(f"Database setup error: {str(e)}")
-            
-            if st.button("Clear Data"):
-                try:
-                    drop("raw_transactions")
-                    drop("transactions")
-                    st.success("Data cleared successfully!")
-                except Exception as e:
-                    st.error(f"Error clearing data: {str(e)}")
+                        st.error(f"Error clearing data: {str(e)}")
             
-            # DataFrames
-            with st.expander('Raw Transactions Data'):
-                raw_transactions = query("raw_transactions")
-                if not raw_transactions.empty:
-                    st.dataframe(raw_transactions, height=400, use_container_width= True)
-                else:
-                    st.info("No raw transactions data available. Please upload a CSV file first.")
+                # DataFrames, fetched only while their expander is open
+                with st.expander('Raw Transactions Data', key='raw_transactions_expander', on_change='rerun') as raw_expander:
+                    if raw_expander.open:
+                        raw_transactions = query("raw_transactions")
+                        if not raw_transactions.empty:
+                            st.dataframe(raw_transactions, height=400, use_container_width= True)
+                        else:
+                            st.info("No raw transactions data available. Please upload a CSV file first.")
             
-            with st.expander('Cleaned Transactions Data'):
-                cleaned_transactions = query("transactions")
-                if not cleaned_transactions.empty:
-                    st.dataframe(cleaned_transactions, height=400, use_container_width= True)
-                else:
-                    st.info("No cleaned transactions data available. Please upload a CSV file first.")
+                with st.expander('Cleaned Transactions Data', key='transactions_expander', on_change='rerun') as cleaned_expander:
+                    if cleaned_expander.open:
+                        # One page at a time, fetched by key range
+                        transaction_browser(get_mysql_connection(), filters)
             
-            with st.expander('Accounts Data'):
-                accounts = query("daily_amount_over_time")
-                if not accounts.empty:
-                    st.dataframe(accounts, height=400, use_container_width= True)
-                else:
-                    st.info("No accounts data available. Please upload a CSV file first.")
+                with st.expander('Accounts Data', key='accounts_expander', on_change='rerun') as accounts_expander:
+                    if accounts_expander.open:
+                        accounts = amount_over_time("daily")
+                        if not accounts.empty:
+                            st.dataframe(accounts, height=400, use_container_width= True)
+                        else:
+                            st.info("No accounts data available. Please upload a CSV file first.")
 
         # ----- DASHBOARD TAB -----
         with tab3:
-            # Check if data exists
-            test_data = query("transactions")
-            if test_data.empty:
-                st.warning("No data available. Please upload a CSV file in the Data tab first.")
-                return
+            if tab3.open:
+                # Check if data exists
+                if balances.empty:
+                    st.warning("No data available. Please upload a CSV file in the Data tab first.")
+                    return
 
-            # Account Balance Over Time
-            with st.container():
-                if view == 'monthly':   
-                    monthly_amount_over_time = query("monthly_amount_over_time")
-                    if not monthly_amount_over_time.empty:
-                        fig_accounts_over_time = px.line(monthly_amount_over_time , x='month', y=selected_columns, title='Account Balance Over Time')
-                        st.plotly_chart(fig_accounts_over_time, use_container_width= True)
+                # Account Balance Over Time
+                with st.container():
+                    if not balances.empty:
+                        with query_stats.timer('Account Balance Over Time chart'):
+                            fig_accounts_over_time = figure(dashboard_snapshot, 'balances', view, filters, selected_columns)
+                            st.plotly_chart(fig_accounts_over_time, use_container_width= True)
                     else:
-                        st.info("No monthly data available.")
+                        st.info(f"No {view} data available.")
 
-                elif view == 'weekly':   
-                    weekly_amount_over_time = query("weekly_amount_over_time")
-                    if not weekly_amount_over_time.empty:
-                        fig_accounts_over_time = px.line(weekly_amount_over_time , x='week', y=selected_columns, title='Account Balance Over Time')
-                        st.plotly_chart(fig_accounts_over_time, use_container_width= True)
-                    else:
-                        st.info("No weekly data available.")
-
-                elif view == 'daily':   
-                    daily_amount_over_time = query("daily_amount_over_time")
-                    if not daily_amount_over_time.empty:
-                        fig_accounts_over_time = px.line(daily_amount_over_time , x='day', y=selected_columns, title='Account Balance Over Time')
-                        st.plotly_chart(fig_accounts_over_time, use_container_width= True)
-                    else:
-                        st.info("No daily data available.")
-
-            st.markdown("""---""")
+                st.markdown("""---""")
             
-            b1, b2 = st.columns(2)
-            # Payment Methods
-            with b1:
-                payment_methods = query("payment_methods")
-                if not payment_methods.empty:
-                    fig_payment_methods = px.bar(payment_methods, x='account', y='amount', title='Payment Methods')
-                    st.plotly_chart(fig_payment_methods, use_container_width= True)
-                else:
-                    st.info("No payment methods data available.")
+                b1, b2 = st.columns(2)
+                # Payment Methods
+                with b1:
+                    payment_methods = snapshot['payment_methods']
+                    if not payment_methods.empty:
+                        with query_stats.timer('Payment Methods chart'):
+                            fig_payment_methods = figure(dashboard_snapshot, 'payment_methods', view, filters)
+                            st.plotly_chart(fig_payment_methods, use_container_width= True)
+                    else:
+                        st.info("No payment methods data available.")
             
-            # Receiving Methods
-            with b2:
-                receiving_methods = query("receiving_methods")
-                if not receiving_methods.empty:
-                    fig_receiving_methods = px.bar(receiving_methods, x='account', y='amount', title='Receiving Methods')
-                    st.plotly_chart(fig_receiving_methods, use_container_width= True)
-                else:
-                    st.info("No receiving methods data available.")
+                # Receiving Methods
+                with b2:
+                    receiving_methods = snapshot['receiving_methods']
+                    if not receiving_methods.empty:
+                        with query_stats.timer('Receiving Methods chart'):
+                            fig_receiving_methods = figure(dashboard_snapshot, 'receiving_methods', view, filters)
+                            st.plotly_chart(fig_receiving_methods, use_container_width= True)
+                    else:
+                        st.info("No receiving methods data available.")
 
-            st.markdown("""---""")
+                st.markdown("""---""")
 
-            c1, c2 = st.columns(2)
-            # Expenses Per Category
-            with c1:
-                expenses_per_category = query("expenses_per_category")
-                if not expenses_per_category.empty:
-                    fig_expenses_by_category = px.pie(expenses_per_category, values='expenses', title='Expenses Per Category', names='category', hole=0.4)
-                    fig_expenses_by_category.update_traces(textposition='inside', textinfo='percent+label')
-                    st.plotly_chart(fig_expenses_by_category, use_container_width= True)
-                else:
-                    st.info("No expenses data available.")
+                c1, c2 = st.columns(2)
+                # Expenses Per Category
+                with c1:
+                    expenses_per_category = snapshot['expenses_per_category']
+                    if not expenses_per_category.empty:
+                        with query_stats.timer('Expenses Per Category chart'):
+                            fig_expenses_by_category = figure(dashboard_snapshot, 'expenses_per_category', view, filters)
+                            st.plotly_chart(fig_expenses_by_category, use_container_width= True)
+                    else:
+                        st.info("No expenses data available.")
             
-            # Income Per Category
-            with c2:
-                income_per_category = query("income_per_category")
-                if not income_per_category.empty:
-                    fig_income = px.pie(income_per_category, values='income', names='category', title='Income Per Category', hole=0.4)
-                    fig_income.update_traces(textposition='inside', textinfo='percent+label')
-                    st.plotly_chart(fig_income, use_container_width= True)
-                else:
-                    st.info("No income data available.")
+                # Income Per Category
+                with c2:
+                    income_per_category = snapshot['income_per_category']
+                    if not income_per_category.empty:
+                        with query_stats.timer('Income Per Category chart'):
+                            fig_income = figure(dashboard_snapshot, 'income_per_category', view, filters)
+                            st.plotly_chart(fig_income, use_container_width= True)
+                    else:
+                        st.info("No income data available.")
 
-            st.markdown("""---""")
+                st.markdown("""---""")
 
-            d1, d2 = st.columns(2)
-            # Top Expenses
-            with d1:
-                st.markdown("###### Top Expenses")
-                if not expenses_per_category.empty:
-                    st.dataframe(expenses_per_category, height=400, use_container_width= True)
-                else:
-                    st.info("No expenses data available.")
+                d1, d2 = st.columns(2)
+                # Top Expenses
+                with d1:
+                    st.markdown("###### Top Expenses")
+                    if not expenses_per_category.empty:
+                        st.dataframe(expenses_per_category, height=400, use_container_width= True)
+                    else:
+                        st.info("No expenses data available.")
             
-            # Top Income Sources
-            with d2:
-                st.markdown("###### Top Income Sources")
-                if not income_per_category.empty:
-                    st.dataframe(income_per_category, height=400, use_container_width= True)
-                else:
-                    st.info("No income data available.")
+                # Top Income Sources
+                with d2:
+                    st.markdown("###### Top Income Sources")
+                    if not income_per_category.empty:
+                        st.dataframe(income_per_category, height=400, use_container_width= True)
+                    else:
+                        st.info("No income data available.")
 
-            st.markdown("""---""")
+                st.markdown("""---""")
 
-            # Expenses Over Time
-            with st.container():
-                if view == 'monthly':
-                    monthly_expenses = query("monthly_expenses")
-                    if not monthly_expenses.empty:
-                        fig_monthly_expenses = px.line(monthly_expenses, x='month', y='expenses', title='Monthly Expenses')
-                        st.plotly_chart(fig_monthly_expenses, use_container_width= True)
-                    else:
-                        st.info("No monthly expenses data available.")
-                
-                elif view == "weekly":
-                    weekly_expenses = query("weekly_expenses")
-                    if not weekly_expenses.empty:
-                        fig_weekly_expenses = px.line(weekly_expenses, x='week', y='expenses', title='Weekly Expenses')
-                        st.plotly_chart(fig_weekly_expenses, use_container_width= True)
-                    else:
-                        st.info("No weekly expenses data available.")
-                
-                elif view == "daily":
-                    daily_expenses = query("daily_expenses")
-                    if not daily_expenses.empty:
-                        fig_daily_expenses = px.line(daily_expenses, x='day', y='expenses', title='Daily Expenses')
-                        st.plotly_chart(fig_daily_expenses, use_container_width= True)
+                # Expenses Over Time
+                with st.container():
+                    expenses = snapshot['expenses']
+                    if not expenses.empty:
+                        with query_stats.timer('Expenses Over Time chart'):
+                            fig_expenses = figure(dashboard_snapshot, 'expenses', view, filters)
+                            st.plotly_chart(fig_expenses, use_container_width= True)
                     else:
-                        st.info("No daily expenses data available.")
+                        st.info(f"No {view} expenses data available.")
     except Exception as e:
             st.error(f"An error occurred: {str(e)}")
+    finally:
+        # ----- PERFORMANCE TAB -----
+        # Also drawn when the Dashboard tab returns early for lack of data
+        with tab5:
+            if tab5.open:
+                performance_tab(run_id)
 
     # ----- DOCUMENTATIONS TAB -----
     with tab4:
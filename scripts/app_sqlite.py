@@ -0,0 +1,227 @@
+from database_sqlite import get_sqlite_connection, stream_load, load_files, drop
+from read_queries_sqlite import query, amount_over_time, dashboard_snapshot, filter_options, QUERY_FILE
+from sidebar_filters import sidebar_filters
+from analytics import BUCKETS, account_columns, split_snapshot
+from etl_jobs import submit_upload, upload_progress
+from query_filters import QueryFilters
+from dashboard_cache import app_resources, frame, figure
+from transaction_browser import transaction_browser
+import pandas as pd
+import streamlit as st
+from PIL import Image
+
+CONNECTION_URI = get_sqlite_connection()
+
+def main():
+    # ----- PAGE SETUP -----
+    st.set_page_config(page_title='Personal Finance Dashboard',
+                    page_icon=':money_with_wings:',
+                    layout='wide')
+
+    # ----- TITLE & TABS -----
+    st.title('Personal Finance Dashboard')
+    # Switching tabs reruns the app, so only the open tab's data path runs
+    tab1, tab2, tab3, tab4 = st.tabs(['Home', 'Data', 'Dashboard', 'Documentation'], key='tab', on_change='rerun')
+
+    # ----- SIDE BAR ----- 
+    with st.sidebar:
+        st.header('Filters')
+        # Views filter
+        view = st.radio("Select view:", ["monthly", "weekly", "daily"], index=1, horizontal = True, key = "sidebar")
+        # Accounts filter (options come from the accounts present in the data)
+        try:
+            app_resources(CONNECTION_URI, QUERY_FILE)
+            # Data filters (bound into the queries as WHERE predicates)
+            filters = sidebar_filters(frame(filter_options))
+            snapshot = frame(dashboard_snapshot, view, filters)
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+            filters = QueryFilters()
+            snapshot = split_snapshot(pd.DataFrame(), BUCKETS[view])
+        balances = snapshot['balances']
+        column_options = account_columns(balances)
+        selected_columns = st.multiselect('Select accounts to display:', column_options, default=['net_worth'])
+
+    # ----- HOME TAB -----
+    with tab1:
+        with st.container():
+            st.subheader('Project Overview')
+            st.markdown("""
+                        The Personal Finance Dashboard extracts expenditure data from Bluecoins and creates a dashboard to aid in budgeting and financial management. 
+                        Bluecoins is an expense tracking app that allows export of data in CSV format. The Personal Finance Dashboard takes this file or 
+                        any other file with the same CSV format to generate analytics.
+                        """ )
+            try:
+                personal_finance = Image.open('images/finance.jpg')
+                st.image(personal_finance, caption='Source: LittlePigPower/Shutterstock.com', use_container_width=True)
+            except FileNotFoundError:
+                st.warning(f"Image not found")
+
+        with st.container():
+            st.subheader('Motivation Behind the Project')
+            st.markdown("""
+                        I’ve been using the Bluecoins app to track my expenses for over a year now, and using my recorded data, I want to gain insights about my expenditure. 
+                        Some of the questions I aim to answer are as follows:
+
+                        1. Where am I spending the most?
+                        2. What should be my daily, weekly, and monthly budget based on my spending patterns?
+                        3. Where do most of my money come from?
+                        4. What are my most preferred payment and receiving methods?
+                        5. How much money comes in and out of my accounts over time?
+
+                        In addition, I wanted to apply what I’ve learned in programming so far. This covers Python (Pandas, SQLAlchemy, Plotly, Streamlit), 
+                        SQL (relational databases, how to write queries), Git workflow, project management and documentation.
+                        """ )
+            try:
+                architecture_diagram = Image.open('images/Architecture Diagram.jpg')
+                st.image(architecture_diagram, caption='Technologies used', use_container_width=True)
+            except FileNotFoundError:
+                st.warning(f"Image not found")
+
+        with st.container():
+            st.subheader('Get Started')
+            st.markdown("""
+                        To use the app, kindly follow these instructions:
+
+                        1. Export transactions data from Bluecoins app. This will create a file called ‘transactions_list.csv’.
+                        2. Go to the ‘Data’ tab and upload the file. The dashboard is created automatically once the file is uploaded. Dataframes containing raw and
+                        derived data are also shown. You can explore the data by clicking on the expanders.
+                        3. Go to the ‘Dashboard’ tab and explore the charts. Use the filters on the left sidebar to show specific plots or views.
+                        """ )
+    try:
+        # ----- DATA TAB -----
+        with tab2:
+            if tab2.open:
+                # File input
+                files = st.file_uploader("Upload file here", accept_multiple_files=True)
+
+                if st.button("Generate Dashboard"):
+                    if files:
+                        # The upload runs as a background job; its id in the URL
+                        # brings its progress back after a browser refresh
+                        st.query_params['job'] = submit_upload([(file.name, file.getvalue()) for file in files],
+                                                               stream_load, load_files, CONNECTION_URI)
+                    else:
+                        st.error("Please upload a file before generating the dashboard.")
+                if 'job' in st.query_params:
+                    upload_progress(st.query_params['job'])
+            
+                if st.button("Clear Data"):
+                    drop("raw_transactions", CONNECTION_URI)
+                    drop("transactions", CONNECTION_URI)
+            
+                # DataFrames, fetched only while their expander is open
+                with st.expander('Raw Transactions Data', key='raw_transactions_expander', on_change='rerun') as raw_expander:
+                    if raw_expander.open:
+                        raw_transactions = query("raw_transactions")
+                        st.dataframe(raw_transactions, height=400, use_container_width= True)
+                with st.expander('Cleaned Transactions Data', key='transactions_expander', on_change='rerun') as cleaned_expander:
+                    if cleaned_expander.open:
+                        # One page at a time, fetched by key range
+                        transaction_browser(CONNECTION_URI, filters)
+                with st.expander('Accounts Data', key='accounts_expander', on_change='rerun') as accounts_expander:
+                    if accounts_expander.open:
+                        accounts = amount_over_time("daily")
+                        st.dataframe(accounts, height=400, use_container_width= True)
+
+        # ----- DASHBOARD TAB -----
+        with tab3:
+            if tab3.open:
+                # Account Balance Over Time
+                with st.container():
+                    if not balances.empty:
+                        fig_accounts_over_time = figure(dashboard_snapshot, 'balances', view, filters, selected_columns)
+                        st.plotly_chart(fig_accounts_over_time, use_container_width= True)
+                    else:
+                        st.info(f"No {view} data available. Please upload a CSV file in the Data tab first.")
+
+                st.markdown("""---""")
+            
+                b1, b2 = st.columns(2)
+                # Payment Methods
+                with b1:
+                    payment_methods = snapshot['payment_methods']
+                    if not payment_methods.empty:
+                        fig_payment_methods = figure(dashboard_snapshot, 'payment_methods', view, filters)
+                        st.plotly_chart(fig_payment_methods, use_container_width= True)
+                    else:
+                        st.info("No payment methods data available.")
+                # Receiving Methods
+                with b2:
+                    receiving_methods = snapshot['receiving_methods']
+                    if not receiving_methods.empty:
+                        fig_receiving_methods = figure(dashboard_snapshot, 'receiving_methods', view, filters)
+                        st.plotly_chart(fig_receiving_methods, use_container_width= True)
+                    else:
+                        st.info("No receiving methods data available.")
+
+                st.markdown("""---""")
+
+                c1, c2 = st.columns(2)
+                # Expenses Per Category
+                with c1:
+                    expenses_per_category = snapshot['expenses_per_category']
+                    if not expenses_per_category.empty:
+                        fig_expenses_by_category = figure(dashboard_snapshot, 'expenses_per_category', view, filters)
+                        st.plotly_chart(fig_expenses_by_category, use_container_width= True)
+                    else:
+                        st.info("No expenses data available.")
+                # Income Per Category
+                with c2:
+                    income_per_category = snapshot['income_per_category']
+                    if not income_per_category.empty:
+                        fig_income = figure(dashboard_snapshot, 'income_per_category', view, filters)
+                        st.plotly_chart(fig_income, use_container_width= True)
+                    else:
+                        st.info("No income data available.")
+
+                st.markdown("""---""")
+
+                d1, d2 = st.columns(2)
+                # Top Expenses
+                with d1:
+                    st.markdown("###### Top Expenses")
+                    if not expenses_per_category.empty:
+                        st.dataframe(expenses_per_category, height=400, use_container_width= True)
+                    else:
+                        st.info("No expenses data available.")
+                # Top Income Sources
+                with d2:
+                    st.markdown("###### Top Income Sources")
+                    if not income_per_category.empty:
+                        st.dataframe(income_per_category, height=400, use_container_width= True)
+                    else:
+                        st.info("No income data available.")
+
+                st.markdown("""---""")
+
+                # Expenses Over Time
+                with st.container():
+                    expenses = snapshot['expenses']
+                    if not expenses.empty:
+                        fig_expenses = figure(dashboard_snapshot, 'expenses', view, filters)
+                        st.plotly_chart(fig_expenses, use_container_width= True)
+                    else:
+                        st.info(f"No {view} expenses data available.")
+    except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+
+    # ----- DOCUMENTATIONS TAB -----
+    with tab4:
+        st.subheader('Architecture Diagram')
+        try:
+            architecture_diagram = Image.open('images/Architecture Diagram.jpg')
+            st.image(architecture_diagram)
+        except FileNotFoundError:
+                st.warning(f"Image not found")
+
+        st.subheader('How It Works')
+        try:
+            architecture_diagram = Image.open('images/workflow.png')
+            st.image(architecture_diagram)
+        except FileNotFoundError:
+                st.warning(f"Image not found")
+
+
+if __name__ == '__main__':
+    main()
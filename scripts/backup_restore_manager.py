@@ -9,15 +9,19 @@ import sys
 import subprocess
 import shutil
 from datetime import datetime
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from database_mysql import get_mysql_connection
+from engine_registry import get_engine
+from data_version import bump_data_version
+from snapshot import refresh_snapshot
+from rollups import refresh_rollups
 import gzip
 import json
 
 class BackupRestoreManager:
-    def __init__(self):
+    def __init__(self, backup_dir="backups"):
         self.engine = None
-        self.backup_dir = "backups"
+        self.backup_dir = backup_dir
         self.db_name = "personal_finance_dashboard"
         
         # Create backup directory if it doesn't exist
@@ -28,7 +32,7 @@ class BackupRestoreManager:
         """Establish database connection"""
         try:
             connection_uri = get_mysql_connection()
-            self.engine = create_engine(connection_uri)
+            self.engine = get_engine(connection_uri)
             
             # Test connection
             with self.engine.connect() as conn:
@@ -73,6 +77,27 @@ class BackupRestoreManager:
         
         return None, None, None, None
     
+    def get_generated_columns(self, conn, table):
+        """
+        Names of table's generated columns (the week_start/month_start
+        buckets of transactions). MySQL computes them itself and rejects
+        inserted values, so they are left out of data backups and restores.
+        """
+        columns = conn.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = :table AND extra LIKE '%GENERATED%'
+        """), {'table': table}).scalars().all()
+        return {column.lower() for column in columns}
+    
+    def refresh_dashboard_data(self):
+        """
+        Rebuild the rollup tables and the Parquet snapshot the dashboard
+        reads, under a new data version, after a restore replaced transactions
+        """
+        connection_uri = get_mysql_connection()
+        refresh_rollups(connection_uri)
+        refresh_snapshot(connection_uri, bump_data_version())
+    
     def create_full_backup(self, compress=True):
         """Create full database backup using mysqldump"""
         try:
@@ -161,11 +186,13 @@ class BackupRestoreManager:
                         result = conn.execute(text(f"SELECT * FROM {table}"))
                         rows = result.fetchall()
                         columns = result.keys()
+                        generated = self.get_generated_columns(conn, table)
                         
                         # Convert to list of dictionaries
                         table_data = []
                         for row in rows:
-                            row_dict = dict(zip(columns, row))
+                            row_dict = {column: value for column, value in zip(columns, row)
+                                        if column.lower() not in generated}
                             # Convert datetime objects to strings
                             for key, value in row_dict.items():
                                 if isinstance(value, datetime):
@@ -242,6 +269,7 @@ class BackupRestoreManager:
                 print(f"❌ Restore failed: {stderr.decode()}")
                 return False
             
+            self.refresh_dashboard_data()
             print("✅ Database restored successfully!")
             return True
             
@@ -249,6 +277,42 @@ class BackupRestoreManager:
             print(f"❌ Error restoring backup: {e}")
             return False
     
+    def restore_tables(self, conn, backup_data):
+        """Replace the rows of each table in a data backup with the backed-up rows"""
+        for table_name, table_data in backup_data.items():
+            if not table_data:
+                continue
+                    
+            print(f"  📊 Restoring {len(table_data)} rows to {table_name}")
+                    
+            # Clear existing data
+            conn.execute(text(f"DELETE FROM {table_name}"))
+                    
+            # Backups taken before generated columns were skipped still contain them
+            generated = self.get_generated_columns(conn, table_name)
+                    
+            # Insert data
+            for row in table_data:
+                row = {key: value for key, value in row.items() if key.lower() not in generated}
+                # Convert string dates back to datetime if needed
+                for key, value in row.items():
+                    if key in ['date', 'created_at', 'updated_at'] and isinstance(value, str):
+                        try:
+                            row[key] = datetime.fromisoformat(value)
+                        except:
+                            pass
+                        
+                # Build insert statement
+                columns = list(row.keys())
+                placeholders = [f":{col}" for col in columns]
+                        
+                insert_sql = f"""
+                    INSERT INTO {table_name} ({', '.join(columns)})
+                    VALUES ({', '.join(placeholders)})
+                """
+                        
+                conn.execute(text(insert_sql), row)
+    
     def restore_data_backup(self, backup_file):
         """Restore data from JSON backup"""
         try:
@@ -271,38 +335,16 @@ class BackupRestoreManager:
                 return False
             
             with self.engine.connect() as conn:
-                for table_name, table_data in backup_data.items():
-                    if not table_data:
-                        continue
-                    
-                    print(f"  📊 Restoring {len(table_data)} rows to {table_name}")
-                    
-                    # Clear existing data
-                    conn.execute(text(f"DELETE FROM {table_name}"))
-                    
-                    # Insert data
-                    for row in table_data:
-                        # Convert string dates back to datetime if needed
-                        for key, value in row.items():
-                            if key in ['date', 'created_at', 'updated_at'] and isinstance(value, str):
-                                try:
-                                    row[key] = datetime.fromisoformat(value)
-                                except:
-                                    pass
-                        
-                        # Build insert statement
-                        columns = list(row.keys())
-                        placeholders = [f":{col}" for col in columns]
-                        
-                        insert_sql = f"""
-                            INSERT INTO {table_name} ({', '.join(columns)})
-                            VALUES ({', '.join(placeholders)})
-                        """
-                        
-                        conn.execute(text(insert_sql), row)
-                
-                conn.commit()
-            
+                # Tables are cleared and refilled one at a time, so the transactions
+                # foreign keys are only consistent again once every table is back
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+                try:
+                    self.restore_tables(conn, backup_data)
+                    conn.commit()
+                finally:
+                    conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+            
+            self.refresh_dashboard_data()
             print("✅ Data restored successfully!")
             return True
             
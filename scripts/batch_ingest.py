@@ -0,0 +1,122 @@
+"""
+Batch Ingest for Personal Finance Dashboard
+Parses, validates and transforms several Bluecoins exports in parallel
+worker processes and merges the files that pass into one load
+"""
+
+import glob
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from pipeline import RAW_COLUMNS
+from validation import validate_transactions, VALID_TYPES, VALID_STATUSES
+from fingerprint import add_fingerprints
+
+# Worker processes; defaults to one per CPU
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', '0')) or None
+
+# Workers start from a fresh interpreter instead of a fork of the app, whose
+# threads (Streamlit, the upload job worker) and pooled database connections
+# a forked child would inherit in whatever state they were in
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def expand_sources(pattern):
+    """The CSV files named by a file path, a directory or a glob, in name order"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.csv')
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def prepare_file(source, name, transform, valid_types=VALID_TYPES, valid_statuses=VALID_STATUSES):
+    """
+    Reads, validates and transforms one export. source is a path or the
+    file's bytes. Returns a report dict with the file name, row and issue
+    counts, the issue table, any error message and, when the file has no
+    errors, the fingerprinted raw frame and its transform.
+    """
+    report = {'file': name, 'rows': 0, 'errors': 0, 'warnings': 0,
+              'issues': None, 'error': None, 'raw': None, 'cleaned': None}
+    try:
+        df = pd.read_csv(io.BytesIO(source) if isinstance(source, bytes) else source,
+                         usecols=lambda column: column in RAW_COLUMNS)
+        missing = [column for column in RAW_COLUMNS if column not in df.columns]
+        if missing:
+            report['error'] = f"Missing required columns: {missing}"
+            return report
+
+        issues = validate_transactions(df, valid_types, valid_statuses)
+        report.update(rows=len(df), issues=issues,
+                      errors=int((issues['severity'] == 'error').sum()),
+                      warnings=int((issues['severity'] == 'warning').sum()))
+        if report['errors']:
+            report['error'] = f"{report['errors']} validation errors"
+            return report
+
+        raw = add_fingerprints(df)
+        report.update(raw=raw, cleaned=transform(raw))
+    except Exception as e:
+        report['error'] = str(e)
+    return report
+
+
+def _merge(frames):
+    """Concatenate frames, keeping one copy of a transaction found in several files"""
+    merged = pd.concat(frames, ignore_index=True)
+    if 'fingerprint' in merged.columns:
+        merged = merged.drop_duplicates('fingerprint', ignore_index=True)
+    return merged
+
+
+def ingest_files(sources, transform, valid_types=VALID_TYPES, valid_statuses=VALID_STATUSES,
+                 workers=INGEST_WORKERS, progress=None):
+    """
+    Runs prepare_file over sources (paths, or (name, bytes) pairs) in a
+    process pool. A file that fails is reported without stopping the
+    others. progress, if given, is called as each file finishes with the
+    files done and the total, the rows read so far and the rows of the files
+    that passed validation. Returns (reports, raw, cleaned): the reports in
+    source order and the merged frames of the files without errors (None
+    when no file passed).
+    """
+    jobs = [(source[1], source[0]) if isinstance(source, tuple) else (source, os.path.basename(source))
+            for source in sources]
+    reports = [None] * len(jobs)
+
+    def finish(index, report):
+        reports[index] = report
+        if progress is not None:
+            done = [r for r in reports if r is not None]
+            progress({'files': len(done), 'total': len(jobs), 'rows': sum(r['rows'] for r in done),
+                      'valid_rows': sum(r['rows'] for r in done if r['error'] is None)})
+
+    if len(jobs) == 1:
+        # Not worth starting a pool for
+        finish(0, prepare_file(*jobs[0], transform, valid_types, valid_statuses))
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context(START_METHOD)) as executor:
+            futures = {executor.submit(prepare_file, source, name, transform, valid_types, valid_statuses): index
+                       for index, (source, name) in enumerate(jobs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    report = future.result()
+                except Exception as e:
+                    # The worker itself died, e.g. ran out of memory
+                    report = {'file': jobs[index][1], 'rows': 0, 'errors': 0, 'warnings': 0,
+                              'issues': None, 'error': str(e), 'raw': None, 'cleaned': None}
+                finish(index, report)
+
+    passed = [report for report in reports if report['error'] is None]
+    if not passed:
+        return reports, None, None
+    return reports, _merge([r['raw'] for r in passed]), _merge([r['cleaned'] for r in passed])
+
+
+def report_table(reports):
+    """One row per file: rows, errors, warnings and the error that stopped it"""
+    return pd.DataFrame([{key: report[key] for key in ('file', 'rows', 'errors', 'warnings', 'error')}
+                         for report in reports])
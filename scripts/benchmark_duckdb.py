@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+DuckDB Benchmark for Personal Finance Dashboard
+Times the dashboard's named aggregates on the same synthetic transactions
+answered by DuckDB over the Parquet snapshot and over the CSV export, by
+the pandas snapshot reader, and by the database
+
+Usage: python benchmark_duckdb.py [rows ...]
+    BENCHMARK_DB_URI selects the database (defaults to the MySQL settings);
+    the database column is skipped when it can't be reached
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+from datetime import date
+import pandas as pd
+from sqlalchemy import text
+from benchmark_load import synthetic_transactions, BENCHMARK_TABLE
+from bulk_load import write_frame
+from database_mysql import get_mysql_connection, TRANSACTION_DTYPES
+from duckdb_engine import available, run_query, parquet_source, csv_source
+from engine_registry import get_engine
+from query_filters import QueryFilters
+from snapshot import _snapshot_chunk, _aggregate
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+REPEATS = 3
+
+# (label, named query, filters) of the reads one dashboard render makes
+WORKLOAD = [
+    ('daily, all', 'daily_snapshot', QueryFilters()),
+    ('weekly, 1 year, 2 accounts', 'weekly_snapshot',
+     QueryFilters(start_date=date(2019, 1, 1), end_date=date(2019, 12, 31), accounts=('BDO', 'GCash'))),
+    ('daily balances', 'daily_account_amounts', QueryFilters()),
+    ('filter options', 'filter_options', QueryFilters()),
+]
+
+# The database's answer to daily_snapshot over the benchmark table
+DATABASE_SQL = f"""
+    SELECT date AS day, type, account, category, SUM(amount) AS amount
+    FROM {BENCHMARK_TABLE}
+    GROUP BY date, type, account, category
+"""
+
+
+def best_seconds(run):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def export_csv(df, path):
+    """The transactions as a Bluecoins export"""
+    pd.DataFrame({
+        'Type': df['type'], 'Date': df['date'].dt.strftime('%Y-%m-%d'), 'Name': df['item'],
+        'Amount': df['amount'], 'Currency': df['currency'], 'Category': df['category'],
+        'Account': df['account'], 'Status': df['status'],
+    }).to_csv(path, index=False)
+
+
+def database_engine():
+    """The benchmark database's engine, or None if it can't be reached"""
+    connection_uri = os.getenv('BENCHMARK_DB_URI') or get_mysql_connection()
+    try:
+        engine = get_engine(connection_uri)
+        with engine.connect():
+            return engine
+    except Exception as e:
+        print(f"⚠️  Skipping the database column, can't connect: {e}")
+        return None
+
+
+def main():
+    if not available():
+        print("❌ duckdb is not installed (pip install duckdb)")
+        return
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    engine = database_engine()
+    workdir = tempfile.mkdtemp()
+    try:
+        for rows in sizes:
+            df = synthetic_transactions(rows)
+            snapshot_dir = os.path.join(workdir, f"snapshot_{rows}")
+            _snapshot_chunk(df.copy()).to_parquet(snapshot_dir, partition_cols=['year'], compression='zstd', index=False)
+            csv_path = os.path.join(workdir, f"export_{rows}.csv")
+            export_csv(df, csv_path)
+
+            print(f"🦆 {rows:,} rows (best of {REPEATS}, ms)")
+            print(f"  {'query':<28} {'duckdb parquet':>15} {'duckdb csv':>12} {'pandas':>10} {'database':>10}")
+            for label, query_name, filters in WORKLOAD:
+                params = filters.params()
+                parquet_s = best_seconds(lambda: run_query(parquet_source(snapshot_dir), query_name, params))
+                csv_s = best_seconds(lambda: run_query(csv_source(csv_path), query_name, params))
+                pandas_s = best_seconds(lambda: _aggregate(snapshot_dir, query_name, params, 'mysql'))
+                database = '-'
+                if engine is not None and label == 'daily, all':
+                    with engine.begin() as conn:
+                        write_frame(df, BENCHMARK_TABLE, conn, 'replace', TRANSACTION_DTYPES)
+                    with engine.connect() as conn:
+                        database = f"{best_seconds(lambda: pd.read_sql(text(DATABASE_SQL), conn)) * 1000:10.1f}"
+                print(f"  {label:<28} {parquet_s * 1000:15.1f} {csv_s * 1000:12.1f} {pandas_s * 1000:10.1f} {database:>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if engine is not None:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Frame Layout Benchmark for Personal Finance Dashboard
+Compares the memory use and groupby time of transformed transactions held
+as object strings and float amounts with the compact layout
+
+Usage: python benchmark_frames.py [rows ...]
+"""
+
+import sys
+import time
+from benchmark_load import synthetic_transactions
+from compact import compact_frame
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+REPEATS = 5
+
+
+def object_frame(df):
+    """The layout transform() used to return: object strings, float64 amounts"""
+    return df.assign(**{column: df[column].astype(object)
+                        for column in ['type', 'item', 'currency', 'category', 'account', 'status']})
+
+
+def groupby_seconds(df, amount):
+    """Best time of the dashboard's month/type/account/category grouping"""
+    months = df['date'].dt.to_period('M')
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        df.groupby([months, 'type', 'account', 'category'], observed=True, sort=False)[amount].sum()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for rows in sizes:
+        legacy = object_frame(synthetic_transactions(rows))
+        compact = compact_frame(legacy)
+        legacy_mb = legacy.memory_usage(deep=True).sum() / 2**20
+        compact_mb = compact.memory_usage(deep=True).sum() / 2**20
+        legacy_s = groupby_seconds(legacy, 'amount')
+        compact_s = groupby_seconds(compact, 'amount_cents')
+        print(f"📏 {rows:,} rows")
+        print(f"  memory:  object {legacy_mb:8.1f} MB  compact {compact_mb:8.1f} MB  ({legacy_mb / compact_mb:.1f}x smaller)")
+        print(f"  groupby: object {legacy_s * 1000:8.1f} ms  compact {compact_s * 1000:8.1f} ms  ({legacy_s / compact_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
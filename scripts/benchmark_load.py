@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Load Benchmark for Personal Finance Dashboard
+Compares DataFrame.to_sql INSERTs with the native bulk load path on
+synthetic transactions
+
+Usage: python benchmark_load.py [rows ...]
+    BENCHMARK_DB_URI selects the database (defaults to the MySQL settings)
+    BENCHMARK_TO_SQL_MAX_ROWS skips to_sql above that many rows (default 1000000)
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from bulk_load import bulk_loader, write_frame
+from database_mysql import get_mysql_connection, TRANSACTION_DTYPES
+from engine_registry import get_engine
+
+BENCHMARK_TABLE = 'load_benchmark'
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+def synthetic_transactions(rows, seed=0):
+    """Transactions shaped like the cleaned Bluecoins export"""
+    rng = np.random.default_rng(seed)
+    accounts = np.array(['BDO', 'BPI', 'GCash', 'Maya', 'Wallet', 'Union Bank'])
+    categories = np.array(['Food & Dining', 'Transportation', 'Shopping', 'Bills & Utilities', 'Salary'])
+    return pd.DataFrame({
+        'type': rng.choice(np.array(['Expense', 'Income', 'Transfer']), rows, p=[0.8, 0.15, 0.05]),
+        'date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D'),
+        'item': 'Item ' + pd.Series(rng.integers(0, 5000, rows)).astype(str),
+        'amount': rng.integers(-500_000, 500_000, rows) / 100,
+        'currency': 'PHP',
+        'category': rng.choice(categories, rows),
+        'account': rng.choice(accounts, rows),
+        'status': 'Reconciled',
+    })
+
+
+def time_load(engine, write):
+    """Seconds taken by write(conn) in one transaction"""
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        write(conn)
+    return time.perf_counter() - start
+
+
+def main():
+    connection_uri = os.getenv('BENCHMARK_DB_URI') or get_mysql_connection()
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    to_sql_max_rows = int(os.getenv('BENCHMARK_TO_SQL_MAX_ROWS', '1000000'))
+    engine = get_engine(connection_uri)
+    with engine.connect() as conn:
+        loader = bulk_loader(conn)
+    print(f"🏁 Bulk loader for {engine.url.get_driver_name()}: {loader.__name__ if loader else 'none (to_sql)'}")
+
+    for rows in sizes:
+        df = synthetic_transactions(rows)
+        bulk = time_load(engine, lambda conn: write_frame(df, BENCHMARK_TABLE, conn, 'replace', TRANSACTION_DTYPES))
+        line = f"  {rows:>10,} rows  bulk: {bulk:8.2f}s ({rows / bulk:>10,.0f} rows/s)"
+        if rows <= to_sql_max_rows:
+            inserts = time_load(engine, lambda conn: df.to_sql(
+                name=BENCHMARK_TABLE, con=conn, if_exists='replace', index=False,
+                dtype=TRANSACTION_DTYPES, chunksize=10000))
+            line += f"  to_sql: {inserts:8.2f}s ({rows / inserts:>10,.0f} rows/s, {inserts / bulk:.1f}x slower)"
+        print(line)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Bulk Loading for Personal Finance Dashboard
+Writes DataFrames through the server's native bulk loader (MySQL LOAD DATA
+LOCAL INFILE, PostgreSQL COPY FROM STDIN, SQLite executemany), with
+DataFrame.to_sql as fallback
+"""
+
+import io
+import os
+import tempfile
+import pandas as pd
+
+# Rows serialised to CSV per bulk load statement
+BULK_ROWS = int(os.getenv('BULK_LOAD_ROWS', '100000'))
+
+# MySQL errors raised when the client or server has local_infile disabled
+LOCAL_INFILE_DISABLED = {1148, 2068, 3948}
+
+
+def _batches(df, size=BULK_ROWS):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+def _column_list(conn, df):
+    quote = conn.dialect.identifier_preparer.quote
+    return ', '.join(quote(str(column)) for column in df.columns)
+
+
+def _mysql_csv(batch):
+    """
+    CSV as LOAD DATA reads it with its default backslash escaping:
+    backslashes doubled and NULL written as \\N
+    """
+    text_columns = batch.select_dtypes(include=['object', 'string', 'str']).columns
+    if len(text_columns):
+        batch = batch.assign(**{
+            column: batch[column].astype('string').str.replace('\\', '\\\\', regex=False)
+            for column in text_columns
+        })
+    return batch.to_csv(index=False, header=False, na_rep='\\N', lineterminator='\n')
+
+
+def load_data_infile(df, table, conn):
+    """Append df to table with MySQL's LOAD DATA LOCAL INFILE"""
+    quoted_table = conn.dialect.identifier_preparer.quote(table)
+    columns = _column_list(conn, df)
+    with conn.connection.driver_connection.cursor() as cursor:
+        for batch in _batches(df):
+            _load_batch(cursor, quoted_table, columns, batch)
+
+
+def _load_batch(cursor, quoted_table, columns, batch):
+    # The client streams the file to the server by name, so it has to exist on disk
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8', newline='') as file:
+        file.write(_mysql_csv(batch))
+    try:
+        path = file.name.replace('\\', '/')
+        cursor.execute(f"""
+            LOAD DATA LOCAL INFILE '{path}' INTO TABLE {quoted_table}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+            LINES TERMINATED BY '\\n'
+            ({columns})
+        """)
+    finally:
+        os.unlink(file.name)
+
+
+def copy_from_stdin(df, table, conn):
+    """Append df to table with PostgreSQL's COPY ... FROM STDIN"""
+    quoted_table = conn.dialect.identifier_preparer.quote(table)
+    # An explicit NULL marker keeps empty strings apart from NULLs
+    sql = f"COPY {quoted_table} ({_column_list(conn, df)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    with conn.connection.driver_connection.cursor() as cursor:
+        for batch in _batches(df):
+            data = batch.to_csv(index=False, header=False, na_rep='\\N', lineterminator='\n')
+            if conn.dialect.driver == 'psycopg2':
+                cursor.copy_expert(sql, io.StringIO(data))
+            else:
+                with cursor.copy(sql) as copy:
+                    copy.write(data)
+
+
+def _sqlite_rows(batch):
+    """
+    Rows of batch as tuples of the Python values sqlite3 binds: dates as
+    ISO text (without a time when it is midnight) and missing values as None
+    """
+    columns = []
+    for column in batch.columns:
+        values = batch[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            dates_only = (values.dropna() == values.dropna().dt.normalize()).all()
+            values = values.dt.strftime('%Y-%m-%d' if dates_only else '%Y-%m-%d %H:%M:%S')
+        columns.append(values.astype(object).where(values.notna(), None))
+    return list(zip(*columns))
+
+
+def executemany_insert(df, table, conn):
+    """Append df to table with one prepared INSERT run by sqlite3's executemany per batch"""
+    quoted_table = conn.dialect.identifier_preparer.quote(table)
+    placeholders = ', '.join('?' * len(df.columns))
+    sql = f"INSERT INTO {quoted_table} ({_column_list(conn, df)}) VALUES ({placeholders})"
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        for batch in _batches(df):
+            cursor.executemany(sql, _sqlite_rows(batch))
+    finally:
+        cursor.close()
+
+
+# Native bulk loader for each driver, as named by the connection URI
+BULK_LOADERS = {
+    'pymysql': load_data_infile,
+    'psycopg2': copy_from_stdin,
+    'psycopg': copy_from_stdin,
+    'pysqlite': executemany_insert,
+}
+
+
+def bulk_loader(conn):
+    """Return the native bulk loader for conn's driver, or None"""
+    return BULK_LOADERS.get(conn.dialect.driver)
+
+
+def write_frame(df, table, conn, if_exists='append', dtype=None):
+    """
+    Drop-in for df.to_sql(table, conn, index=False). The table is created
+    (or replaced) from df's schema by to_sql, then the rows go through the
+    driver's native bulk loader. Falls back to to_sql's INSERTs for other
+    drivers, or when MySQL refuses LOAD DATA LOCAL INFILE. Returns the
+    number of rows written.
+    """
+    df.head(0).to_sql(name=table, con=conn, if_exists=if_exists, index=False, dtype=dtype)
+    loader = bulk_loader(conn)
+    if loader is not None and len(df):
+        try:
+            loader(df, table, conn)
+            return len(df)
+        except Exception as e:
+            code = e.args[0] if e.args and isinstance(e.args[0], int) else None
+            if loader is not load_data_infile or code not in LOCAL_INFILE_DISABLED:
+                raise
+            print(f"LOAD DATA LOCAL INFILE is disabled, falling back to INSERTs: {e}")
+    df.to_sql(name=table, con=conn, if_exists='append', index=False, dtype=dtype, chunksize=10000)
+    return len(df)
@@ -0,0 +1,89 @@
+"""
+Chart Data Reduction for Personal Finance Dashboard
+Thins long line series with Largest-Triangle-Three-Buckets downsampling
+before they are sent to the browser, draws them with WebGL (scattergl)
+traces once a chart has many points, and ships the values as float32
+when that keeps every amount to the cent
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Points kept per series, about one per horizontal pixel of a wide chart
+POINT_BUDGET = int(os.getenv('CHART_POINT_BUDGET', '1500'))
+
+# Points per chart above which the traces are drawn with WebGL
+WEBGL_THRESHOLD = int(os.getenv('CHART_WEBGL_THRESHOLD', '5000'))
+
+
+def lttb(x, y, budget):
+    """
+    Indices of the budget points of (x, y) that Largest-Triangle-Three-
+    Buckets keeps: the first and last points, and from each of the
+    budget - 2 buckets in between the point forming the largest triangle
+    with the point kept before it and the mean of the next bucket.
+    x must be increasing.
+    """
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, budget - 1).astype(int)
+    kept = np.empty(budget, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket's mean; the last bucket is followed by the last point
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        mean_x = x[end:next_end].mean()
+        mean_y = y[end:next_end].mean()
+        area = np.abs((x[a] - mean_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (mean_y - y[a]))
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+# Largest magnitude float32 holds to the cent: its 24-bit significand
+# counts cents exactly up to 2**24
+FLOAT32_LIMIT = 2 ** 24 / 100
+
+
+def _compact(values):
+    """values as float32 when every one stays exact to the cent, else float64"""
+    if np.nanmax(np.abs(values), initial=0) < FLOAT32_LIMIT:
+        return values.astype(np.float32)
+    return values
+
+
+def _positions(values):
+    """Numeric x for LTTB: datetimes as nanoseconds, other labels by position"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce', format='ISO8601')
+    if dates.isna().any():
+        return np.arange(len(values), dtype=float)
+    return dates.astype('int64').to_numpy(dtype=float)
+
+
+def reduced_line(df, x, columns, title, legend=True, budget=None):
+    """
+    Line chart of df's columns over x, as px.line draws it, with each series
+    reduced to budget points (POINT_BUDGET by default) and scattergl traces
+    when the chart still has more than WEBGL_THRESHOLD points
+    """
+    budget = budget or POINT_BUDGET
+    positions = _positions(df[x])
+    series = []
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)
+        kept = lttb(positions, values, budget)
+        series.append((column, df[x].to_numpy()[kept], _compact(values[kept])))
+
+    trace = go.Scattergl if sum(len(y) for _, _, y in series) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure([trace(x=xs, y=ys, name=column, mode='lines', showlegend=legend)
+                     for column, xs, ys in series])
+    fig.update_layout(title_text=title, xaxis_title=x,
+                      yaxis_title='value' if legend else columns[0], legend_title_text='variable')
+    return fig
@@ -12,4 +12,4 @@ if len(transactions) == 0:
 else:
     print('✅ Data is available')
     print(f'Date range: {transactions["date"].min()} to {transactions["date"].max()}')
-    print(f'Accounts: {transactions["Account"].unique()}')
+    print(f'Accounts: {transactions["account"].unique()}')
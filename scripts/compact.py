@@ -0,0 +1,63 @@
+"""
+Compact Transaction Frames for Personal Finance Dashboard
+Typed in-memory layout for transactions: categoricals for the low-cardinality
+columns, Arrow-backed item strings and amounts as integer cents
+"""
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    # Python-backed strings still beat object columns
+    TEXT_DTYPE = pd.StringDtype('python')
+
+# A handful of distinct values each, so categorical codes replace the strings
+CATEGORY_COLUMNS = ['type', 'category', 'account', 'currency', 'status']
+
+TEXT_COLUMNS = ['item']
+
+CENTS = 100
+
+
+def to_cents(amounts):
+    """Amounts in whole currency units as int64 cents (nullable Int64 if any are missing)"""
+    cents = (pd.to_numeric(amounts) * CENTS).round()
+    return cents.astype('int64' if cents.notna().all() else 'Int64')
+
+
+def from_cents(cents):
+    """int64 cents back to float currency units"""
+    return cents / CENTS
+
+
+def compact_frame(df):
+    """
+    The compact layout of a transactions frame (or of grouped rows with a
+    subset of its columns): categorical CATEGORY_COLUMNS, TEXT_DTYPE
+    items and amount replaced by amount_cents. Columns already compact are
+    left as they are.
+    """
+    columns = {}
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            columns[column] = df[column].astype('category')
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            columns[column] = df[column].astype(TEXT_DTYPE)
+    if 'amount' in df.columns:
+        df = df.assign(amount=to_cents(df['amount'])).rename(columns={'amount': 'amount_cents'})
+    return df.assign(**columns)
+
+
+def storage_frame(df):
+    """
+    A compact frame as the database stores it: amount in currency units
+    and plain string columns. Frames without amount_cents pass through.
+    """
+    if 'amount_cents' not in df.columns:
+        return df
+    df = df.assign(amount_cents=from_cents(df['amount_cents'])).rename(columns={'amount_cents': 'amount'})
+    return df.assign(**{column: df[column].astype(object) for column in CATEGORY_COLUMNS + TEXT_COLUMNS
+                        if column in df.columns})
@@ -0,0 +1,109 @@
+"""
+Streamlit Caches for Personal Finance Dashboard
+Keeps the engine and query registry for the life of the process, and the
+dashboard frames and built Plotly figures of the current data version
+across reruns, so a sidebar change only rebuilds what it affects. A read
+whose queries failed is shown but not kept, so an outage isn't cached.
+"""
+
+import plotly.express as px
+import streamlit as st
+from analytics import BUCKETS
+from chart_reduction import reduced_line
+from data_version import get_data_version
+from engine_registry import get_engine
+from query_registry import get_registry
+from query_stats import query_stats
+
+# Entries kept per cache; a new data version makes the old ones unreachable
+FRAME_ENTRIES = 32
+FIGURE_ENTRIES = 128
+
+
+@st.cache_resource(show_spinner=False)
+def app_resources(connection_uri, query_file):
+    """
+    The pooled engine and parsed query registry an app reads through,
+    created on the first run instead of being looked up on every rerun
+    """
+    return get_engine(connection_uri), get_registry(query_file)
+
+
+class _ReadFailed(Exception):
+    """A read whose queries failed, raised so st.cache_data doesn't store its result"""
+
+    def __init__(self, result):
+        super().__init__("A dashboard query failed")
+        self.result = result
+
+
+@st.cache_data(show_spinner=False, max_entries=FRAME_ENTRIES)
+def _cached_frame(_read, source, args, version):
+    # The read functions return empty frames on errors; query_stats counts them
+    errors = query_stats.errors()
+    result = _read(*args)
+    if query_stats.errors() != errors:
+        raise _ReadFailed(result)
+    return result
+
+
+def frame(read, *args):
+    """
+    read(*args) (a read_queries function such as dashboard_snapshot or
+    filter_options), kept across reruns until the data version changes.
+    A result with failed queries is returned without being kept.
+    """
+    try:
+        return _cached_frame(read, f"{read.__module__}.{read.__name__}", args, get_data_version())
+    except _ReadFailed as failed:
+        return failed.result
+
+
+def _balances_figure(df, view, columns):
+    return reduced_line(df, BUCKETS[view], list(columns), 'Account Balance Over Time')
+
+
+def _expenses_figure(df, view, columns):
+    return reduced_line(df, BUCKETS[view], ['expenses'], f'{view.capitalize()} Expenses', legend=False)
+
+
+def _pie(values, title):
+    def build(df, view, columns):
+        fig = px.pie(df, values=values, names='category', title=title, hole=0.4)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        return fig
+    return build
+
+
+# Builds each dashboard_snapshot panel's figure from its frame, the view
+# and the selected account columns. The line charts over time are reduced
+# to a point budget, since the daily view has a point per day.
+FIGURES = {
+    'balances': _balances_figure,
+    'payment_methods': lambda df, view, columns: px.bar(df, x='account', y='amount', title='Payment Methods'),
+    'receiving_methods': lambda df, view, columns: px.bar(df, x='account', y='amount', title='Receiving Methods'),
+    'expenses_per_category': _pie('expenses', 'Expenses Per Category'),
+    'income_per_category': _pie('income', 'Income Per Category'),
+    'expenses': _expenses_figure,
+}
+
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_ENTRIES)
+def _cached_figure(_read, source, panel, view, filters, columns, version):
+    frames = _cached_frame(_read, source, (view, filters), version)
+    return FIGURES[panel](frames[panel], view, columns)
+
+
+def figure(read, panel, view, filters, columns=()):
+    """
+    The Plotly figure of one panel of read(view, filters), where read is a
+    dashboard_snapshot function. Kept per (panel, view, filters, selected
+    account columns) until the data version changes, so picking other
+    accounts only rebuilds the balance chart.
+    """
+    columns = tuple(columns) if panel == 'balances' else ()
+    try:
+        return _cached_figure(read, f"{read.__module__}.{read.__name__}", panel, view, filters, columns,
+                              get_data_version())
+    except _ReadFailed as failed:
+        return FIGURES[panel](failed.result[panel], view, columns)
@@ -6,10 +6,21 @@ This script handles CSV data uploads, validation, and database insertion
 
 import os
 import sys
+import uuid
 import pandas as pd
 from datetime import datetime
-from sqlalchemy import create_engine, text
-from database_mysql import get_mysql_connection, extract, transform, load
+from sqlalchemy import text
+from database_mysql import get_mysql_connection, extract, transform, load, transaction_dtypes, add_reference_names
+from engine_registry import get_engine
+from data_version import bump_data_version
+from bulk_load import write_frame
+from validation import validate_transactions, issue_summary, parse_dates, VALID_TYPES, VALID_STATUSES
+from batch_ingest import expand_sources, ingest_files, report_table
+from staging import staged_load
+from fingerprint import add_fingerprints, import_new_rows, backfill_fingerprints
+from snapshot import refresh_snapshot
+from schema_mysql import TABLE_DDL, REFERENCE_TABLES
+from rollups import refresh_rollups, apply_rollup_delta, create_rollup_tables, ensure_bucket_columns
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -17,14 +28,14 @@ class DataUploadManager:
     def __init__(self):
         self.engine = None
         self.required_columns = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account', 'Status']
-        self.valid_types = ['Income', 'Expense', 'Transfer']
-        self.valid_statuses = ['Reconciled', 'Pending', 'Cleared']
+        self.valid_types = VALID_TYPES
+        self.valid_statuses = VALID_STATUSES
         
     def connect_to_database(self):
         """Establish database connection"""
         try:
             connection_uri = get_mysql_connection()
-            self.engine = create_engine(connection_uri)
+            self.engine = get_engine(connection_uri)
             
             # Test connection
             with self.engine.connect() as conn:
@@ -59,87 +70,30 @@ class DataUploadManager:
             return False, None
     
     def validate_data_content(self, df):
-        """Validate data content and quality"""
-        issues = []
-        warnings_list = []
+        """
+        Validate data content and quality. Returns (valid, issues) where
+        issues is a table of every failed check (row, column, rule,
+        severity, value); only errors make the data invalid.
+        """
+        issues = validate_transactions(df, self.valid_types, self.valid_statuses)
         
-        # Check for empty data
-        if df.empty:
-            issues.append("CSV file is empty")
-            return False, issues, warnings_list
+        if not df.empty:
+            # Summary statistics
+            print(f"\n📈 Data Validation Summary:")
+            print(f"  Total rows: {len(df)}")
+            print(f"  Valid types: {df['Type'].value_counts().to_dict()}")
+            print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
+            print(f"  Total amount: {pd.to_numeric(df['Amount'], errors='coerce').sum():.2f}")
         
-        # Check data types and values
-        for index, row in df.iterrows():
-            row_num = index + 2  # CSV row numbers start at 2 (after header)
-            
-            # Validate Type
-            if pd.isna(row['Type']) or row['Type'] not in self.valid_types:
-                issues.append(f"Row {row_num}: Invalid Type '{row.get('Type', 'missing')}'")
-            
-            # Validate Date
-            try:
-                if pd.notna(row['Date']):
-                    pd.to_datetime(row['Date'])
-                else:
-                    issues.append(f"Row {row_num}: Missing Date")
-            except:
-                issues.append(f"Row {row_num}: Invalid Date format '{row['Date']}'")
-            
-            # Validate Amount
-            try:
-                if pd.notna(row['Amount']):
-                    float(row['Amount'])
-                else:
-                    issues.append(f"Row {row_num}: Missing Amount")
-            except:
-                issues.append(f"Row {row_num}: Invalid Amount '{row['Amount']}'")
-            
-            # Validate required string fields
-            for field in ['Name', 'Category', 'Account']:
-                if pd.isna(row[field]) or str(row[field]).strip() == '':
-                    issues.append(f"Row {row_num}: Missing {field}")
-            
-            # Validate Status
-            if pd.notna(row['Status']) and row['Status'] not in self.valid_statuses:
-                warnings_list.append(f"Row {row_num}: Unusual Status '{row['Status']}'")
-        
-        # Check for duplicates
-        duplicate_count = df.duplicated().sum()
-        if duplicate_count > 0:
-            warnings_list.append(f"Found {duplicate_count} duplicate rows")
-        
-        # Summary statistics
-        print(f"\n📈 Data Validation Summary:")
-        print(f"  Total rows: {len(df)}")
-        print(f"  Valid types: {df['Type'].value_counts().to_dict()}")
-        print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
-        print(f"  Total amount: {df['Amount'].sum():.2f}")
-        
-        return len(issues) == 0, issues, warnings_list
+        return not (issues['severity'] == 'error').any(), issues
     
     def clean_and_transform_data(self, df):
         """Clean and transform data for database insertion"""
         try:
-            # Make a copy to avoid modifying original
-            cleaned_df = df.copy()
-            
-            # Convert Date column
-            cleaned_df['Date'] = pd.to_datetime(cleaned_df['Date'])
-            
-            # Convert Amount to numeric
-            cleaned_df['Amount'] = pd.to_numeric(cleaned_df['Amount'], errors='coerce')
-            
-            # Clean string columns
-            string_columns = ['Type', 'Name', 'Currency', 'Category', 'Account', 'Status']
-            for col in string_columns:
-                cleaned_df[col] = cleaned_df[col].astype(str).str.strip()
-            
-            # Filter for reconciled transactions (as per original logic)
-            reconciled_df = cleaned_df[cleaned_df['Status'] == 'Reconciled'].copy()
+            reconciled_df = clean_export(df)
             
             print(f"🧹 Data cleaning completed:")
             print(f"  Original rows: {len(df)}")
-            print(f"  After cleaning: {len(cleaned_df)}")
             print(f"  Reconciled only: {len(reconciled_df)}")
             
             return reconciled_df
@@ -177,20 +131,41 @@ class DataUploadManager:
             # Determine upload mode
             if_exists = 'append' if mode == 'append' else 'replace'
             
+            # Tag the upload so only this batch has to be processed downstream
+            batch_id = uuid.uuid4().hex
+            df = df.assign(batch_id=batch_id)
+            if if_exists == 'append':
+                self.ensure_batch_columns()
+            
             # Upload data
-            rows_uploaded = df.to_sql(
-                name=table_name,
-                con=self.engine,
-                if_exists=if_exists,
-                index=False,
-                chunksize=1000
-            )
+            dtype = transaction_dtypes(df) if table_name == 'transactions' else None
+            with self.engine.begin() as conn:
+                if table_name == 'transactions':
+                    add_reference_names(conn, df)
+                if if_exists == 'replace':
+                    rows_uploaded = staged_load(df, table_name, conn, TABLE_DDL.get(table_name), dtype)
+                elif 'fingerprint' in df.columns:
+                    rows_uploaded, rows_updated = import_new_rows(df, table_name, conn, TABLE_DDL.get(table_name))
+                    print(f"🔁 Skipped {len(df) - rows_uploaded - rows_updated} rows already in '{table_name}'"
+                          f", updated the status of {rows_updated}")
+                else:
+                    rows_uploaded = write_frame(df, table_name, conn, if_exists, dtype)
+            version = bump_data_version()
             
             print(f"✅ Successfully uploaded {rows_uploaded} rows to '{table_name}' table")
             
             # Update transactions table if uploading raw_transactions
             if table_name == 'raw_transactions':
-                self.update_transactions_table()
+                self.update_transactions_table(batch_id if if_exists == 'append' else None)
+            elif table_name == 'transactions':
+                if if_exists == 'append':
+                    with self.engine.begin() as conn:
+                        apply_rollup_delta(conn, batch_id)
+                    # Only the years the batch touched are rewritten
+                    refresh_snapshot(get_mysql_connection(), version, batch_id)
+                else:
+                    refresh_rollups(get_mysql_connection())
+                    refresh_snapshot(get_mysql_connection(), version)
             
             return True
             
@@ -198,16 +173,110 @@ class DataUploadManager:
             print(f"❌ Error uploading to database: {e}")
             return False
     
-    def update_transactions_table(self):
-        """Update the processed transactions table from raw_transactions"""
+    def ensure_batch_columns(self):
+        """
+        Add the batch_id, fingerprint and bucket columns to tables created
+        before they existed, fingerprinting the rows already loaded so an
+        append skips them, and create the rollup tables an append adds its
+        batch to
+        """
+        with self.engine.begin() as conn:
+            for table in ('raw_transactions', 'transactions'):
+                columns = conn.execute(text("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_schema = DATABASE() AND table_name = :table
+                """), {'table': table}).scalars().all()
+                columns = [c.lower() for c in columns]
+                if columns and 'batch_id' not in columns:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN batch_id VARCHAR(32), ADD INDEX idx_batch (batch_id)"))
+                    print(f"🔧 Added batch_id column to '{table}'")
+                if columns and 'fingerprint' not in columns:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN fingerprint CHAR(32)"))
+                    print(f"🔧 Added fingerprint column to '{table}'")
+                if columns:
+                    rows = backfill_fingerprints(conn, table)
+                    if rows:
+                        print(f"🔧 Fingerprinted {rows} existing rows of '{table}'")
+                if columns and 'fingerprint' not in columns:
+                    # Unique once every existing row has its fingerprint
+                    conn.execute(text(f"ALTER TABLE {table} ADD UNIQUE INDEX idx_fingerprint (fingerprint)"))
+            # Schema changes commit implicitly, so do them before the batch transaction
+            for change in ensure_bucket_columns(conn):
+                print(f"🔧 {change}")
+            create_rollup_tables(conn)
+    
+    def append_batch(self, batch_id):
+        """
+        Move only the reconciled rows of one upload batch into transactions and
+        add them to the rollups, so an append costs the size of the upload
+        rather than the size of the history. Rows whose fingerprint is
+        already in transactions are skipped. The insert and the rollup
+        upserts commit together.
+        """
+        # CREATE TABLE commits implicitly on MySQL, so it can't share the batch transaction
+        with self.engine.begin() as conn:
+            create_rollup_tables(conn)
+        with self.engine.begin() as conn:
+            self.add_raw_reference_names(conn, batch_id)
+            result = conn.execute(text("""
+                INSERT INTO transactions (type, date, item, amount, currency, category, account, status, batch_id, fingerprint)
+                SELECT 
+                    r.Type as type,
+                    r.Date as date,
+                    r.Name as item,
+                    r.Amount as amount,
+                    r.Currency as currency,
+                    r.Category as category,
+                    r.Account as account,
+                    r.Status as status,
+                    r.batch_id,
+                    r.fingerprint
+                FROM raw_transactions r
+                LEFT JOIN transactions t ON t.fingerprint = r.fingerprint
+                WHERE r.Status = 'Reconciled' AND r.batch_id = :batch_id AND t.id IS NULL
+            """), {'batch_id': batch_id})
+            apply_rollup_delta(conn, batch_id)
+        return result.rowcount
+    
+    def add_raw_reference_names(self, conn, batch_id=None):
+        """
+        Add the categories and accounts of reconciled raw transactions (of
+        one batch, or all of them) that the reference tables don't have yet,
+        so the transactions foreign keys accept them
+        """
+        batch = "AND batch_id = :batch_id" if batch_id is not None else ""
+        for column, table in REFERENCE_TABLES.items():
+            conn.execute(text(f"""
+                INSERT IGNORE INTO {table} (name)
+                SELECT DISTINCT {column.capitalize()} FROM raw_transactions
+                WHERE Status = 'Reconciled' AND {column.capitalize()} IS NOT NULL {batch}
+            """), {'batch_id': batch_id})
+    
+    def update_transactions_table(self, batch_id=None):
+        """
+        Update the processed transactions table from raw_transactions.
+        With a batch_id only that upload batch is appended; without one the
+        table is rebuilt from every reconciled raw transaction.
+        """
+        if batch_id is not None:
+            try:
+                rows = self.append_batch(batch_id)
+                # Only the years the batch touched are rewritten
+                refresh_snapshot(get_mysql_connection(), bump_data_version(), batch_id)
+                print(f"✅ Appended {rows} transactions from batch {batch_id}")
+            except Exception as e:
+                print(f"❌ Error updating transactions table: {e}")
+            return
+        
         try:
             with self.engine.connect() as conn:
                 # Clear existing transactions
                 conn.execute(text("DELETE FROM transactions"))
+                self.add_raw_reference_names(conn)
                 
                 # Insert processed data
                 conn.execute(text("""
-                    INSERT INTO transactions (type, date, item, amount, currency, category, account, status)
+                    INSERT INTO transactions (type, date, item, amount, currency, category, account, status, fingerprint)
                     SELECT 
                         Type as type,
                         Date as date,
@@ -216,12 +285,15 @@ class DataUploadManager:
                         Currency as currency,
                         Category as category,
                         Account as account,
-                        Status as status
+                        Status as status,
+                        fingerprint
                     FROM raw_transactions
                     WHERE Status = 'Reconciled'
                 """))
                 
                 conn.commit()
+                refresh_rollups(get_mysql_connection())
+                refresh_snapshot(get_mysql_connection(), bump_data_version())
                 print("✅ Transactions table updated successfully!")
                 
         except Exception as e:
@@ -280,6 +352,54 @@ class DataUploadManager:
             print(f"❌ Error exporting data: {e}")
             return False
 
+def clean_export(df):
+    """
+    Clean an export for database insertion: typed dates and amounts,
+    stripped text, fingerprints, reconciled rows only. A module-level
+    function so batch ingest worker processes can run it.
+    """
+    # Make a copy to avoid modifying original
+    cleaned_df = df.copy()
+    
+    # Convert Date column
+    cleaned_df['Date'] = parse_dates(cleaned_df['Date'])
+    
+    # Convert Amount to numeric
+    cleaned_df['Amount'] = pd.to_numeric(cleaned_df['Amount'], errors='coerce')
+    
+    # Clean string columns
+    string_columns = ['Type', 'Name', 'Currency', 'Category', 'Account', 'Status']
+    for col in string_columns:
+        cleaned_df[col] = cleaned_df[col].astype(str).str.strip()
+    
+    # Fingerprint every exported row, so re-uploads only add new rows
+    if 'fingerprint' not in cleaned_df.columns:
+        cleaned_df = add_fingerprints(cleaned_df)
+    
+    # Filter for reconciled transactions (as per original logic)
+    return cleaned_df[cleaned_df['Status'] == 'Reconciled'].copy()
+
+def print_file_reports(reports):
+    """Print the outcome of each file of a batch ingest"""
+    print("\n📚 Batch ingest results:")
+    print(report_table(reports).fillna('').to_string(index=False))
+
+def print_issues(issues, file_path, max_rows=10):
+    """Print issue counts and the first issues, writing the full list to CSV when it's longer"""
+    errors = issues[issues['severity'] == 'error']
+    warnings_table = issues[issues['severity'] == 'warning']
+    print(f"\n{'❌' if len(errors) else '⚠️ '} Validation found {len(errors)} errors and {len(warnings_table)} warnings:")
+    for _, row in issue_summary(issues).iterrows():
+        where = f" in {row['column']}" if pd.notna(row['column']) else ""
+        print(f"  • {row['severity']}: {row['rule']}{where} ({row['count']} rows)")
+    
+    print(f"\nFirst {min(max_rows, len(issues))} issues:")
+    print(issues.head(max_rows).to_string(index=False))
+    if len(issues) > max_rows:
+        issues_file = f"{os.path.splitext(file_path)[0]}_issues.csv"
+        issues.to_csv(issues_file, index=False)
+        print(f"  ... {len(issues) - max_rows} more, full list written to {issues_file}")
+
 def main():
     print("Personal Finance Dashboard - Data Upload Manager")
     print("=" * 50)
@@ -289,12 +409,13 @@ def main():
     while True:
         print("\n📤 Upload Management Options:")
         print("1. Upload CSV file")
-        print("2. Preview upload history")
-        print("3. Export data to CSV")
-        print("4. Test database connection")
-        print("5. Exit")
+        print("2. Upload several CSV files (directory or glob)")
+        print("3. Preview upload history")
+        print("4. Export data to CSV")
+        print("5. Test database connection")
+        print("6. Exit")
         
-        choice = input("\nSelect option (1-5): ").strip()
+        choice = input("\nSelect option (1-6): ").strip()
         
         if choice == '1':
             file_path = input("Enter CSV file path: ").strip()
@@ -311,22 +432,12 @@ def main():
                 continue
             
             # Validate content
-            valid, issues, warnings_list = manager.validate_data_content(df)
-            
-            if issues:
-                print("\n❌ Validation Issues Found:")
-                for issue in issues[:10]:  # Show first 10 issues
-                    print(f"  • {issue}")
-                if len(issues) > 10:
-                    print(f"  ... and {len(issues) - 10} more issues")
-                continue
+            valid, issues = manager.validate_data_content(df)
             
-            if warnings_list:
-                print("\n⚠️  Warnings:")
-                for warning in warnings_list[:5]:  # Show first 5 warnings
-                    print(f"  • {warning}")
-                if len(warnings_list) > 5:
-                    print(f"  ... and {len(warnings_list) - 5} more warnings")
+            if not issues.empty:
+                print_issues(issues, file_path)
+            if not valid:
+                continue
             
             # Preview data
             manager.preview_data(df)
@@ -345,6 +456,33 @@ def main():
                     print("🎉 Upload completed successfully!")
         
         elif choice == '2':
+            pattern = input("Enter a directory or glob of CSV files: ").strip()
+            paths = expand_sources(pattern)
+            if not paths:
+                print(f"❌ No CSV files match '{pattern}'")
+                continue
+            
+            print(f"\n📁 Processing {len(paths)} files in parallel...")
+            reports, _, cleaned_df = ingest_files(paths, clean_export, manager.valid_types, manager.valid_statuses)
+            print_file_reports(reports)
+            for path, report in zip(paths, reports):
+                if report['issues'] is not None and not report['issues'].empty:
+                    print_issues(report['issues'], path)
+            if cleaned_df is None:
+                print("❌ No file passed validation")
+                continue
+            
+            # Confirm upload
+            confirm = input(f"\n📤 Upload {len(cleaned_df)} reconciled transactions? (yes/no): ").strip().lower()
+            if confirm != 'yes':
+                print("❌ Upload cancelled")
+                continue
+            
+            mode = input("Upload mode (append/replace) [default: append]: ").strip() or 'append'
+            if manager.upload_to_database(cleaned_df, mode=mode):
+                print("🎉 Upload completed successfully!")
+        
+        elif choice == '3':
             history = manager.get_upload_history()
             if history:
                 print("\n📊 Upload History:")
@@ -356,15 +494,15 @@ def main():
             else:
                 print("📭 No upload history found")
         
-        elif choice == '3':
+        elif choice == '4':
             table = input("Table name (transactions/raw_transactions) [default: transactions]: ").strip() or 'transactions'
             filename = input("Output filename (leave empty for auto-generated): ").strip() or None
             manager.export_data(table, filename)
         
-        elif choice == '4':
+        elif choice == '5':
             manager.connect_to_database()
         
-        elif choice == '5':
+        elif choice == '6':
             print("👋 Goodbye!")
             break
         
@@ -0,0 +1,49 @@
+"""
+Data Version Counter for Personal Finance Dashboard
+Tracks when the transactions data changes so caches know when to invalidate
+"""
+
+import os
+import threading
+
+CACHE_DIR = os.getenv(
+    'FINANCE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+)
+VERSION_FILE = os.path.join(CACHE_DIR, 'data_version')
+
+_lock = threading.RLock()
+_state = {'mtime': None, 'version': 0}
+
+
+def get_data_version():
+    """
+    Return the current data version. The counter lives in a small file so
+    the Streamlit apps and the command-line upload manager see the same
+    value; it is only re-read when the file's mtime changes.
+    """
+    try:
+        mtime = os.stat(VERSION_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+    if mtime != _state['mtime']:
+        with _lock:
+            try:
+                with open(VERSION_FILE, 'r') as f:
+                    _state['version'] = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                _state['version'] = 0
+            _state['mtime'] = mtime
+    return _state['version']
+
+
+def bump_data_version():
+    """Mark the transactions data as changed and return the new version"""
+    with _lock:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        version = get_data_version() + 1
+        tmp_file = f"{VERSION_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(str(version))
+        os.replace(tmp_file, VERSION_FILE)
+    return version
@@ -1,5 +1,12 @@
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from engine_registry import get_engine, connect
+from data_version import bump_data_version
+from staging import create_staging, staged_load, swap_in
+from pipeline import CHUNK_ROWS, extract_chunks, transform_chunks, load_chunks
+from batch_ingest import ingest_files
+from compact import compact_frame, storage_frame
+from snapshot import refresh_snapshot
 
 def extract(file):
     """
@@ -14,39 +21,79 @@ def extract(file):
 
 def transform(df):
     """
-    Cleans and transforms the DataFrame for loading.
+    Cleans and transforms the DataFrame for loading, in the compact layout
+    (categorical labels, Arrow item strings, amount_cents).
     """
     col_names = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account', 'Status']
     if not set(col_names).issubset(df.columns):
         raise ValueError(f"Missing columns in input DataFrame: {set(col_names) - set(df.columns)}")
-    cleaned_df = df.loc[df['Status'] == 'Reconciled', col_names]
     new_col_names = ['type', 'date', 'item', 'amount', 'currency', 'category', 'account', 'status']
+    # Keep the row fingerprints of an export that has them
+    if 'fingerprint' in df.columns:
+        col_names = col_names + ['fingerprint']
+        new_col_names = new_col_names + ['fingerprint']
+    cleaned_df = df.loc[df['Status'] == 'Reconciled', col_names]
     cleaned_df.columns = new_col_names
     cleaned_df['date'] = pd.to_datetime(cleaned_df['date'])
-    return cleaned_df
+    return compact_frame(cleaned_df)
 
 def load(df, db_table, connection_uri):
     """
     Loads the DataFrame into the specified database table.
     """
-    db_engine = create_engine(connection_uri)
     try:
-        df.to_sql(
-            name=db_table,
-            con=db_engine,
-            if_exists="replace",
-            index=False
-        )
+        with get_engine(connection_uri).begin() as conn:
+            staged_load(storage_frame(df), db_table, conn)
+        version = bump_data_version()
+        if db_table == "transactions":
+            refresh_snapshot(connection_uri, version)
     except Exception as e:
         print(f"Error loading data to database: {e}")
 
+def stream_load(file, connection_uri, chunksize=CHUNK_ROWS, progress=None):
+    """
+    Extracts, transforms and loads a CSV into raw_transactions and
+    transactions one chunk at a time, so memory use stays at one chunk
+    whatever the file size. Chunks go into staging tables that are swapped
+    in once every chunk has loaded. Returns the chunk/row counts.
+    """
+    pairs = transform_chunks(extract_chunks(file, chunksize), transform)
+    with get_engine(connection_uri).begin() as conn:
+        raw_staging = create_staging(conn, "raw_transactions")
+        staging = create_staging(conn, "transactions")
+        stats = load_chunks(pairs, conn, raw_staging, staging, progress=progress)
+        if stats['chunks']:
+            swap_in(conn, "raw_transactions", raw_staging)
+            swap_in(conn, "transactions", staging)
+    if stats['chunks']:
+        refresh_snapshot(connection_uri, bump_data_version())
+    return stats
+
+def load_files(sources, connection_uri, progress=None):
+    """
+    Prepares several exports in parallel worker processes and replaces
+    raw_transactions and transactions with the merged files that passed
+    validation, in one transaction. sources are paths or (name, bytes)
+    pairs. Returns one report per file and the number of transactions
+    loaded.
+    """
+    reports, raw, cleaned = ingest_files(sources, transform, progress=progress)
+    if raw is None:
+        return reports, 0
+    with get_engine(connection_uri).begin() as conn:
+        staged_load(raw, "raw_transactions", conn)
+        staged_load(storage_frame(cleaned), "transactions", conn)
+    refresh_snapshot(connection_uri, bump_data_version())
+    return reports, len(cleaned)
+
 def drop(table, connection_uri):
     """
     Drops the specified table from the database if it exists.
     """
-    db_engine = create_engine(connection_uri)
     try:
-        with db_engine.connect() as connection:
+        with connect(connection_uri) as connection:
             connection.execute(text(f"DROP TABLE IF EXISTS {table};"))
+            connection.commit()
+        bump_data_version()
     except Exception as e:
         print(f"Error dropping table: {e}")
\ No newline at end of file
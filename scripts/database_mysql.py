@@ -1,11 +1,44 @@
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import inspect, text, types
 import os
+import uuid
 from dotenv import load_dotenv
+from engine_registry import get_engine, connect
+from data_version import bump_data_version
+from staging import create_staging, staged_load, swap_all
+from schema_mysql import TABLE_DDL, REFERENCE_TABLES
+from pipeline import RAW_COLUMNS, CHUNK_ROWS, extract_chunks, transform_chunks, load_chunks
+from fingerprint import fingerprint_chunks, insert_new_rows
+from batch_ingest import ingest_files
+from compact import compact_frame, storage_frame
+from snapshot import refresh_snapshot
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Column types of the processed transactions table. DataFrame.to_sql would
+# otherwise create TEXT/DATETIME columns, which the bucket columns and
+# covering indexes can't be built on
+TRANSACTION_DTYPES = {
+    'type': types.String(50),
+    'date': types.Date(),
+    'item': types.String(255),
+    'amount': types.Numeric(15, 2),
+    'currency': types.String(10),
+    'category': types.String(100),
+    'account': types.String(100),
+    'status': types.String(50),
+    'batch_id': types.String(32),
+    'fingerprint': types.String(32),
+}
+
+# raw_transactions columns an upload copies from its staging table
+RAW_IMPORT_COLUMNS = RAW_COLUMNS + ['batch_id', 'fingerprint']
+
+def transaction_dtypes(df):
+    """Return the TRANSACTION_DTYPES entries for the columns present in df"""
+    return {column: dtype for column, dtype in TRANSACTION_DTYPES.items() if column in df.columns}
+
 def get_mysql_connection():
     """Create MySQL database connection"""
     # Default MySQL connection settings - update these with your actual MySQL credentials
@@ -34,36 +67,194 @@ def extract(file):
 
 def transform(df):
     """
-    Cleans and transforms the DataFrame for loading.
+    Cleans and transforms the DataFrame for loading, in the compact layout
+    (categorical labels, Arrow item strings, amount_cents).
     """
     col_names = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account', 'Status']
     if not set(col_names).issubset(df.columns):
         raise ValueError(f"Missing columns in input DataFrame: {set(col_names) - set(df.columns)}")
-    cleaned_df = df.loc[df['Status'] == 'Reconciled', col_names]
     new_col_names = ['type', 'date', 'item', 'amount', 'currency', 'category', 'account', 'status']
+    # Keep the row fingerprints of an export that has them
+    if 'fingerprint' in df.columns:
+        col_names = col_names + ['fingerprint']
+        new_col_names = new_col_names + ['fingerprint']
+    cleaned_df = df.loc[df['Status'] == 'Reconciled', col_names]
     cleaned_df.columns = new_col_names
     cleaned_df['date'] = pd.to_datetime(cleaned_df['date'])
-    return cleaned_df
+    return compact_frame(cleaned_df)
+
+def add_reference_names(conn, df):
+    """
+    Adds the categories and accounts of df's transactions that aren't in the
+    categories and accounts tables yet, so the transactions foreign keys
+    accept them
+    """
+    for column, table in REFERENCE_TABLES.items():
+        names = pd.Series(df[column]).dropna().astype(str).unique()
+        if len(names):
+            conn.execute(text(f"INSERT IGNORE INTO {table} (name) VALUES (:name)"), [{'name': name} for name in names])
+
+def with_reference_names(conn, pairs):
+    """Yields the (raw, cleaned) chunk pairs, adding each chunk's new names first"""
+    for raw, cleaned in pairs:
+        add_reference_names(conn, cleaned)
+        yield raw, cleaned
 
 def load(df, db_table, connection_uri=None):
     """
-    Loads the DataFrame into the specified database table.
+    Loads the DataFrame into the specified database table through an
+    indexed staging table that is renamed into place once filled.
     """
     if connection_uri is None:
         connection_uri = get_mysql_connection()
     
-    db_engine = create_engine(connection_uri)
     try:
-        df.to_sql(
-            name=db_table,
-            con=db_engine,
-            if_exists="replace",
-            index=False
-        )
+        df = storage_frame(df)
+        with get_engine(connection_uri).begin() as conn:
+            if db_table == "transactions":
+                add_reference_names(conn, df)
+            staged_load(df, db_table, conn, TABLE_DDL.get(db_table),
+                        dtype=transaction_dtypes(df) if db_table == "transactions" else None)
+        if db_table == "transactions":
+            from rollups import refresh_rollups
+            refresh_rollups(connection_uri)
+        version = bump_data_version()
+        if db_table == "transactions":
+            refresh_snapshot(connection_uri, version)
         print(f"Successfully loaded data into {db_table}")
     except Exception as e:
         print(f"Error loading data to database: {e}")
 
+def prepare_load(conn):
+    """
+    Creates the categories and accounts tables the transactions foreign keys
+    point at, and the rollup tables if the live tables can take an
+    incremental import. Run it in a transaction of its own before the rows
+    go in, as MySQL commits DDL implicitly. Returns whether every row of
+    raw_transactions and transactions has a fingerprint, so an upload only
+    has to add the rows they don't have yet; tables from before
+    fingerprints are replaced instead, as the anti-join can't match their
+    rows.
+    """
+    for table in REFERENCE_TABLES.values():
+        conn.execute(text(TABLE_DDL[table].format(table=table)))
+    inspector = inspect(conn)
+    incremental = all(
+        inspector.has_table(table) and
+        'fingerprint' in {column['name'].lower() for column in inspector.get_columns(table)} and
+        conn.execute(text(f"SELECT 1 FROM {table} WHERE fingerprint IS NULL LIMIT 1")).first() is None
+        for table in ("raw_transactions", "transactions"))
+    if incremental:
+        from rollups import create_rollup_tables
+        create_rollup_tables(conn)
+    return incremental
+
+def with_batch_id(pairs, batch_id):
+    """Yields the (raw, cleaned) chunk pairs tagged with the upload's batch_id"""
+    for raw, cleaned in pairs:
+        yield raw.assign(batch_id=batch_id), cleaned.assign(batch_id=batch_id)
+
+def import_staged(conn, raw_staging, staging, batch_id):
+    """
+    Adds the staged rows whose fingerprints the live tables don't have yet,
+    with one anti-join per table, and the batch's rollup delta, all on the
+    caller's transaction. Returns the number of transactions inserted.
+    """
+    from rollups import apply_rollup_delta
+    insert_new_rows(conn, "raw_transactions", raw_staging, RAW_IMPORT_COLUMNS)
+    inserted, _ = insert_new_rows(conn, "transactions", staging, list(TRANSACTION_DTYPES))
+    apply_rollup_delta(conn, batch_id)
+    return inserted
+
+def finish_load(connection_uri, incremental, staging_tables, batch_id):
+    """
+    Drops the staging tables an incremental import leaves behind and
+    rewrites the snapshot's partitions for the years batch_id added to, or
+    after a full replace rebuilds the rollups and the whole snapshot, under
+    a new data version
+    """
+    if incremental:
+        with connect(connection_uri) as connection:
+            for staging in staging_tables:
+                connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            connection.commit()
+        refresh_snapshot(connection_uri, bump_data_version(), batch_id)
+    else:
+        from rollups import refresh_rollups
+        refresh_rollups(connection_uri)
+        refresh_snapshot(connection_uri, bump_data_version())
+
+def stream_load(file, connection_uri=None, chunksize=CHUNK_ROWS, progress=None):
+    """
+    Extracts, transforms and loads a CSV into raw_transactions and
+    transactions one chunk at a time, so memory use stays at one chunk
+    whatever the file size. Every row is fingerprinted and the chunks go
+    into indexed staging tables. When the live tables already have
+    fingerprints, one transaction then inserts only the staged rows they
+    don't have (an anti-join on the fingerprint index) together with the
+    rollup delta, so re-uploading a full-history export writes just the
+    new rows. Otherwise one RENAME TABLE swaps both staging tables in
+    (MySQL commits DDL implicitly, so this is not one transaction; a failed
+    load leaves the live tables as they were) and the rollups are rebuilt.
+    Returns the chunk/row counts, with the rows inserted as new_rows.
+    """
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    engine = get_engine(connection_uri)
+    with engine.begin() as conn:
+        incremental = prepare_load(conn)
+        raw_staging = create_staging(conn, "raw_transactions", TABLE_DDL["raw_transactions"])
+        staging = create_staging(conn, "transactions", TABLE_DDL["transactions"])
+    batch_id = uuid.uuid4().hex
+    pairs = with_batch_id(transform_chunks(fingerprint_chunks(extract_chunks(file, chunksize)), transform), batch_id)
+    with engine.begin() as conn:
+        stats = load_chunks(with_reference_names(conn, pairs), conn, raw_staging, staging, TRANSACTION_DTYPES,
+                            progress, first_chunk='append')
+        if stats['chunks'] and incremental:
+            stats['new_rows'] = import_staged(conn, raw_staging, staging, batch_id)
+        elif stats['chunks']:
+            swap_all(conn, {"raw_transactions": raw_staging, "transactions": staging})
+            stats['new_rows'] = stats['rows']
+    if stats['chunks']:
+        finish_load(connection_uri, incremental, (raw_staging, staging), batch_id)
+    print(f"Successfully loaded {stats.get('new_rows', 0)} new of {stats['rows']} transactions in {stats['chunks']} chunks")
+    return stats
+
+def load_files(sources, connection_uri=None, progress=None):
+    """
+    Prepares several exports in parallel worker processes and loads the
+    merged files that passed validation like stream_load: only the rows
+    whose fingerprints are new when the live tables have fingerprints,
+    otherwise both staging tables are filled and swapped in by one RENAME
+    TABLE. sources are paths or (name, bytes) pairs. Returns one report per
+    file and the number of transactions inserted.
+    """
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    reports, raw, cleaned = ingest_files(sources, transform, progress=progress)
+    if raw is None:
+        return reports, 0
+    batch_id = uuid.uuid4().hex
+    raw, cleaned = raw.assign(batch_id=batch_id), cleaned.assign(batch_id=batch_id)
+    engine = get_engine(connection_uri)
+    with engine.begin() as conn:
+        incremental = prepare_load(conn)
+        raw_staging = create_staging(conn, "raw_transactions", TABLE_DDL["raw_transactions"])
+        staging = create_staging(conn, "transactions", TABLE_DDL["transactions"])
+    with engine.begin() as conn:
+        add_reference_names(conn, cleaned)
+        load_chunks([(raw, cleaned)], conn, raw_staging, staging, TRANSACTION_DTYPES, first_chunk='append')
+        if incremental:
+            rows = import_staged(conn, raw_staging, staging, batch_id)
+        else:
+            swap_all(conn, {"raw_transactions": raw_staging, "transactions": staging})
+            rows = len(cleaned)
+    finish_load(connection_uri, incremental, (raw_staging, staging), batch_id)
+    print(f"Successfully loaded {rows} new transactions from {len(reports)} files")
+    return reports, rows
+
 def drop(table, connection_uri=None):
     """
     Drops the specified table from the database if it exists.
@@ -71,11 +262,14 @@ def drop(table, connection_uri=None):
     if connection_uri is None:
         connection_uri = get_mysql_connection()
     
-    db_engine = create_engine(connection_uri)
     try:
-        with db_engine.connect() as connection:
+        with connect(connection_uri) as connection:
             connection.execute(text(f"DROP TABLE IF EXISTS {table};"))
             connection.commit()
+        if table == "transactions":
+            from rollups import drop_rollups
+            drop_rollups(connection_uri)
+        bump_data_version()
         print(f"Successfully dropped table {table}")
     except Exception as e:
         print(f"Error dropping table: {e}")
@@ -89,10 +283,8 @@ def create_database(connection_uri=None):
     
     # Remove database name from connection URI to connect to MySQL server
     base_uri = connection_uri.rsplit('/', 1)[0]
-    db_engine = create_engine(base_uri)
-    
     try:
-        with db_engine.connect() as connection:
+        with connect(base_uri) as connection:
             connection.execute(text("CREATE DATABASE IF NOT EXISTS personal_finance_dashboard"))
             connection.commit()
         print("Database created successfully!")
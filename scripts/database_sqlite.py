@@ -0,0 +1,141 @@
+import pandas as pd
+from sqlalchemy import text
+import os
+from engine_registry import get_engine, connect
+from data_version import bump_data_version
+from staging import create_staging, staged_load, swap_in
+from schema_sqlite import TABLE_DDL, create_indexes, create_tables
+from pipeline import CHUNK_ROWS, extract_chunks, transform_chunks, load_chunks
+from fingerprint import fingerprint_chunks
+from batch_ingest import ingest_files
+from compact import compact_frame, storage_frame
+
+# Database file used when SQLITE_DATABASE_URL isn't set
+DATABASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "personal_finance_dashboard.db")
+
+def get_sqlite_connection():
+    """Create SQLite database connection (an embedded file, no server needed)"""
+    return os.getenv('SQLITE_DATABASE_URL', f"sqlite:///{DATABASE_FILE}")
+
+def extract(file):
+    """
+    Reads a CSV file and returns a DataFrame.
+    """
+    try:
+        raw_transactions = pd.read_csv(file)
+        return raw_transactions
+    except Exception as e:
+        print(f"Error extracting data: {e}")
+        return pd.DataFrame()
+
+def transform(df):
+    """
+    Cleans and transforms the DataFrame for loading, in the compact layout
+    (categorical labels, Arrow item strings, amount_cents).
+    """
+    col_names = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account', 'Status']
+    if not set(col_names).issubset(df.columns):
+        raise ValueError(f"Missing columns in input DataFrame: {set(col_names) - set(df.columns)}")
+    new_col_names = ['type', 'date', 'item', 'amount', 'currency', 'category', 'account', 'status']
+    # Keep the row fingerprints of an export that has them
+    if 'fingerprint' in df.columns:
+        col_names = col_names + ['fingerprint']
+        new_col_names = new_col_names + ['fingerprint']
+    cleaned_df = df.loc[df['Status'] == 'Reconciled', col_names]
+    cleaned_df.columns = new_col_names
+    cleaned_df['date'] = pd.to_datetime(cleaned_df['date'])
+    return compact_frame(cleaned_df)
+
+def load(df, db_table, connection_uri=None):
+    """
+    Loads the DataFrame into the specified database table.
+    """
+    if connection_uri is None:
+        connection_uri = get_sqlite_connection()
+
+    try:
+        with get_engine(connection_uri).begin() as conn:
+            staged_load(storage_frame(df), db_table, conn, TABLE_DDL.get(db_table))
+            create_indexes(conn, db_table)
+        bump_data_version()
+        print(f"Successfully loaded data into {db_table}")
+    except Exception as e:
+        print(f"Error loading data to database: {e}")
+
+def stream_load(file, connection_uri=None, chunksize=CHUNK_ROWS, progress=None):
+    """
+    Extracts, transforms and loads a CSV into raw_transactions and
+    transactions one chunk at a time, so memory use stays at one chunk
+    whatever the file size. Every row is fingerprinted so later appends
+    can skip it. All chunks are inserted into unindexed staging tables in
+    one transaction, which are swapped in and indexed before it commits.
+    Returns the chunk/row counts.
+    """
+    if connection_uri is None:
+        connection_uri = get_sqlite_connection()
+
+    pairs = transform_chunks(fingerprint_chunks(extract_chunks(file, chunksize)), transform)
+    with get_engine(connection_uri).begin() as conn:
+        raw_staging = create_staging(conn, "raw_transactions", TABLE_DDL["raw_transactions"])
+        staging = create_staging(conn, "transactions", TABLE_DDL["transactions"])
+        stats = load_chunks(pairs, conn, raw_staging, staging, progress=progress, first_chunk='append')
+        if stats['chunks']:
+            for table, table_staging in (("raw_transactions", raw_staging), ("transactions", staging)):
+                swap_in(conn, table, table_staging)
+                create_indexes(conn, table)
+    if stats['chunks']:
+        bump_data_version()
+    print(f"Successfully loaded {stats['rows']} transactions in {stats['chunks']} chunks")
+    return stats
+
+def load_files(sources, connection_uri=None, progress=None):
+    """
+    Prepares several exports in parallel worker processes and replaces
+    raw_transactions and transactions with the merged files that passed
+    validation, in one transaction. sources are paths or (name, bytes)
+    pairs. Returns one report per file and the number of transactions
+    loaded.
+    """
+    if connection_uri is None:
+        connection_uri = get_sqlite_connection()
+
+    reports, raw, cleaned = ingest_files(sources, transform, progress=progress)
+    if raw is None:
+        return reports, 0
+    with get_engine(connection_uri).begin() as conn:
+        for table, df in (("raw_transactions", raw), ("transactions", storage_frame(cleaned))):
+            staged_load(df, table, conn, TABLE_DDL[table])
+            create_indexes(conn, table)
+    bump_data_version()
+    print(f"Successfully loaded {len(cleaned)} transactions from {len(reports)} files")
+    return reports, len(cleaned)
+
+def drop(table, connection_uri=None):
+    """
+    Drops the specified table from the database if it exists.
+    """
+    if connection_uri is None:
+        connection_uri = get_sqlite_connection()
+
+    try:
+        with connect(connection_uri) as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table};"))
+            connection.commit()
+        bump_data_version()
+        print(f"Successfully dropped table {table}")
+    except Exception as e:
+        print(f"Error dropping table: {e}")
+
+def create_database(connection_uri=None):
+    """
+    Creates the database file and its empty, indexed tables if they don't exist.
+    """
+    if connection_uri is None:
+        connection_uri = get_sqlite_connection()
+
+    try:
+        with get_engine(connection_uri).begin() as conn:
+            create_tables(conn)
+        print("Database created successfully!")
+    except Exception as e:
+        print(f"Error creating database: {e}")
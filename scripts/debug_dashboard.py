@@ -1,4 +1,4 @@
-from read_queries_sqlite import query
+from read_queries_sqlite import query, amount_over_time
 import streamlit as st
 import plotly.express as px
 
@@ -7,7 +7,7 @@ st.title('Dashboard Debug - Testing All Charts')
 # Test all charts individually
 st.header('1. Account Balance Over Time')
 try:
-    monthly_amount_over_time = query("monthly_amount_over_time")
+    monthly_amount_over_time = amount_over_time("monthly")
     if not monthly_amount_over_time.empty:
         st.write(f"Data shape: {monthly_amount_over_time.shape}")
         st.write("Columns:", list(monthly_amount_over_time.columns))
@@ -0,0 +1,120 @@
+"""
+DuckDB Query Engine for Personal Finance Dashboard
+Runs the named dashboard queries with DuckDB's vectorized, multi-threaded
+executor directly over the Parquet snapshot or an uploaded Bluecoins CSV.
+MySQL stays the system of record; with FINANCE_DUCKDB=true the MySQL app's
+dashboard reads are answered here whenever the snapshot is fresh.
+"""
+
+import os
+import re
+import threading
+from sqlalchemy.engine import make_url
+from query_registry import get_registry
+from snapshot import fresh_snapshot
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+QUERY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries_duckdb.sql")
+
+DUCKDB_ENABLED = os.getenv('FINANCE_DUCKDB', 'false').lower() in ('1', 'true', 'yes')
+
+# Threads DuckDB may use; defaults to one per CPU
+DUCKDB_THREADS = int(os.getenv('DUCKDB_THREADS', '0')) or None
+
+# The query file is written in MySQL's labels (month as YYYY-MM, weeks from
+# Monday) and ROUND semantics, so only the MySQL app is served from it
+DIALECTS = ('mysql',)
+
+# :name bind parameters, which DuckDB spells $name
+BIND_PARAM = re.compile(r'(?<![:\w]):(\w+)')
+
+_database = None
+_lock = threading.Lock()
+
+
+def available():
+    """Whether the duckdb package is installed"""
+    return duckdb is not None
+
+
+def _cursor():
+    """A cursor of the process-wide in-memory database; each thread needs its own"""
+    global _database
+    with _lock:
+        if _database is None:
+            config = {'threads': DUCKDB_THREADS} if DUCKDB_THREADS else {}
+            _database = duckdb.connect(':memory:', config=config)
+        return _database.cursor()
+
+
+def _quote(path):
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def parquet_source(path):
+    """The transactions of a Parquet snapshot directory, as a SELECT"""
+    return f"""
+        SELECT date, type, account, category, item, CAST(amount AS DECIMAL(15, 2)) AS amount
+        FROM read_parquet({_quote(os.path.join(path, '*', '*.parquet'))}, hive_partitioning = true)
+    """
+
+
+def csv_source(path):
+    """The reconciled transactions of a Bluecoins CSV export, as a SELECT"""
+    return f"""
+        SELECT
+            TRY_CAST("Date" AS TIMESTAMP) AS date, "Type" AS type, "Account" AS account,
+            "Category" AS category, "Name" AS item, CAST("Amount" AS DECIMAL(15, 2)) AS amount
+        FROM read_csv({_quote(path)}, header = true)
+        WHERE "Status" = 'Reconciled'
+    """
+
+
+def duckdb_sql(query_name):
+    """The named query in DuckDB's parameter style"""
+    return BIND_PARAM.sub(r'$\1', get_registry(QUERY_FILE).sql(query_name))
+
+
+def run_query(source, query_name, params=None):
+    """
+    Runs the named query over source, a SELECT from parquet_source or
+    csv_source that stands in for the transactions table. Returns a
+    DataFrame.
+    """
+    sql = duckdb_sql(query_name).rstrip().rstrip(';')
+    names = set(BIND_PARAM.findall(get_registry(QUERY_FILE).sql(query_name)))
+    cursor = _cursor()
+    try:
+        return cursor.execute(f"WITH transactions AS ({source}) {sql}",
+                              {name: value for name, value in (params or {}).items() if name in names}).df()
+    finally:
+        cursor.close()
+
+
+def duckdb_query(connection_uri, query_name, params=None):
+    """
+    Answers a named query for connection_uri's app from its fresh Parquet
+    snapshot with DuckDB. Returns None when DuckDB is disabled or not
+    installed, the snapshot is stale, or the query has no DuckDB version,
+    so the caller falls back to the next reader.
+    """
+    if not (DUCKDB_ENABLED and available()):
+        return None
+    if make_url(str(connection_uri)).get_backend_name() not in DIALECTS:
+        return None
+    # The rollup tables need _by_day variants for date ranges; a scan doesn't
+    query_name = query_name.removesuffix('_by_day')
+    if query_name not in get_registry(QUERY_FILE).names():
+        return None
+    path = fresh_snapshot(connection_uri)
+    if path is None or not any(name.startswith('year=') for name in os.listdir(path)):
+        return None
+    try:
+        return run_query(parquet_source(path), query_name, params)
+    except Exception as e:
+        print(f"Error running {query_name} on DuckDB: {e}")
+        return None
@@ -0,0 +1,155 @@
+"""
+Engine Registry for Personal Finance Dashboard
+Shares one pooled SQLAlchemy engine per connection URI across the whole process
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+
+def pool_settings():
+    """Read the connection pool settings from the environment"""
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    }
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.waits += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'avg_wait_ms': 1000 * self.total_wait / self.waits if self.waits else 0.0,
+                'max_wait_ms': 1000 * self.max_wait,
+            }
+
+
+_engines = {}
+_metrics = {}
+_lock = threading.Lock()
+
+
+def _attach_metrics(engine, metrics):
+    event.listen(engine.pool, 'connect', lambda *args: metrics.increment('connects'))
+    event.listen(engine.pool, 'checkout', lambda *args: metrics.increment('checkouts'))
+    event.listen(engine.pool, 'checkin', lambda *args: metrics.increment('checkins'))
+    event.listen(engine.pool, 'invalidate', lambda *args: metrics.increment('invalidations'))
+
+
+def _sqlite_connect(dbapi_connection, connection_record):
+    # pysqlite only opens a transaction before DML; take over so CREATE,
+    # RENAME and DROP in a staged load commit or roll back with the rows
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    # WAL lets the dashboard keep reading while a load writes, and
+    # synchronous=NORMAL is still crash-safe in WAL mode
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _sqlite_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+def get_engine(connection_uri, **engine_kwargs):
+    """
+    Returns the shared engine for connection_uri, creating it on first use.
+    engine_kwargs override the pool settings and only apply on creation.
+    """
+    engine = _engines.get(connection_uri)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(connection_uri)
+        if engine is None:
+            settings = pool_settings()
+            url = make_url(connection_uri)
+            if url.get_backend_name() == 'sqlite':
+                # SQLite uses a file or memory pool that has no size/overflow
+                settings = {k: settings[k] for k in ('pool_recycle', 'pool_pre_ping')}
+            elif url.get_driver_name() == 'pymysql':
+                # Lets bulk_load stream files with LOAD DATA LOCAL INFILE
+                local_infile = os.getenv('MYSQL_LOCAL_INFILE', 'true').lower() in ('1', 'true', 'yes')
+                settings['connect_args'] = {'local_infile': local_infile}
+            settings.update(engine_kwargs)
+            engine = create_engine(connection_uri, **settings)
+            if url.get_backend_name() == 'sqlite':
+                event.listen(engine, 'connect', _sqlite_connect)
+                event.listen(engine, 'begin', _sqlite_begin)
+            metrics = PoolMetrics()
+            _attach_metrics(engine, metrics)
+            _metrics[connection_uri] = metrics
+            _engines[connection_uri] = engine
+    return engine
+
+
+@contextmanager
+def connect(connection_uri):
+    """Check a connection out of the shared pool, recording how long it took"""
+    engine = get_engine(connection_uri)
+    start = time.perf_counter()
+    connection = engine.connect()
+    _metrics[connection_uri].record_wait(time.perf_counter() - start)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def pool_metrics():
+    """Return pool status and checkout/wait metrics for every registered engine"""
+    metrics = {}
+    for connection_uri, engine in list(_engines.items()):
+        pool = engine.pool
+        stats = _metrics[connection_uri].snapshot()
+        stats['status'] = pool.status()
+        if hasattr(pool, 'checkedout'):
+            stats['checked_out'] = pool.checkedout()
+            stats['size'] = pool.size()
+            stats['overflow'] = pool.overflow()
+        metrics[make_url(connection_uri).render_as_string(hide_password=True)] = stats
+    return metrics
+
+
+def dispose_all():
+    """Close every pooled connection and forget all engines"""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _metrics.clear()
@@ -0,0 +1,173 @@
+"""
+Background ETL Jobs for Personal Finance Dashboard
+Runs "Generate Dashboard" uploads on a process-wide worker thread instead of
+inside the Streamlit script run. Each job has an id and a JSON status file
+that any session can poll, so a browser refresh or a closed tab doesn't stop
+the import, and uploads from several users queue instead of competing for CPU.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from data_version import CACHE_DIR, get_data_version
+from batch_ingest import report_table
+
+JOBS_DIR = os.getenv('FINANCE_JOBS_DIR', os.path.join(CACHE_DIR, 'jobs'))
+
+# Uploads run one at a time by default
+ETL_JOB_WORKERS = int(os.getenv('ETL_JOB_WORKERS', '1'))
+
+# Seconds between progress polls in the app
+POLL_SECONDS = float(os.getenv('ETL_POLL_SECONDS', '1'))
+
+# Finished jobs' status files are kept this long
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+ACTIVE_STATES = ('queued', 'running')
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _job_file(job_id):
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+
+def _write_status(status):
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    tmp_file = f"{_job_file(status['id'])}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(status, f)
+    os.replace(tmp_file, _job_file(status['id']))
+
+
+def job_status(job_id):
+    """
+    The status of a job: its state ('queued', 'running', 'done', 'failed'),
+    the rows parsed, validated and loaded so far, the fraction of the input
+    read, the per-file reports of a multi-file upload and any error. None
+    for an unknown job id. A job left running by a server process that has
+    since stopped is 'failed'.
+    """
+    if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+        return None
+    try:
+        with open(_job_file(job_id), 'r') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if status['state'] in ACTIVE_STATES and status['pid'] != os.getpid():
+        status.update(state='failed', error="Interrupted: the server restarted before the upload finished")
+    return status
+
+
+def _update(status, **fields):
+    status.update(fields)
+    _write_status(status)
+
+
+def _prune():
+    """Remove the status files of jobs that finished long ago"""
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    for name in os.listdir(JOBS_DIR):
+        path = os.path.join(JOBS_DIR, name)
+        try:
+            if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _run_upload(status, files, stream_load, load_files, connection_uri):
+    _update(status, state='running', started_at=time.time())
+    try:
+        if len(files) == 1:
+            # One export streams through in chunks
+            data = files[0][1]
+            buffer = io.BytesIO(data)
+            def progress(stats):
+                _update(status, parsed=stats['raw_rows'], validated=stats['rows'], loaded=stats['rows'],
+                        fraction=min(buffer.tell() / max(len(data), 1), 1.0))
+            stats = stream_load(buffer, connection_uri, progress=progress)
+            _update(status, loaded=stats.get('new_rows', stats['rows']))
+        else:
+            # Several exports are validated in parallel, then loaded together
+            def progress(stats):
+                _update(status, parsed=stats['rows'], validated=stats['valid_rows'],
+                        fraction=stats['files'] / stats['total'])
+            reports, rows = load_files(files, connection_uri, progress=progress)
+            _update(status, reports=[{key: report[key] for key in ('file', 'rows', 'errors', 'warnings', 'error')}
+                                     for report in reports])
+            if all(report['error'] is not None for report in reports):
+                raise ValueError("No file passed validation")
+            _update(status, loaded=rows)
+        _update(status, state='done', fraction=1.0, finished_at=time.time(), data_version=get_data_version())
+    except Exception as e:
+        print(f"Error in upload job {status['id']}: {e}")
+        _update(status, state='failed', error=str(e), finished_at=time.time())
+
+
+def submit_upload(files, stream_load, load_files, connection_uri):
+    """
+    Queues an upload of files, (name, bytes) pairs, into connection_uri's
+    database with the backend's stream_load (one file) or load_files
+    (several). The load bumps the data version when it commits, so open
+    dashboards pick up the new data. Returns the job id.
+    """
+    global _executor
+    status = {
+        'id': uuid.uuid4().hex, 'state': 'queued', 'files': [name for name, _ in files],
+        'parsed': 0, 'validated': 0, 'loaded': 0, 'fraction': 0.0, 'reports': [], 'error': None,
+        'submitted_at': time.time(), 'started_at': None, 'finished_at': None,
+        'data_version': None, 'pid': os.getpid(),
+    }
+    _write_status(status)
+    _prune()
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ETL_JOB_WORKERS, thread_name_prefix='etl-job')
+        _executor.submit(_run_upload, status, files, stream_load, load_files, connection_uri)
+    return status['id']
+
+
+def _progress_text(status):
+    return f"{status['parsed']:,} rows parsed, {status['validated']:,} validated, {status['loaded']:,} loaded"
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll(job_id):
+    status = job_status(job_id)
+    if status is None or status['state'] not in ACTIVE_STATES:
+        # Rerun the whole app so the dashboards read the new data version
+        st.rerun()
+    if status['state'] == 'queued':
+        st.progress(0.0, text="Waiting for an earlier upload to finish...")
+    else:
+        st.progress(status['fraction'], text=_progress_text(status))
+
+
+def upload_progress(job_id):
+    """
+    Draws the progress of an upload job, polling its status while it runs,
+    then its outcome. Returns the status, or None for an unknown job.
+    """
+    status = job_status(job_id)
+    if status is None:
+        st.warning("Upload job not found.")
+        return None
+    if status['state'] in ACTIVE_STATES:
+        _poll(job_id)
+    elif status['state'] == 'done':
+        st.success(f"Dashboard generated successfully! {_progress_text(status)}.")
+    else:
+        st.error(f"Error processing file: {status['error']}")
+    failed = [report for report in status['reports'] if report['error'] is not None]
+    if failed:
+        st.warning(f"{len(failed)} of {len(status['reports'])} files were skipped:")
+        st.dataframe(report_table(failed), use_container_width=True)
+    return status
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Query Plan Capture for Personal Finance Dashboard
+Writes the MySQL EXPLAIN output of every named query and rollup scan to a
+text file, so plans can be compared before and after a schema change.
+
+Usage: python explain_queries.py [label]   (writes explain_<label>.txt)
+
+    python explain_queries.py before
+    python rollups.py migrate
+    python explain_queries.py after
+"""
+
+import sys
+import pandas as pd
+from sqlalchemy import text
+from database_mysql import get_mysql_connection
+from engine_registry import connect
+from query_filters import QueryFilters
+from query_registry import get_registry
+from read_queries_mysql import QUERY_FILE
+from rollups import BASE_BUCKETS, rollup_source
+
+
+def plan_statements():
+    """Return (label, EXPLAIN statement) pairs for the named queries and rollup scans"""
+    registry = get_registry(QUERY_FILE)
+    statements = []
+    for name in registry.names():
+        statements.append((name, registry.get(name).explain()))
+    for table in BASE_BUCKETS:
+        statements.append((f"rollup rebuild: {table}", text(f"EXPLAIN {rollup_source(table)}")))
+    return statements
+
+
+def explain_all(connection_uri=None):
+    """Return the EXPLAIN output of every statement as one report string"""
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    params = QueryFilters().params()
+    sections = []
+    with connect(connection_uri) as connection:
+        for label, statement in plan_statements():
+            try:
+                needed = {p: params[p] for p in statement.compile().params if p in params}
+                plan = pd.DataFrame(connection.execute(statement, needed).mappings().all())
+                body = plan.to_string(index=False)
+            except Exception as e:
+                body = f"EXPLAIN failed: {e}"
+            sections.append(f"== {label} ==\n{body}\n")
+    return '\n'.join(sections)
+
+
+def main():
+    label = sys.argv[1] if len(sys.argv) > 1 else 'current'
+    output_file = f"explain_{label}.txt"
+    report = explain_all()
+    with open(output_file, 'w') as file:
+        file.write(report)
+    print(f"✅ Query plans written to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Row Fingerprints for Personal Finance Dashboard
+Gives every exported transaction a stable content hash, so re-uploading a
+full-history Bluecoins export only inserts the rows that are new
+"""
+
+import hashlib
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from bulk_load import write_frame
+from staging import create_staging, staged_columns
+from validation import parse_dates
+
+# Columns that identify a transaction. Status is left out so a transaction
+# keeps its fingerprint when it goes from Pending to Reconciled
+FINGERPRINT_COLUMNS = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account']
+
+# Column of the processed transactions table holding each fingerprinted
+# export column
+TRANSACTION_COLUMNS = {
+    'Type': 'type', 'Date': 'date', 'Name': 'item', 'Amount': 'amount',
+    'Currency': 'currency', 'Category': 'category', 'Account': 'account',
+}
+
+SEPARATOR = '\x1f'
+
+
+def row_contents(df):
+    """
+    The fingerprinted columns of each row normalised to one string: text
+    stripped, dates as YYYY-MM-DD and amounts as whole cents, so the CSV
+    and the values read back from the database give the same string
+    """
+    contents = None
+    for column in FINGERPRINT_COLUMNS:
+        if column == 'Date':
+            values = parse_dates(df['Date']).dt.strftime('%Y-%m-%d')
+        elif column == 'Amount':
+            values = (pd.to_numeric(df['Amount'], errors='coerce') * 100).round().astype('Int64').astype('str')
+        else:
+            values = df[column].astype('str').str.strip()
+        values = values.fillna('')
+        contents = values if contents is None else contents + SEPARATOR + values
+    return contents
+
+
+def occurrences(contents, seen=None):
+    """
+    Numbers identical rows 0, 1, 2, ... in file order, so two coffees
+    bought on the same day get different fingerprints. seen carries the
+    counts over from earlier chunks of the same file and is updated in place.
+    """
+    codes, uniques = pd.factorize(contents)
+    occurrence = pd.Series(codes, index=contents.index).groupby(codes).cumcount()
+    if seen is not None:
+        keys = pd.util.hash_pandas_object(pd.Series(uniques), index=False)
+        occurrence += keys.map(seen).fillna(0).astype('int64').to_numpy()[codes]
+        for key, count in zip(keys, np.bincount(codes, minlength=len(uniques))):
+            seen[key] = seen.get(key, 0) + count
+    return occurrence
+
+
+def fingerprints(df, seen=None):
+    """32-character fingerprint of each row of a Bluecoins export"""
+    contents = row_contents(df)
+    keyed = contents + SEPARATOR + occurrences(contents, seen).astype('str')
+    return pd.Series([hashlib.md5(value.encode('utf-8')).hexdigest() for value in keyed],
+                     index=df.index, dtype=object)
+
+
+def add_fingerprints(df, seen=None):
+    """df with a fingerprint column"""
+    return df.assign(fingerprint=fingerprints(df, seen))
+
+
+def fingerprint_chunks(chunks):
+    """Yields each export chunk with fingerprints numbered across the whole file"""
+    seen = {}
+    for chunk in chunks:
+        yield add_fingerprints(chunk, seen)
+
+
+def insert_new_rows(conn, table, staging, columns):
+    """
+    Inserts the rows of staging whose fingerprint isn't already in table,
+    with one anti-join on the fingerprint index. Existing rows whose Status
+    has changed since are updated and re-tagged with the staged batch_id.
+    Only issues DML, so it commits with the caller's transaction. Returns
+    the number of rows inserted and updated.
+    """
+    inserted = conn.execute(text(f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {', '.join('s.' + column for column in columns)}
+        FROM {staging} s
+        LEFT JOIN {table} t ON t.fingerprint = s.fingerprint
+        WHERE t.fingerprint IS NULL
+    """)).rowcount
+
+    updated = 0
+    if 'Status' in columns:
+        # Fingerprints are unique in the staging table, so each subquery returns one value
+        assignments = ', '.join(
+            f"{column} = (SELECT s.{column} FROM {staging} s WHERE s.fingerprint = {table}.fingerprint)"
+            for column in ('Status', 'batch_id') if column in columns)
+        updated = conn.execute(text(f"""
+            UPDATE {table} SET {assignments}
+            WHERE EXISTS (
+                SELECT 1 FROM {staging} s
+                WHERE s.fingerprint = {table}.fingerprint AND s.Status <> {table}.Status
+            )
+        """)).rowcount
+    return inserted, updated
+
+
+def import_new_rows(df, table, conn, ddl=None):
+    """
+    Appends the rows of df whose fingerprint isn't already in table through
+    a staging table and insert_new_rows. Returns the number of rows
+    inserted and updated.
+    """
+    staging = create_staging(conn, table, ddl)
+    if ddl is not None:
+        df = df[staged_columns(conn, staging, df)]
+    write_frame(df, staging, conn, 'append' if ddl is not None else 'replace')
+    inserted, updated = insert_new_rows(conn, table, staging, list(df.columns))
+    conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    return inserted, updated
+
+
+def backfill_fingerprints(conn, table='raw_transactions'):
+    """
+    Fills in the fingerprint of rows loaded before the column existed,
+    numbering repeats in id order. The transactions table is read through
+    its lowercase columns, so its rows get the fingerprints the raw rows
+    they came from have. Returns the number of rows updated.
+    """
+    missing = conn.execute(text(f"SELECT 1 FROM {table} WHERE fingerprint IS NULL LIMIT 1")).first()
+    if missing is None:
+        return 0
+    sources = TRANSACTION_COLUMNS if table == 'transactions' else {column: column for column in FINGERPRINT_COLUMNS}
+    columns = ', '.join(f"{source} AS {column}" for column, source in sources.items())
+    df = pd.read_sql(text(f"SELECT id, {columns} FROM {table} ORDER BY id"), conn)
+    filled = table + '_fingerprints'
+    write_frame(df[['id']].assign(fingerprint=fingerprints(df)), filled, conn, 'replace')
+    conn.execute(text(f"CREATE INDEX idx_{filled}_id ON {filled} (id)"))
+    rows = conn.execute(text(f"""
+        UPDATE {table}
+        SET fingerprint = (SELECT f.fingerprint FROM {filled} f WHERE f.id = {table}.id)
+        WHERE fingerprint IS NULL
+    """)).rowcount
+    conn.execute(text(f"DROP TABLE {filled}"))
+    return rows
@@ -9,6 +9,9 @@ COLLATE utf8mb4_unicode_ci;
 USE personal_finance_dashboard;
 
 -- Drop tables if they exist (for clean re-initialization)
+DROP TABLE IF EXISTS transactions_daily;
+DROP TABLE IF EXISTS transactions_weekly;
+DROP TABLE IF EXISTS transactions_monthly;
 DROP TABLE IF EXISTS transactions;
 DROP TABLE IF EXISTS raw_transactions;
 DROP TABLE IF EXISTS categories;
@@ -47,12 +50,16 @@ CREATE TABLE raw_transactions (
     Category VARCHAR(100),
     Account VARCHAR(100),
     Status VARCHAR(50),
+    batch_id VARCHAR(32),
+    fingerprint CHAR(32),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_date (Date),
     INDEX idx_category (Category),
     INDEX idx_account (Account),
-    INDEX idx_status (Status)
+    INDEX idx_status (Status),
+    INDEX idx_batch (batch_id),
+    UNIQUE INDEX idx_fingerprint (fingerprint)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Create transactions table (processed data)
@@ -66,6 +73,10 @@ CREATE TABLE transactions (
     category VARCHAR(100) NOT NULL,
     account VARCHAR(100) NOT NULL,
     status VARCHAR(50) DEFAULT 'Reconciled',
+    batch_id VARCHAR(32),
+    fingerprint CHAR(32),
+    week_start DATE AS (DATE(date - INTERVAL WEEKDAY(date) DAY)) STORED,
+    month_start DATE AS (DATE(date - INTERVAL (DAYOFMONTH(date) - 1) DAY)) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_date (date),
@@ -73,10 +84,50 @@ CREATE TABLE transactions (
     INDEX idx_account (account),
     INDEX idx_type (type),
     INDEX idx_status (status),
+    INDEX idx_batch (batch_id),
+    UNIQUE INDEX idx_fingerprint (fingerprint),
+    INDEX idx_amount (amount),
+    INDEX idx_date_cover (date, type, account, category, amount),
+    INDEX idx_week_cover (type, week_start, account, category, amount),
+    INDEX idx_month_cover (type, month_start, account, category, amount),
     FOREIGN KEY (category) REFERENCES categories(name) ON UPDATE CASCADE,
     FOREIGN KEY (account) REFERENCES accounts(name) ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Create rollup tables (daily aggregates; weekly/monthly are derived from daily)
+CREATE TABLE transactions_daily (
+    day DATE NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    account VARCHAR(100) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    amount DECIMAL(17, 2) NOT NULL,
+    txn_count INT NOT NULL,
+    PRIMARY KEY (day, type, account, category),
+    INDEX idx_day_type (type, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE transactions_weekly (
+    week DATE NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    account VARCHAR(100) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    amount DECIMAL(17, 2) NOT NULL,
+    txn_count INT NOT NULL,
+    PRIMARY KEY (week, type, account, category),
+    INDEX idx_week_type (type, week)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE transactions_monthly (
+    month DATE NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    account VARCHAR(100) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    amount DECIMAL(17, 2) NOT NULL,
+    txn_count INT NOT NULL,
+    PRIMARY KEY (month, type, account, category),
+    INDEX idx_month_type (type, month)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Insert default categories
 INSERT INTO categories (name, type, description) VALUES
 ('Food & Dining', 'Expense', 'Restaurants, groceries, food delivery, coffee'),
@@ -144,16 +195,32 @@ INSERT INTO transactions (type, date, item, amount, currency, category, account,
 ('Transfer', '2024-01-20', 'Load GCash', 5000.00, 'PHP', 'Transfer', 'Union Bank', 'Reconciled'),
 ('Transfer', '2024-01-25', 'Pay Credit Card', 8000.00, 'PHP', 'Transfer', 'BPI', 'Reconciled');
 
+-- Populate rollup tables from the sample transactions
+INSERT INTO transactions_daily (day, type, account, category, amount, txn_count)
+SELECT date, type, account, category, SUM(amount), COUNT(*)
+FROM transactions
+GROUP BY date, type, account, category;
+
+INSERT INTO transactions_weekly (week, type, account, category, amount, txn_count)
+SELECT DATE(day - INTERVAL WEEKDAY(day) DAY), type, account, category, SUM(amount), SUM(txn_count)
+FROM transactions_daily
+GROUP BY DATE(day - INTERVAL WEEKDAY(day) DAY), type, account, category;
+
+INSERT INTO transactions_monthly (month, type, account, category, amount, txn_count)
+SELECT DATE_FORMAT(day, '%Y-%m-01'), type, account, category, SUM(amount), SUM(txn_count)
+FROM transactions_daily
+GROUP BY DATE_FORMAT(day, '%Y-%m-01'), type, account, category;
+
 -- Create views for common queries
 CREATE VIEW monthly_summary AS
 SELECT 
-    DATE_FORMAT(date, '%Y-%m') AS month,
+    DATE_FORMAT(month_start, '%Y-%m') AS month,
     SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END) AS total_income,
     SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END) AS total_expenses,
     SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END) - 
     SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END) AS net_savings
 FROM transactions
-GROUP BY DATE_FORMAT(date, '%Y-%m')
+GROUP BY month_start
 ORDER BY month;
 
 CREATE VIEW category_summary AS
@@ -11,6 +11,8 @@ from sqlalchemy import create_engine, text
 import pymysql
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
+from rollups import create_rollup_tables
+from schema_mysql import RAW_TRANSACTIONS_DDL, TRANSACTIONS_DDL, CATEGORIES_DDL, ACCOUNTS_DDL
 
 # Load environment variables from .env file
 load_dotenv()
@@ -79,65 +81,17 @@ def create_tables(engine):
     """Create the necessary tables for the finance dashboard"""
     try:
         with engine.connect() as conn:
-            # Create raw_transactions table
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS raw_transactions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    Type VARCHAR(50),
-                    Date DATE,
-                    Name VARCHAR(255),
-                    Amount DECIMAL(15, 2),
-                    Currency VARCHAR(10),
-                    Category VARCHAR(100),
-                    Account VARCHAR(100),
-                    Status VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """))
+            # Create categories and accounts tables for reference, before the
+            # transactions foreign keys that point at them
+            conn.execute(text(CATEGORIES_DDL.format(table='categories')))
+            conn.execute(text(ACCOUNTS_DDL.format(table='accounts')))
             
-            # Create transactions table (processed data)
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    type ENUM('Income', 'Expense', 'Transfer') NOT NULL,
-                    date DATE NOT NULL,
-                    item VARCHAR(255) NOT NULL,
-                    amount DECIMAL(15, 2) NOT NULL,
-                    currency VARCHAR(10) DEFAULT 'PHP',
-                    category VARCHAR(100) NOT NULL,
-                    account VARCHAR(100) NOT NULL,
-                    status VARCHAR(50) DEFAULT 'Reconciled',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_date (date),
-                    INDEX idx_category (category),
-                    INDEX idx_account (account),
-                    INDEX idx_type (type)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """))
+            # Create raw_transactions and transactions (processed data) tables
+            conn.execute(text(RAW_TRANSACTIONS_DDL.format(table='raw_transactions')))
+            conn.execute(text(TRANSACTIONS_DDL.format(table='transactions')))
             
-            # Create categories table for reference
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100) UNIQUE NOT NULL,
-                    type ENUM('Income', 'Expense', 'Both') DEFAULT 'Both',
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """))
-            
-            # Create accounts table for reference
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS accounts (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100) UNIQUE NOT NULL,
-                    type ENUM('Asset', 'Liability', 'Equity') DEFAULT 'Asset',
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """))
+            # Create daily/weekly/monthly rollups of transactions
+            create_rollup_tables(conn)
             
             print("✅ Tables created successfully!")
             
@@ -0,0 +1,62 @@
+"""
+Chunked ETL Pipeline for Personal Finance Dashboard
+Streams a Bluecoins export through extract -> transform -> load one bounded chunk at a time
+"""
+
+import os
+import pandas as pd
+from bulk_load import write_frame
+from compact import storage_frame
+
+# Columns of a Bluecoins export that the dashboard uses; any others
+# (notes, labels, attachments) are never parsed
+RAW_COLUMNS = ['Type', 'Date', 'Name', 'Amount', 'Currency', 'Category', 'Account', 'Status']
+
+# Explicit dtypes, so every chunk parses the same way and no column is
+# held as inferred objects
+RAW_DTYPES = {
+    'Type': 'str',
+    'Date': 'str',
+    'Name': 'str',
+    'Amount': 'float64',
+    'Currency': 'str',
+    'Category': 'str',
+    'Account': 'str',
+    'Status': 'str',
+}
+
+CHUNK_ROWS = int(os.getenv('ETL_CHUNK_ROWS', '50000'))
+
+
+def extract_chunks(file, chunksize=CHUNK_ROWS):
+    """Yields the CSV as DataFrames of at most chunksize rows"""
+    with pd.read_csv(file, usecols=RAW_COLUMNS, dtype=RAW_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def transform_chunks(chunks, transform):
+    """Yields (raw, cleaned) pairs, applying transform to each raw chunk"""
+    for raw in chunks:
+        yield raw, transform(raw)
+
+
+def load_chunks(pairs, conn, raw_table, table, dtype=None, progress=None, first_chunk='replace'):
+    """
+    Writes each (raw, cleaned) pair to raw_table and table on conn. The first
+    chunk is written with first_chunk ('replace' or 'append', for tables
+    created beforehand) and later chunks append, so only one chunk is in
+    memory at a time. progress, if given, is called after every chunk with
+    the running chunk, raw row and loaded row counts.
+    """
+    stats = {'chunks': 0, 'raw_rows': 0, 'rows': 0}
+    for raw, cleaned in pairs:
+        if_exists = 'append' if stats['chunks'] else first_chunk
+        write_frame(raw, raw_table, conn, if_exists)
+        write_frame(storage_frame(cleaned), table, conn, if_exists, dtype)
+        stats['chunks'] += 1
+        stats['raw_rows'] += len(raw)
+        stats['rows'] += len(cleaned)
+        if progress is not None:
+            progress(dict(stats))
+    return stats
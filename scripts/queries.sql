@@ -4,109 +4,133 @@ SELECT * FROM raw_transactions;
 --@name: transactions
 SELECT * FROM transactions;
 
---@name: monthly_amount_over_time
-SELECT
-    month,
-    SUM(amount) OVER (ORDER BY month) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY month) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY month) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY month) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY month) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY month) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY month) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY month) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY month) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY month) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY month) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY month) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY month) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY month) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY month) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY month) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY month) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY month) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY month) AS school_loans
+--@name: monthly_account_amounts
+--@columns: month, account, amount
+SELECT
+    DATE_TRUNC('month', date) AS month,
+    account,
+    SUM(ROUND(amount)) AS amount
+FROM
+    transactions
+GROUP BY 
+    month, account
+ORDER BY
+    month;
+
+--@name: weekly_account_amounts
+--@columns: week, account, amount
+SELECT
+	DATE_TRUNC('week', date) + INTERVAL '6 days' AS week,
+	account,
+	SUM(ROUND(amount)) AS amount
+FROM
+	transactions
+GROUP BY 
+	week, account
+ORDER BY
+	week;
+
+--@name: daily_account_amounts
+--@columns: day, account, amount
+SELECT
+    DATE(date) AS day,
+    account,
+    SUM(ROUND(amount)) AS amount
+FROM
+    transactions
+GROUP BY 
+    day, account
+ORDER BY
+    day;
+
+--@name: monthly_snapshot
+--@columns: month, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE_TRUNC('month', date) AS month,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    month, type, account, category;
+
+--@name: weekly_snapshot
+--@columns: week, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE_TRUNC('week', date) + INTERVAL '6 days' AS week,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
 FROM
-    (SELECT
-        DATE_TRUNC('month', date) AS month,
-        account,
-        SUM(ROUND(amount)) AS amount
-    FROM
-        transactions
-    GROUP BY 
-        month, account
-    ORDER BY
-        month);
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    week, type, account, category;
 
---@name: weekly_amount_over_time
-SELECT
-    week,
-    SUM(amount) OVER (ORDER BY week) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY week) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY week) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY week) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY week) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY week) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY week) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY week) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY week) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY week) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY week) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY week) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY week) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY week) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY week) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY week) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY week) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY week) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY week) AS school_loans
+--@name: daily_snapshot
+--@columns: day, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE(date) AS day,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
 FROM
-    (SELECT
-		DATE_TRUNC('week', date) + INTERVAL '6 days' AS week,
-		account,
-		SUM(ROUND(amount)) AS amount
-	FROM
-		transactions
-	GROUP BY 
-		week, account
-	ORDER BY
-		week);
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    day, type, account, category;
 
---@name: daily_amount_over_time
-SELECT
-    day,
-    SUM(amount) OVER (ORDER BY day) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY day) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY day) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY day) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY day) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY day) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY day) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY day) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY day) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY day) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY day) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY day) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY day) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY day) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY day) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY day) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY day) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY day) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY day) AS school_loans
+--@name: opening_balances
+--@columns: account, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    account,
+    SUM(amount) AS amount
 FROM
-    (SELECT
-        DATE(date) AS day,
-        account,
-        SUM(ROUND(amount)) AS amount
-    FROM
-        transactions
-    GROUP BY 
-        day, account
-    ORDER BY
-        day);
+    transactions
+WHERE
+    date < :start_date
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    account;
+
+--@name: filter_options
+--@columns: account, category, type, first_day, last_day
+SELECT
+    account,
+    category,
+    type,
+    DATE(MIN(date)) AS first_day,
+    DATE(MAX(date)) AS last_day
+FROM
+    transactions
+GROUP BY
+    account, category, type;
 
 --@name: expenses_per_category
+--@columns: category, expenses
 SELECT
     category,
     ROUND(ABS(SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END))) as expenses
@@ -120,6 +144,7 @@ ORDER BY
 	expenses DESC;
 
 --@name: income_per_category
+--@columns: category, income
 SELECT
     category,
     ROUND(ABS(SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END))) as income
@@ -133,6 +158,7 @@ ORDER BY
 	income DESC;
 
 --@name: monthly_expenses
+--@columns: month, expenses
 SELECT
     TO_CHAR(DATE_TRUNC('month', date), 'FMMonth YYYY') AS month,
     ABS(ROUND(SUM(amount))) AS expenses
@@ -146,6 +172,7 @@ ORDER BY
     DATE_TRUNC('month', date);
 
 --@name: monthly_income
+--@columns: month, income
 SELECT
 	TO_CHAR(DATE_TRUNC('month', date), 'FMMonth YYYY') AS month,
 	ROUND(SUM(amount)) AS income
@@ -159,6 +186,7 @@ ORDER BY
 	DATE_TRUNC('month', date);
 
 --@name: weekly_expenses
+--@columns: week, expenses
 SELECT
     DATE_TRUNC('week', date) + INTERVAL '6 days' AS week,
     ROUND(ABS(SUM(amount))) AS expenses
@@ -172,6 +200,7 @@ ORDER BY
     DATE_TRUNC('week', date);
 	
 --@name: daily_expenses
+--@columns: day, expenses
 SELECT
     DATE(date) AS day,
 	ROUND(ABS(SUM(amount))) as expenses
@@ -185,6 +214,7 @@ ORDER BY
 	day;
 	
 --@name: payment_methods
+--@columns: account, amount
 SELECT
 	account,
 	ROUND(ABS(SUM(amount))) as amount
@@ -198,6 +228,7 @@ ORDER BY
 	amount DESC;
 	
 --@name: receiving_methods
+--@columns: account, amount
 SELECT
 	account,
 	ROUND(ABS(SUM(amount))) as amount
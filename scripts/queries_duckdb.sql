@@ -0,0 +1,236 @@
+--@name: monthly_account_amounts
+--@columns: month, account, amount
+SELECT
+    STRFTIME(date, '%Y-%m') AS month,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    month, account
+ORDER BY
+    month;
+
+--@name: weekly_account_amounts
+--@columns: week, account, amount
+SELECT
+    CAST(DATE_TRUNC('week', date) AS DATE) AS week,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    week, account
+ORDER BY
+    week;
+
+--@name: daily_account_amounts
+--@columns: day, account, amount
+SELECT
+    CAST(date AS DATE) AS day,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    day, account
+ORDER BY
+    day;
+
+--@name: monthly_snapshot
+--@columns: month, type, account, category, amount
+--@params: start_date, end_before, accounts, categories, types, all_accounts, all_categories, all_types
+SELECT
+    STRFTIME(date, '%Y-%m') AS month,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR LIST_CONTAINS(:accounts, account))
+    AND (:all_categories OR LIST_CONTAINS(:categories, category))
+    AND (:all_types OR LIST_CONTAINS(:types, type))
+GROUP BY
+    month, type, account, category;
+
+--@name: weekly_snapshot
+--@columns: week, type, account, category, amount
+--@params: start_date, end_before, accounts, categories, types, all_accounts, all_categories, all_types
+SELECT
+    CAST(DATE_TRUNC('week', date) AS DATE) AS week,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR LIST_CONTAINS(:accounts, account))
+    AND (:all_categories OR LIST_CONTAINS(:categories, category))
+    AND (:all_types OR LIST_CONTAINS(:types, type))
+GROUP BY
+    week, type, account, category;
+
+--@name: daily_snapshot
+--@columns: day, type, account, category, amount
+--@params: start_date, end_before, accounts, categories, types, all_accounts, all_categories, all_types
+SELECT
+    CAST(date AS DATE) AS day,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR LIST_CONTAINS(:accounts, account))
+    AND (:all_categories OR LIST_CONTAINS(:categories, category))
+    AND (:all_types OR LIST_CONTAINS(:types, type))
+GROUP BY
+    day, type, account, category;
+
+--@name: opening_balances
+--@columns: account, amount
+--@params: start_date, end_before, accounts, categories, types, all_accounts, all_categories, all_types
+SELECT
+    account,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date < :start_date
+    AND (:all_accounts OR LIST_CONTAINS(:accounts, account))
+    AND (:all_categories OR LIST_CONTAINS(:categories, category))
+    AND (:all_types OR LIST_CONTAINS(:types, type))
+GROUP BY
+    account;
+
+--@name: filter_options
+--@columns: account, category, type, first_day, last_day
+SELECT
+    account,
+    category,
+    type,
+    CAST(MIN(date) AS DATE) AS first_day,
+    CAST(MAX(date) AS DATE) AS last_day
+FROM
+    transactions
+GROUP BY
+    account, category, type;
+
+--@name: expenses_per_category
+--@columns: category, expenses
+SELECT
+    category,
+    ROUND(ABS(SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END))) as expenses
+FROM
+    transactions
+GROUP BY
+    category
+HAVING
+    SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END) <> 0
+ORDER BY
+    expenses DESC;
+
+--@name: income_per_category
+--@columns: category, income
+SELECT
+    category,
+    ROUND(ABS(SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END))) as income
+FROM
+    transactions
+GROUP BY
+    category
+HAVING
+    SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END) <> 0
+ORDER BY
+    income DESC;
+
+--@name: monthly_expenses
+--@columns: month, expenses
+SELECT
+    STRFTIME(DATE_TRUNC('month', date), '%m %Y') AS month,
+    ROUND(ABS(SUM(amount))) AS expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    DATE_TRUNC('month', date)
+ORDER BY
+    DATE_TRUNC('month', date);
+
+--@name: monthly_income
+--@columns: month, income
+SELECT
+    STRFTIME(DATE_TRUNC('month', date), '%m %Y') AS month,
+    ROUND(SUM(amount)) AS income
+FROM
+    transactions
+WHERE
+    type = 'Income'
+GROUP BY
+    DATE_TRUNC('month', date)
+ORDER BY
+    DATE_TRUNC('month', date);
+
+--@name: weekly_expenses
+--@columns: week, expenses
+SELECT
+    CAST(DATE_TRUNC('week', date) AS DATE) AS week,
+    ROUND(ABS(SUM(amount))) AS expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    week
+ORDER BY
+    week;
+
+--@name: daily_expenses
+--@columns: day, expenses
+SELECT
+    CAST(date AS DATE) AS day,
+    ROUND(ABS(SUM(amount))) as expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    day
+ORDER BY
+    day;
+
+--@name: payment_methods
+--@columns: account, amount
+SELECT
+    account,
+    ROUND(ABS(SUM(amount))) as amount
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    account
+ORDER BY
+    amount DESC;
+
+--@name: receiving_methods
+--@columns: account, amount
+SELECT
+    account,
+    ROUND(ABS(SUM(amount))) as amount
+FROM
+    transactions
+WHERE
+    type = 'Income'
+GROUP BY
+    account
+ORDER BY
+    amount DESC;
@@ -4,117 +4,168 @@ SELECT * FROM raw_transactions;
 --@name: transactions
 SELECT * FROM transactions;
 
---@name: monthly_amount_over_time
-WITH monthly_data AS (
-    SELECT
-        DATE_FORMAT(date, '%%Y-%%m') AS month,
-        account,
-        ROUND(SUM(amount)) AS amount
-    FROM
-        transactions
-    GROUP BY 
-        DATE_FORMAT(date, '%%Y-%%m'), account
-)
-SELECT
-    month,
-    SUM(amount) OVER (ORDER BY month) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY month) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY month) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY month) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY month) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY month) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY month) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY month) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY month) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY month) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY month) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY month) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY month) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY month) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY month) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY month) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY month) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY month) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY month) AS school_loans
-FROM monthly_data
-ORDER BY month;
-
---@name: weekly_amount_over_time
-WITH weekly_data AS (
-    SELECT
-        DATE(date - INTERVAL WEEKDAY(date) DAY) AS week,
-        account,
-        ROUND(SUM(amount)) AS amount
-    FROM
-        transactions
-    GROUP BY 
-        DATE(date - INTERVAL WEEKDAY(date) DAY), account
-)
+--@name: monthly_account_amounts
+--@columns: month, account, amount
+SELECT
+    DATE_FORMAT(month, '%Y-%m') AS month,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions_monthly
+GROUP BY 
+    transactions_monthly.month, account
+ORDER BY
+    transactions_monthly.month;
+
+--@name: weekly_account_amounts
+--@columns: week, account, amount
+SELECT
+    week,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions_weekly
+GROUP BY 
+    week, account
+ORDER BY
+    week;
+
+--@name: daily_account_amounts
+--@columns: day, account, amount
+SELECT
+    day,
+    account,
+    ROUND(SUM(amount)) AS amount
+FROM
+    transactions_daily
+GROUP BY 
+    day, account
+ORDER BY
+    day;
+
+--@name: monthly_snapshot
+--@columns: month, type, account, category, amount
+--@params: accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE_FORMAT(month, '%Y-%m') AS month,
+    type,
+    account,
+    category,
+    amount
+FROM
+    transactions_monthly
+WHERE
+    (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types);
+
+--@name: weekly_snapshot
+--@columns: week, type, account, category, amount
+--@params: accounts[], categories[], types[], all_accounts, all_categories, all_types
 SELECT
     week,
-    SUM(amount) OVER (ORDER BY week) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY week) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY week) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY week) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY week) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY week) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY week) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY week) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY week) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY week) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY week) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY week) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY week) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY week) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY week) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY week) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY week) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY week) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY week) AS school_loans
-FROM weekly_data
-ORDER BY week;
-
---@name: daily_amount_over_time
-WITH daily_data AS (
-    SELECT
-        DATE(date) AS day,
-        account,
-        ROUND(SUM(amount)) AS amount
-    FROM
-        transactions
-    GROUP BY 
-        DATE(date), account
-)
+    type,
+    account,
+    category,
+    amount
+FROM
+    transactions_weekly
+WHERE
+    (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types);
+
+--@name: daily_snapshot
+--@columns: day, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
 SELECT
     day,
-    SUM(amount) OVER (ORDER BY day) AS net_worth,
-    SUM(CASE WHEN account = 'Wallet' THEN amount ELSE 0 END) OVER (ORDER BY day) AS wallet,
-    SUM(CASE WHEN account = 'Union Bank' THEN amount ELSE 0 END) OVER (ORDER BY day) AS unionbank,
-    SUM(CASE WHEN account = 'SeaBank' THEN amount ELSE 0 END) OVER (ORDER BY day) AS seabank,
-    SUM(CASE WHEN account = 'SeaBank Credit' THEN amount ELSE 0 END) OVER (ORDER BY day) AS seabank_credit,
-    SUM(CASE WHEN account = 'GCash' THEN amount ELSE 0 END) OVER (ORDER BY day) AS gcash,
-    SUM(CASE WHEN account = 'Maya' THEN amount ELSE 0 END) OVER (ORDER BY day) AS maya,
-    SUM(CASE WHEN account = 'Maya Easy Credit' THEN amount ELSE 0 END) OVER (ORDER BY day) AS maya_easy_credit,
-    SUM(CASE WHEN account = 'GrabPay' THEN amount ELSE 0 END) OVER (ORDER BY day) AS grabpay,
-    SUM(CASE WHEN account = 'ShopeePay' THEN amount ELSE 0 END) OVER (ORDER BY day) AS shopeepay,
-    SUM(CASE WHEN account = 'SPayLater' THEN amount ELSE 0 END) OVER (ORDER BY day) AS spaylater,
-    SUM(CASE WHEN account = 'SLoan' THEN amount ELSE 0 END) OVER (ORDER BY day) AS sloan,
-    SUM(CASE WHEN account = 'Binance' THEN amount ELSE 0 END) OVER (ORDER BY day) AS binance,
-    SUM(CASE WHEN account = 'Ronin' THEN amount ELSE 0 END) OVER (ORDER BY day) AS ronin,
-    SUM(CASE WHEN account = 'BDO' THEN amount ELSE 0 END) OVER (ORDER BY day) AS bdo,
-    SUM(CASE WHEN account = 'BPI' THEN amount ELSE 0 END) OVER (ORDER BY day) AS bpi,
-    SUM(CASE WHEN account = 'Borrowed Money' THEN amount ELSE 0 END) OVER (ORDER BY day) AS borrowed_money,
-    SUM(CASE WHEN account = 'Loaned Money' THEN amount ELSE 0 END) OVER (ORDER BY day) AS loaned_money,
-    SUM(CASE WHEN account = 'School Loans' THEN amount ELSE 0 END) OVER (ORDER BY day) AS school_loans
-FROM daily_data
-ORDER BY day;
+    type,
+    account,
+    category,
+    amount
+FROM
+    transactions_daily
+WHERE
+    day >= :start_date AND day < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types);
+
+--@name: monthly_snapshot_by_day
+--@columns: month, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE_FORMAT(day, '%Y-%m') AS month,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions_daily
+WHERE
+    day >= :start_date AND day < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    DATE_FORMAT(day, '%Y-%m'), type, account, category;
+
+--@name: weekly_snapshot_by_day
+--@columns: week, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE(day - INTERVAL WEEKDAY(day) DAY) AS week,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions_daily
+WHERE
+    day >= :start_date AND day < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    DATE(day - INTERVAL WEEKDAY(day) DAY), type, account, category;
+
+--@name: opening_balances
+--@columns: account, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    account,
+    SUM(amount) AS amount
+FROM
+    transactions_daily
+WHERE
+    day < :start_date
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    account;
+
+--@name: filter_options
+--@columns: account, category, type, first_day, last_day
+SELECT
+    account,
+    category,
+    type,
+    MIN(day) AS first_day,
+    MAX(day) AS last_day
+FROM
+    transactions_daily
+GROUP BY
+    account, category, type;
 
 --@name: expenses_per_category
+--@columns: category, expenses
 SELECT
     category,
     ROUND(ABS(SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END))) as expenses
 FROM
-    transactions
+    transactions_monthly
 GROUP BY
     category
 HAVING
@@ -123,11 +174,12 @@ ORDER BY
     expenses DESC;
 
 --@name: income_per_category
+--@columns: category, income
 SELECT
     category,
     ROUND(ABS(SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END))) as income
 FROM
-    transactions
+    transactions_monthly
 GROUP BY
     category
 HAVING
@@ -136,63 +188,68 @@ ORDER BY
     income DESC;
 
 --@name: monthly_expenses
+--@columns: month, expenses
 SELECT
-    DATE_FORMAT(date, '%%m %%Y') AS month,
+    DATE_FORMAT(month, '%m %Y') AS month,
     ROUND(ABS(SUM(amount))) AS expenses
 FROM 
-    transactions
+    transactions_monthly
 WHERE
     type = 'Expense'
 GROUP BY
-    DATE_FORMAT(date, '%%Y-%%m')
+    transactions_monthly.month
 ORDER BY
-    DATE_FORMAT(date, '%%Y-%%m');
+    transactions_monthly.month;
 
 --@name: monthly_income
+--@columns: month, income
 SELECT
-    DATE_FORMAT(date, '%%m %%Y') AS month,
+    DATE_FORMAT(month, '%m %Y') AS month,
     ROUND(SUM(amount)) AS income
 FROM
-    transactions
+    transactions_monthly
 WHERE
     type = 'Income'
 GROUP BY
-    DATE_FORMAT(date, '%%Y-%%m')
+    transactions_monthly.month
 ORDER BY 
-    DATE_FORMAT(date, '%%Y-%%m');
+    transactions_monthly.month;
 
 --@name: weekly_expenses
+--@columns: week, expenses
 SELECT
-    DATE(date - INTERVAL WEEKDAY(date) DAY) AS week,
+    week,
     ROUND(ABS(SUM(amount))) AS expenses
 FROM
-    transactions
+    transactions_weekly
 WHERE
     type = 'Expense'
 GROUP BY
-    DATE(date - INTERVAL WEEKDAY(date) DAY)
+    week
 ORDER BY
-    DATE(date - INTERVAL WEEKDAY(date) DAY);
+    week;
 	
 --@name: daily_expenses
+--@columns: day, expenses
 SELECT
-    DATE(date) AS day,
+    day,
     ROUND(ABS(SUM(amount))) as expenses
 FROM
-    transactions
+    transactions_daily
 WHERE
     type = 'Expense'
 GROUP BY
-    DATE(date)
+    day
 ORDER BY
-    DATE(date);
+    day;
 	
 --@name: payment_methods
+--@columns: account, amount
 SELECT
     account,
     ROUND(ABS(SUM(amount))) as amount
 FROM
-    transactions
+    transactions_monthly
 WHERE
     type = 'Expense'
 GROUP BY
@@ -201,11 +258,12 @@ ORDER BY
     amount DESC;
 	
 --@name: receiving_methods
+--@columns: account, amount
 SELECT
     account,
     ROUND(ABS(SUM(amount))) as amount
 FROM
-    transactions
+    transactions_monthly
 WHERE
     type = 'Income'
 GROUP BY
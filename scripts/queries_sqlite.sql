@@ -0,0 +1,242 @@
+--@name: raw_transactions
+SELECT * FROM raw_transactions;
+
+--@name: transactions
+SELECT * FROM transactions;
+
+--@name: monthly_account_amounts
+--@columns: month, account, amount
+SELECT
+    STRFTIME('%Y-%m', month_start) AS month,
+    account,
+    SUM(ROUND(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    month_start, account
+ORDER BY
+    month_start;
+
+--@name: weekly_account_amounts
+--@columns: week, account, amount
+SELECT
+    week_start AS week,
+    account,
+    SUM(ROUND(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    week_start, account
+ORDER BY
+    week_start;
+
+--@name: daily_account_amounts
+--@columns: day, account, amount
+SELECT
+    DATE(date) AS day,
+    account,
+    SUM(ROUND(amount)) AS amount
+FROM
+    transactions
+GROUP BY
+    day, account
+ORDER BY
+    day;
+
+--@name: monthly_snapshot
+--@columns: month, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    STRFTIME('%Y-%m', date) AS month,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    month, type, account, category;
+
+--@name: weekly_snapshot
+--@columns: week, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE(date, '-6 days', 'weekday 1') AS week,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    week, type, account, category;
+
+--@name: daily_snapshot
+--@columns: day, type, account, category, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    DATE(date) AS day,
+    type,
+    account,
+    category,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date >= :start_date AND date < :end_before
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    day, type, account, category;
+
+--@name: opening_balances
+--@columns: account, amount
+--@params: start_date, end_before, accounts[], categories[], types[], all_accounts, all_categories, all_types
+SELECT
+    account,
+    SUM(amount) AS amount
+FROM
+    transactions
+WHERE
+    date < :start_date
+    AND (:all_accounts OR account IN :accounts)
+    AND (:all_categories OR category IN :categories)
+    AND (:all_types OR type IN :types)
+GROUP BY
+    account;
+
+--@name: filter_options
+--@columns: account, category, type, first_day, last_day
+SELECT
+    account,
+    category,
+    type,
+    DATE(MIN(date)) AS first_day,
+    DATE(MAX(date)) AS last_day
+FROM
+    transactions
+GROUP BY
+    account, category, type;
+
+--@name: expenses_per_category
+--@columns: category, expenses
+SELECT
+    category,
+    ROUND(ABS(SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END))) as expenses
+FROM
+    transactions
+GROUP BY
+    category
+HAVING
+    SUM(CASE WHEN type = 'Expense' THEN amount ELSE 0 END) <> 0
+ORDER BY
+    expenses DESC;
+
+--@name: income_per_category
+--@columns: category, income
+SELECT
+    category,
+    ROUND(ABS(SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END))) as income
+FROM
+    transactions
+GROUP BY
+    category
+HAVING
+    SUM(CASE WHEN type = 'Income' THEN amount ELSE 0 END) <> 0
+ORDER BY
+    income DESC;
+
+--@name: monthly_expenses
+--@columns: month, expenses
+SELECT
+    STRFTIME('%Y-%m', month_start) AS month,
+    ABS(ROUND(SUM(amount))) AS expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    month_start
+ORDER BY
+    month_start;
+
+--@name: monthly_income
+--@columns: month, income
+SELECT
+    STRFTIME('%Y-%m', month_start) AS month,
+    ROUND(SUM(amount)) AS income
+FROM
+    transactions
+WHERE
+    type = 'Income'
+GROUP BY
+    month_start
+ORDER BY
+    month_start;
+
+--@name: weekly_expenses
+--@columns: week, expenses
+SELECT
+    week_start AS week,
+    ROUND(ABS(SUM(amount))) AS expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    week_start
+ORDER BY
+    week_start;
+
+--@name: daily_expenses
+--@columns: day, expenses
+SELECT
+    DATE(date) AS day,
+    ROUND(ABS(SUM(amount))) as expenses
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    day
+ORDER BY
+    day;
+
+--@name: payment_methods
+--@columns: account, amount
+SELECT
+    account,
+    ROUND(ABS(SUM(amount))) as amount
+FROM
+    transactions
+WHERE
+    type = 'Expense'
+GROUP BY
+    account
+ORDER BY
+    amount DESC;
+
+--@name: receiving_methods
+--@columns: account, amount
+SELECT
+    account,
+    ROUND(ABS(SUM(amount))) as amount
+FROM
+    transactions
+WHERE
+    type = 'Income'
+GROUP BY
+    account
+ORDER BY
+    amount DESC;
@@ -0,0 +1,44 @@
+"""
+Query Filters for Personal Finance Dashboard
+Typed sidebar filters that are bound into the named queries as WHERE predicates
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+# Bounds used when no date range is selected, so the date predicate stays a
+# plain index range instead of an "IS NULL OR ..." expression
+MIN_DATE = date(1900, 1, 1)
+MAX_DATE = date(9999, 12, 30)
+
+
+@dataclass(frozen=True)
+class QueryFilters:
+    """Date range, account, category and type filters for dashboard queries"""
+    start_date: date = None
+    end_date: date = None
+    accounts: tuple = ()
+    categories: tuple = ()
+    types: tuple = ()
+
+    def has_date_range(self):
+        return self.start_date is not None or self.end_date is not None
+
+    def params(self):
+        """
+        Return the bind parameters for the filtered named queries. An empty
+        set means "no filter"; the IN list then gets a placeholder value
+        because an empty IN () is not valid SQL.
+        """
+        end_date = self.end_date or MAX_DATE
+        return {
+            'start_date': self.start_date or MIN_DATE,
+            # Exclusive upper bound so timestamps on the end date are included
+            'end_before': end_date + timedelta(days=1),
+            'all_accounts': not self.accounts,
+            'accounts': list(self.accounts) or [''],
+            'all_categories': not self.categories,
+            'categories': list(self.categories) or [''],
+            'all_types': not self.types,
+            'types': list(self.types) or [''],
+        }
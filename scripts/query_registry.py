@@ -0,0 +1,151 @@
+"""
+Named Query Registry for Personal Finance Dashboard
+Parses a --@name: query file once into compiled SQLAlchemy statements
+"""
+
+import hashlib
+import os
+import threading
+from sqlalchemy import bindparam, text
+
+NAME_MARKER = '--@name:'
+DIRECTIVE_PREFIX = '--@'
+
+
+class NamedQuery:
+    """A single named query parsed from a query file"""
+
+    def __init__(self, name, sql, columns=None, params=None):
+        self.name = name
+        self.sql = sql
+        # Parameters declared as name[] take a list and expand into an IN (...)
+        declared = [p[:-2] if p.endswith('[]') else p for p in params or []]
+        self.list_params = [p[:-2] for p in params or [] if p.endswith('[]')]
+        self.statement = self._compile(sql)
+        # Columns are only known when the file declares them with --@columns:
+        self.columns = columns
+        # Bind parameters found in the SQL, plus any declared with --@params:
+        found = list(self.statement.compile().params)
+        self.params = declared + [p for p in found if p not in declared]
+
+    def _compile(self, sql):
+        return text(sql).bindparams(*[bindparam(p, expanding=True) for p in self.list_params])
+
+    def explain(self, keyword='EXPLAIN'):
+        """
+        Return an EXPLAIN statement for the query, taking the same parameters.
+        keyword is the dialect's EXPLAIN form, e.g. SQLite's EXPLAIN QUERY PLAN.
+        """
+        return self._compile(f"{keyword} {self.sql}")
+
+    def describe(self):
+        """Return the query's declared columns and parameters"""
+        return {'columns': self.columns, 'params': self.params}
+
+
+def parse_queries(content):
+    """
+    Splits the contents of a query file into NamedQuery objects keyed by name.
+    """
+    queries = {}
+    for block in content.split(NAME_MARKER)[1:]:
+        lines = block.split('\n')
+        name = lines[0].strip()
+        directives = {}
+        body_start = 1
+        for line in lines[1:]:
+            stripped = line.strip()
+            if not stripped.startswith(DIRECTIVE_PREFIX):
+                break
+            key, _, value = stripped[len(DIRECTIVE_PREFIX):].partition(':')
+            directives[key.strip()] = [v.strip() for v in value.split(',') if v.strip()]
+            body_start += 1
+        sql = '\n'.join(lines[body_start:]).strip()
+        queries[name] = NamedQuery(name, sql, directives.get('columns'), directives.get('params'))
+    return queries
+
+
+class QueryRegistry:
+    """
+    Holds the parsed queries of one query file. The file is only re-read
+    when its mtime changes, and only re-parsed when its content hash changes.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._digest = None
+        self._queries = {}
+        self.refresh()
+
+    def refresh(self):
+        """Reload the query file if it changed on disk"""
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return False
+        with self._lock:
+            if mtime == self._mtime:
+                return False
+            with open(self.path, 'r') as file:
+                content = file.read()
+            digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+            changed = digest != self._digest
+            if changed:
+                self._queries = parse_queries(content)
+                self._digest = digest
+            self._mtime = mtime
+            return changed
+
+    def get(self, query_name):
+        """Return the NamedQuery registered under query_name"""
+        self.refresh()
+        try:
+            return self._queries[query_name]
+        except KeyError:
+            raise ValueError(f"Query with name '{query_name}' not found in the file.") from None
+
+    def statement(self, query_name):
+        """Return the precompiled text() statement for query_name"""
+        return self.get(query_name).statement
+
+    def sql(self, query_name):
+        """Return the raw SQL string for query_name"""
+        return self.get(query_name).sql
+
+    def names(self):
+        """Return the names of all registered queries"""
+        self.refresh()
+        return list(self._queries)
+
+    def describe(self):
+        """Return the declared columns and parameters of every query"""
+        self.refresh()
+        return {name: q.describe() for name, q in self._queries.items()}
+
+    def require(self, query_names):
+        """
+        Raises ValueError if any of query_names is not registered, so callers
+        can check their queries once at startup instead of at render time.
+        """
+        registered = set(self.names())
+        missing = [name for name in query_names if name not in registered]
+        if missing:
+            raise ValueError(f"Queries not found in {os.path.basename(self.path)}: {missing}")
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path):
+    """Return the process-wide QueryRegistry for the given query file"""
+    key = os.path.abspath(path)
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = QueryRegistry(key)
+                _registries[key] = registry
+    return registry
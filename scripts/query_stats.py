@@ -0,0 +1,102 @@
+"""
+Query Statistics for Personal Finance Dashboard
+Rolling window of query and render timings, kept per app rerun
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def elapsed_ms(start):
+    """Milliseconds since a time.perf_counter() start value"""
+    return 1000 * (time.perf_counter() - start)
+
+
+class QueryStats:
+    """
+    Ring buffer of the most recent query and render timings. Each record is
+    tagged with the run started by the thread that made it, so one
+    Streamlit rerun can be listed on its own.
+    """
+
+    def __init__(self, max_records=1000):
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._run_ids = itertools.count(1)
+
+    def start_run(self):
+        """Start a new run for the calling thread and return its id"""
+        self._local.run_id = next(self._run_ids)
+        return self._local.run_id
+
+    def record(self, name, kind='query', **fields):
+        """
+        Add one record. Queries pass wall_ms, db_ms, rows, bytes and cache
+        ('hit', 'duckdb', 'snapshot', 'miss' or 'error'); renders only pass wall_ms.
+        """
+        if fields.get('cache') == 'error':
+            self._local.errors = self.errors() + 1
+        entry = {
+            'run_id': getattr(self._local, 'run_id', None),
+            'kind': kind,
+            'name': name,
+            'at': time.time(),
+            **fields,
+        }
+        with self._lock:
+            self._records.append(entry)
+        return entry
+
+    def errors(self):
+        """Number of failed queries the calling thread has recorded"""
+        return getattr(self._local, 'errors', 0)
+
+    @contextmanager
+    def timer(self, name, kind='render'):
+        """Record how long the with block took"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, kind, wall_ms=elapsed_ms(start))
+
+    def records(self, run_id=None):
+        """Return the records in the window, optionally only those of one run"""
+        with self._lock:
+            records = list(self._records)
+        if run_id is not None:
+            records = [r for r in records if r['run_id'] == run_id]
+        return records
+
+    def slowest(self, limit=10, kind='query'):
+        """
+        Summarise the window per name (calls, cache hits, average and
+        worst wall time), slowest worst case first.
+        """
+        summary = {}
+        for record in self.records():
+            if record['kind'] != kind:
+                continue
+            stats = summary.setdefault(record['name'], {
+                'name': record['name'], 'calls': 0, 'cache_hits': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            })
+            stats['calls'] += 1
+            stats['cache_hits'] += record.get('cache') == 'hit'
+            stats['total_ms'] += record['wall_ms']
+            stats['max_ms'] = max(stats['max_ms'], record['wall_ms'])
+        for stats in summary.values():
+            stats['avg_ms'] = stats['total_ms'] / stats['calls']
+        return sorted(summary.values(), key=lambda s: s['max_ms'], reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+# Shared by every query() in the process
+query_stats = QueryStats(max_records=int(os.getenv('QUERY_STATS_MAX_RECORDS', '1000')))
@@ -1,34 +1,88 @@
 import pandas as pd
 import os
-from sqlalchemy import create_engine
+import time
+from engine_registry import connect
 from database_mysql import get_mysql_connection
+from query_registry import get_registry
+from result_cache import result_cache, make_key, frame_bytes
+from query_stats import query_stats, elapsed_ms
+from data_version import get_data_version
+from snapshot import snapshot_query
+from duckdb_engine import duckdb_query
+from analytics import BUCKETS, balance_matrix, split_snapshot
+from query_filters import QueryFilters
 
-def read_query(query_name):
-    # Get the directory where this script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    query_file_path = os.path.join(script_dir, "queries_mysql.sql")
-    
-    with open(query_file_path, 'r') as file:
-        content = file.read()
-
-    queries = [q.strip() for q in content.split('--@name:')]
-    for q in queries:
-        lines = q.split('\n', 1)
-        name = lines[0].strip()
-        query = lines[1].strip() if len(lines) > 1 else ''
-        if name == query_name:
-            return query
+# Get the directory where this script is located
+QUERY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries_mysql.sql")
 
-    raise ValueError(f"Query with name '{query_name}' not found in the file.")
+def read_query(query_name):
+    return get_registry(QUERY_FILE).sql(query_name)
 
-def query(query_name):
+def query(query_name, params=None):
+    start = time.perf_counter()
     connection_uri = get_mysql_connection()
-    query = read_query(query_name)
-    db_engine = create_engine(connection_uri)
+    key = make_key(connection_uri, query_name, params, get_data_version())
+    df = result_cache.get(key)
+    if df is not None:
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=0.0, rows=len(df), bytes=None, cache='hit')
+        return df
+    df, source = duckdb_query(connection_uri, query_name, params), 'duckdb'
+    if df is None:
+        df, source = snapshot_query(connection_uri, query_name, params), 'snapshot'
+    if df is not None:
+        df.index = range(1, len(df) + 1)
+        nbytes = frame_bytes(df)
+        result_cache.put(key, df, nbytes)
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=None, rows=len(df), bytes=nbytes, cache=source)
+        return df
+    statement = get_registry(QUERY_FILE).statement(query_name)
     try:
-        df = pd.read_sql(query, db_engine)
+        with connect(connection_uri) as connection:
+            db_start = time.perf_counter()
+            df = pd.read_sql(statement, connection, params=params)
+            db_ms = elapsed_ms(db_start)
         df.index = range(1, len(df) + 1)
+        nbytes = frame_bytes(df)
+        result_cache.put(key, df, nbytes)
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=db_ms, rows=len(df), bytes=nbytes, cache='miss')
         return df
     except Exception as e:
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=None, rows=0, bytes=None, cache='error')
         print(f"Error executing query {query_name}: {e}")
         return pd.DataFrame()
+
+def explain(query_name, params=None):
+    """
+    Returns MySQL's EXPLAIN plan for a named query. Filter parameters the
+    query takes default to the unfiltered values.
+    """
+    named = get_registry(QUERY_FILE).get(query_name)
+    params = {**QueryFilters().params(), **(params or {})}
+    with connect(get_mysql_connection()) as connection:
+        return pd.read_sql(named.explain(), connection, params={p: params[p] for p in named.params if p in params})
+
+def amount_over_time(view):
+    """
+    Returns running account balances for the monthly, weekly or daily view,
+    pivoted from the long-form account amounts query.
+    """
+    return balance_matrix(query(f"{view}_account_amounts"), BUCKETS[view])
+
+def filter_options():
+    """Returns the accounts, categories, types and date bounds to filter on"""
+    return query("filter_options")
+
+def dashboard_snapshot(view, filters=None):
+    """
+    Returns every Dashboard tab frame for the view (balances, payment and
+    receiving methods, expenses and income per category, expenses over time)
+    from a single grouped scan of the rollup tables, restricted by filters.
+    """
+    filters = filters or QueryFilters()
+    params = filters.params()
+    # Weekly/monthly rollups can't answer an exact date range; group the daily one instead
+    query_name = f"{view}_snapshot"
+    if filters.has_date_range() and view != 'daily':
+        query_name += "_by_day"
+    opening = query("opening_balances", params) if filters.start_date else None
+    return split_snapshot(query(query_name, params), BUCKETS[view], opening)
@@ -0,0 +1,80 @@
+import pandas as pd
+import os
+import time
+from datetime import date
+from engine_registry import connect
+from database_sqlite import get_sqlite_connection
+from query_registry import get_registry
+from result_cache import result_cache, make_key, frame_bytes
+from query_stats import query_stats, elapsed_ms
+from data_version import get_data_version
+from analytics import BUCKETS, balance_matrix, split_snapshot
+from query_filters import QueryFilters
+
+QUERY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries_sqlite.sql")
+
+def read_query(query_name):
+    return get_registry(QUERY_FILE).sql(query_name)
+
+def sqlite_params(params):
+    """Bind dates as the ISO text SQLite stores them as"""
+    if params is None:
+        return None
+    return {name: value.isoformat() if isinstance(value, date) else value for name, value in params.items()}
+
+def query(query_name, params=None):
+    start = time.perf_counter()
+    connection_uri = get_sqlite_connection()
+    key = make_key(connection_uri, query_name, params, get_data_version())
+    df = result_cache.get(key)
+    if df is not None:
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=0.0, rows=len(df), bytes=None, cache='hit')
+        return df
+    statement = get_registry(QUERY_FILE).statement(query_name)
+    try:
+        with connect(connection_uri) as connection:
+            db_start = time.perf_counter()
+            df = pd.read_sql(statement, connection, params=sqlite_params(params))
+            db_ms = elapsed_ms(db_start)
+        df.index = range(1, len(df) + 1)
+        nbytes = frame_bytes(df)
+        result_cache.put(key, df, nbytes)
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=db_ms, rows=len(df), bytes=nbytes, cache='miss')
+        return df
+    except Exception as e:
+        query_stats.record(query_name, wall_ms=elapsed_ms(start), db_ms=None, rows=0, bytes=None, cache='error')
+        print(f"Error executing query {query_name}: {e}")
+        return pd.DataFrame()
+
+def explain(query_name, params=None):
+    """
+    Returns SQLite's EXPLAIN QUERY PLAN for a named query. Filter parameters
+    the query takes default to the unfiltered values.
+    """
+    named = get_registry(QUERY_FILE).get(query_name)
+    params = sqlite_params({**QueryFilters().params(), **(params or {})})
+    with connect(get_sqlite_connection()) as connection:
+        return pd.read_sql(named.explain("EXPLAIN QUERY PLAN"), connection,
+                           params={p: params[p] for p in named.params if p in params})
+
+def amount_over_time(view):
+    """
+    Returns running account balances for the monthly, weekly or daily view,
+    pivoted from the long-form account amounts query.
+    """
+    return balance_matrix(query(f"{view}_account_amounts"), BUCKETS[view])
+
+def filter_options():
+    """Returns the accounts, categories, types and date bounds to filter on"""
+    return query("filter_options")
+
+def dashboard_snapshot(view, filters=None):
+    """
+    Returns every Dashboard tab frame for the view (balances, payment and
+    receiving methods, expenses and income per category, expenses over time)
+    from a single grouped scan of the transactions table, restricted by filters.
+    """
+    filters = filters or QueryFilters()
+    params = filters.params()
+    opening = query("opening_balances", params) if filters.start_date else None
+    return split_snapshot(query(f"{view}_snapshot", params), BUCKETS[view], opening)
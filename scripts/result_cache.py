@@ -0,0 +1,103 @@
+"""
+Query Result Cache for Personal Finance Dashboard
+Bounded LRU cache of query results, keyed by query, parameters and data version
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def _freeze(value):
+    """Turn parameter values into something hashable"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items)
+    return value
+
+
+def frame_bytes(df):
+    """Deep memory usage of a DataFrame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def make_key(source, query_name, params, data_version):
+    """Build the cache key for one query call"""
+    return (source, query_name, _freeze(params or {}), data_version)
+
+
+class ResultCache:
+    """
+    LRU cache of DataFrames bounded by entry count and total memory.
+    Entries are never invalidated explicitly: bumping the data version
+    changes every key, and stale entries age out of the LRU.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return a copy of the cached frame for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0].copy(deep=False)
+
+    def put(self, key, df, nbytes=None):
+        """
+        Cache df under key, evicting least recently used entries to fit.
+        nbytes is the frame's deep memory usage, if the caller already has it.
+        """
+        if nbytes is None:
+            nbytes = frame_bytes(df)
+        if nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, nbytes)
+            self.total_bytes += nbytes
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counts and current memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every query() in the process
+result_cache = ResultCache(
+    max_entries=int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '128')),
+    max_bytes=int(os.getenv('RESULT_CACHE_MAX_MB', '256')) * 1024 * 1024,
+)
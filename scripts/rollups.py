@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Rollup Tables for Personal Finance Dashboard
+Maintains daily/weekly/monthly aggregates of transactions so dashboard
+queries never have to re-aggregate the raw table
+"""
+
+import sys
+import pandas as pd
+from sqlalchemy import text
+from database_mysql import get_mysql_connection
+from engine_registry import get_engine
+from schema_mysql import ROLLUP_DDL
+
+# Bucket column of each rollup table and how to derive it
+ROLLUP_LEVELS = {
+    'transactions_daily': ('day', "DATE(date)"),
+    'transactions_weekly': ('week', "DATE(day - INTERVAL WEEKDAY(day) DAY)"),
+    'transactions_monthly': ('month', "DATE_FORMAT(day, '%Y-%m-01')"),
+}
+
+# Stored generated bucket columns on transactions, so grouping by week or
+# month reads an indexed column instead of evaluating an expression per row
+BUCKET_COLUMNS = {
+    'week_start': "DATE(date - INTERVAL WEEKDAY(date) DAY)",
+    'month_start': "DATE(date - INTERVAL (DAYOFMONTH(date) - 1) DAY)",
+}
+
+# Covering indexes for the bucketed aggregations of transactions
+BUCKET_INDEXES = {
+    'idx_date_cover': "date, type, account, category, amount",
+    'idx_week_cover': "type, week_start, account, category, amount",
+    'idx_month_cover': "type, month_start, account, category, amount",
+}
+
+# Bucket column of the transactions table behind each rollup
+BASE_BUCKETS = {
+    'transactions_daily': 'date',
+    'transactions_weekly': 'week_start',
+    'transactions_monthly': 'month_start',
+}
+
+
+def create_rollup_tables(conn):
+    """Create the rollup tables if they don't exist"""
+    for table, (bucket, _) in ROLLUP_LEVELS.items():
+        conn.execute(text(ROLLUP_DDL.format(table=table, bucket=bucket)))
+
+
+def ensure_bucket_columns(conn):
+    """
+    Add the generated bucket columns and covering indexes to a transactions
+    table created before they existed (or recreated by DataFrame.to_sql)
+    """
+    columns = conn.execute(text("""
+        SELECT LOWER(column_name) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'transactions'
+    """)).scalars().all()
+    if not columns:
+        return []
+    indexes = conn.execute(text("""
+        SELECT DISTINCT LOWER(index_name) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'transactions'
+    """)).scalars().all()
+
+    changes = [f"ADD COLUMN {column} DATE AS ({expression}) STORED"
+               for column, expression in BUCKET_COLUMNS.items() if column not in columns]
+    changes += [f"ADD INDEX {index} ({index_columns})"
+                for index, index_columns in BUCKET_INDEXES.items() if index not in indexes]
+    if changes:
+        conn.execute(text(f"ALTER TABLE transactions {', '.join(changes)}"))
+    return changes
+
+
+def rollup_source(table, where=""):
+    """SELECT that aggregates transactions into the rows of one rollup table"""
+    bucket = BASE_BUCKETS[table]
+    return f"""
+        SELECT {bucket}, type, account, COALESCE(category, '') AS category,
+               SUM(amount) AS amount, COUNT(*) AS txn_count
+        FROM transactions
+        {where}
+        GROUP BY {bucket}, type, account, category
+    """
+
+
+def _derive_from_daily(conn, table):
+    """Rebuild a weekly or monthly rollup from the daily rollup"""
+    bucket, expression = ROLLUP_LEVELS[table]
+    conn.execute(text(f"DELETE FROM {table}"))
+    conn.execute(text(f"""
+        INSERT INTO {table} ({bucket}, type, account, category, amount, txn_count)
+        SELECT {expression}, type, account, category, SUM(amount), SUM(txn_count)
+        FROM transactions_daily
+        GROUP BY {expression}, type, account, category
+    """))
+
+
+def refresh_rollups(connection_uri=None):
+    """
+    Rebuilds every rollup table from the transactions table in one
+    transaction, so readers never see partially built rollups.
+    Weekly and monthly rollups are derived from the daily one.
+    """
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    with get_engine(connection_uri).begin() as conn:
+        ensure_bucket_columns(conn)
+        create_rollup_tables(conn)
+        conn.execute(text("DELETE FROM transactions_daily"))
+        # Grouping on the bare columns keeps the scan index-ordered; a NULL
+        # and an empty category land on one key through the upsert instead
+        conn.execute(text(f"""
+            INSERT INTO transactions_daily (day, type, account, category, amount, txn_count)
+            {rollup_source('transactions_daily')}
+            ON DUPLICATE KEY UPDATE
+                transactions_daily.amount = transactions_daily.amount + VALUES(amount),
+                transactions_daily.txn_count = transactions_daily.txn_count + VALUES(txn_count)
+        """))
+        _derive_from_daily(conn, 'transactions_weekly')
+        _derive_from_daily(conn, 'transactions_monthly')
+    print("Successfully refreshed rollup tables")
+
+
+def apply_rollup_delta(conn, batch_id):
+    """
+    Adds the transactions of one upload batch to every rollup table, so an
+    append only touches the buckets that batch falls into. Runs on the
+    caller's connection so it commits together with the batch insert; it
+    only issues DML, so the rollup tables must already exist (create them
+    with create_rollup_tables in an earlier transaction, as CREATE TABLE
+    commits implicitly on MySQL).
+    """
+    for table, (bucket, _) in ROLLUP_LEVELS.items():
+        conn.execute(text(f"""
+            INSERT INTO {table} ({bucket}, type, account, category, amount, txn_count)
+            {rollup_source(table, "WHERE batch_id = :batch_id")}
+            ON DUPLICATE KEY UPDATE
+                {table}.amount = {table}.amount + VALUES(amount),
+                {table}.txn_count = {table}.txn_count + VALUES(txn_count)
+        """), {'batch_id': batch_id})
+
+
+def drop_rollups(connection_uri=None):
+    """Drops the rollup tables together with the transactions they summarise"""
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    with get_engine(connection_uri).begin() as conn:
+        for table in ROLLUP_LEVELS:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+def check_rollups(connection_uri=None):
+    """
+    Compares every rollup table against an aggregate of the transactions
+    table and returns the number of mismatched rows per rollup.
+    """
+    if connection_uri is None:
+        connection_uri = get_mysql_connection()
+
+    keys = ['type', 'account', 'category']
+    mismatches = {}
+    with get_engine(connection_uri).connect() as conn:
+        for table, (bucket, _) in ROLLUP_LEVELS.items():
+            base = pd.read_sql(text(rollup_source(table)), conn)
+            base = base.rename(columns={BASE_BUCKETS[table]: bucket})
+            base = base.groupby([bucket] + keys, as_index=False)[['amount', 'txn_count']].sum()
+            rollup = pd.read_sql(text(f"SELECT * FROM {table}"), conn)
+            for frame in (base, rollup):
+                frame[bucket] = pd.to_datetime(frame[bucket])
+            merged = base.merge(rollup, on=[bucket] + keys, how='outer', suffixes=('_base', '_rollup'))
+            amounts_differ = (
+                pd.to_numeric(merged['amount_base']).round(2) != pd.to_numeric(merged['amount_rollup']).round(2)
+            )
+            counts_differ = merged['txn_count_base'] != merged['txn_count_rollup']
+            mismatches[table] = int((amounts_differ | counts_differ).sum())
+    return mismatches
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+
+    if command == 'rebuild':
+        refresh_rollups()
+    elif command == 'migrate':
+        with get_engine(get_mysql_connection()).begin() as conn:
+            changes = ensure_bucket_columns(conn)
+        for change in changes:
+            print(f"🔧 {change}")
+        print("✅ Bucket columns and covering indexes are in place")
+    elif command == 'check':
+        print("🔍 Checking rollup tables against transactions...")
+        mismatches = check_rollups()
+        for table, count in mismatches.items():
+            status = "✅" if count == 0 else "❌"
+            print(f"  {status} {table}: {count} mismatched rows")
+        if any(mismatches.values()):
+            print("Run 'python rollups.py rebuild' to rebuild the rollups.")
+            sys.exit(1)
+    else:
+        print("Usage: python rollups.py [check|rebuild|migrate]")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
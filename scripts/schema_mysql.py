@@ -0,0 +1,116 @@
+"""
+MySQL Schema for Personal Finance Dashboard
+CREATE TABLE templates shared by setup, loads and rollups, matching
+init_database.sql. {table} is the table name, so the same DDL also builds
+staging copies of each table.
+"""
+
+RAW_TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        Type VARCHAR(50),
+        Date DATE,
+        Name VARCHAR(255),
+        Amount DECIMAL(15, 2),
+        Currency VARCHAR(10),
+        Category VARCHAR(100),
+        Account VARCHAR(100),
+        Status VARCHAR(50),
+        batch_id VARCHAR(32),
+        fingerprint CHAR(32),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        INDEX idx_date (Date),
+        INDEX idx_category (Category),
+        INDEX idx_account (Account),
+        INDEX idx_status (Status),
+        INDEX idx_batch (batch_id),
+        UNIQUE INDEX idx_fingerprint (fingerprint)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        type ENUM('Income', 'Expense', 'Transfer') NOT NULL,
+        date DATE NOT NULL,
+        item VARCHAR(255) NOT NULL,
+        amount DECIMAL(15, 2) NOT NULL,
+        currency VARCHAR(10) DEFAULT 'PHP',
+        category VARCHAR(100) NOT NULL,
+        account VARCHAR(100) NOT NULL,
+        status VARCHAR(50) DEFAULT 'Reconciled',
+        batch_id VARCHAR(32),
+        fingerprint CHAR(32),
+        week_start DATE AS (DATE(date - INTERVAL WEEKDAY(date) DAY)) STORED,
+        month_start DATE AS (DATE(date - INTERVAL (DAYOFMONTH(date) - 1) DAY)) STORED,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        INDEX idx_date (date),
+        INDEX idx_category (category),
+        INDEX idx_account (account),
+        INDEX idx_type (type),
+        INDEX idx_status (status),
+        INDEX idx_batch (batch_id),
+        UNIQUE INDEX idx_fingerprint (fingerprint),
+        INDEX idx_amount (amount),
+        INDEX idx_date_cover (date, type, account, category, amount),
+        INDEX idx_week_cover (type, week_start, account, category, amount),
+        INDEX idx_month_cover (type, month_start, account, category, amount),
+        FOREIGN KEY (category) REFERENCES categories(name) ON UPDATE CASCADE,
+        FOREIGN KEY (account) REFERENCES accounts(name) ON UPDATE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+CATEGORIES_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) UNIQUE NOT NULL,
+        type ENUM('Income', 'Expense', 'Both') DEFAULT 'Both',
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_name (name),
+        INDEX idx_type (type)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+ACCOUNTS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) UNIQUE NOT NULL,
+        type ENUM('Asset', 'Liability', 'Equity') DEFAULT 'Asset',
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_name (name),
+        INDEX idx_type (type)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Rollup tables also take the name of their {bucket} column
+ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        {bucket} DATE NOT NULL,
+        type VARCHAR(50) NOT NULL,
+        account VARCHAR(100) NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        amount DECIMAL(17, 2) NOT NULL,
+        txn_count INT NOT NULL,
+        PRIMARY KEY ({bucket}, type, account, category),
+        INDEX idx_{bucket}_type (type, {bucket})
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# DDL of each base table, used to build staging copies on load. The
+# reference tables come first, as the transactions foreign keys point at them
+TABLE_DDL = {
+    'categories': CATEGORIES_DDL,
+    'accounts': ACCOUNTS_DDL,
+    'raw_transactions': RAW_TRANSACTIONS_DDL,
+    'transactions': TRANSACTIONS_DDL,
+}
+
+# Reference table of each transactions column with a foreign key
+REFERENCE_TABLES = {
+    'category': 'categories',
+    'account': 'accounts',
+}
@@ -0,0 +1,89 @@
+"""
+SQLite Schema for Personal Finance Dashboard
+CREATE TABLE and CREATE INDEX templates for the embedded backend. {table}
+is the table name, so the same DDL also builds staging copies of each table.
+SQLite index names are global and survive ALTER TABLE ... RENAME, so the
+indexes are built on the live table once a staging copy is swapped in.
+"""
+
+from sqlalchemy import text
+
+RAW_TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        Type TEXT,
+        Date TEXT,
+        Name TEXT,
+        Amount REAL,
+        Currency TEXT,
+        Category TEXT,
+        Account TEXT,
+        Status TEXT,
+        batch_id TEXT,
+        fingerprint TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+TRANSACTIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL CHECK (type IN ('Income', 'Expense', 'Transfer')),
+        date TEXT NOT NULL,
+        item TEXT,
+        amount REAL NOT NULL,
+        currency TEXT DEFAULT 'PHP',
+        category TEXT NOT NULL,
+        account TEXT NOT NULL,
+        status TEXT DEFAULT 'Reconciled',
+        batch_id TEXT,
+        fingerprint TEXT,
+        week_start TEXT GENERATED ALWAYS AS (DATE(date, '-6 days', 'weekday 1')) STORED,
+        month_start TEXT GENERATED ALWAYS AS (DATE(date, 'start of month')) STORED,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# The indexes of init_database.sql, by table
+INDEX_DDL = {
+    'raw_transactions': [
+        "CREATE INDEX IF NOT EXISTS idx_{table}_date ON {table} (Date)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_category ON {table} (Category)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_account ON {table} (Account)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_status ON {table} (Status)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_batch ON {table} (batch_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_fingerprint ON {table} (fingerprint)",
+    ],
+    'transactions': [
+        "CREATE INDEX IF NOT EXISTS idx_{table}_date ON {table} (date)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_category ON {table} (category)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_account ON {table} (account)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_type ON {table} (type)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_status ON {table} (status)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_batch ON {table} (batch_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_fingerprint ON {table} (fingerprint)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_amount ON {table} (amount)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_date_cover ON {table} (date, type, account, category, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_week_cover ON {table} (type, week_start, account, category, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_month_cover ON {table} (type, month_start, account, category, amount)",
+    ],
+}
+
+# DDL of each base table, used to build staging copies on load
+TABLE_DDL = {
+    'raw_transactions': RAW_TRANSACTIONS_DDL,
+    'transactions': TRANSACTIONS_DDL,
+}
+
+
+def create_indexes(conn, table):
+    """Builds table's indexes, after its rows are loaded"""
+    for ddl in INDEX_DDL.get(table, []):
+        conn.execute(text(ddl.format(table=table)))
+
+
+def create_tables(conn):
+    """Creates the empty tables and their indexes if they don't exist"""
+    for table, ddl in TABLE_DDL.items():
+        conn.execute(text(ddl.format(table=table)))
+        create_indexes(conn, table)
@@ -0,0 +1,40 @@
+"""
+Sidebar Filters for Personal Finance Dashboard
+Streamlit controls that build the QueryFilters pushed down into the named queries
+"""
+
+import pandas as pd
+import streamlit as st
+from query_filters import QueryFilters
+
+
+def _choices(options, column):
+    return sorted(options[column].dropna().unique())
+
+
+def sidebar_filters(options):
+    """
+    Draws the date range, account, category and type filters and returns the
+    selection as QueryFilters. options is the filter_options query result;
+    without data there is nothing to filter on.
+    """
+    if options.empty:
+        return QueryFilters()
+
+    first_day = pd.to_datetime(options['first_day']).min().date()
+    last_day = pd.to_datetime(options['last_day']).max().date()
+    date_range = st.date_input('Date range:', value=(first_day, last_day),
+                               min_value=first_day, max_value=last_day)
+    accounts = st.multiselect('Filter accounts:', _choices(options, 'account'))
+    categories = st.multiselect('Filter categories:', _choices(options, 'category'))
+    types = st.multiselect('Filter types:', _choices(options, 'type'))
+
+    # The range has a single date while the user is still picking the end
+    start_date, end_date = (tuple(date_range) + (None, None))[:2]
+    return QueryFilters(
+        start_date=start_date if start_date and start_date > first_day else None,
+        end_date=end_date if end_date and end_date < last_day else None,
+        accounts=tuple(accounts),
+        categories=tuple(categories),
+        types=tuple(types),
+    )
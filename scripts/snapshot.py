@@ -0,0 +1,276 @@
+"""
+Parquet Snapshot of Transactions for Personal Finance Dashboard
+Columnar copy of the transactions table, written after every load and tagged
+with the data version (after an append only the years it touched are
+rewritten), that answers the dashboard's named aggregates
+without a database round trip
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from engine_registry import connect
+from data_version import CACHE_DIR, get_data_version
+from pipeline import CHUNK_ROWS
+from analytics import BUCKETS
+
+SNAPSHOT_DIR = os.getenv('FINANCE_SNAPSHOT_DIR', os.path.join(CACHE_DIR, 'snapshots'))
+
+# Written last, so a snapshot without it is incomplete. Names starting with
+# an underscore are skipped when the directory is read as a Parquet dataset
+META_FILE = '_snapshot.json'
+
+# The only columns the aggregates read
+AGGREGATE_COLUMNS = ['date', 'type', 'account', 'category', 'amount']
+
+# Filter parameter and column of each list filter
+LIST_FILTERS = [('accounts', 'account'), ('categories', 'category'), ('types', 'type')]
+
+
+def snapshot_path(connection_uri):
+    """Snapshot directory of one database, so the MySQL and PostgreSQL apps don't share one"""
+    source = hashlib.sha1(str(connection_uri).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, source)
+
+
+def snapshot_version(connection_uri):
+    """Data version the snapshot was written at, or None if there is none"""
+    try:
+        with open(os.path.join(snapshot_path(connection_uri), META_FILE)) as f:
+            return json.load(f)['version']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def fresh_snapshot(connection_uri):
+    """The snapshot directory if it matches the current data version, else None"""
+    if snapshot_version(connection_uri) != get_data_version():
+        return None
+    return snapshot_path(connection_uri)
+
+
+def _snapshot_chunk(chunk):
+    """Types that stay the same from chunk to chunk, plus the year partition"""
+    chunk['date'] = pd.to_datetime(chunk['date'])
+    chunk['amount'] = pd.to_numeric(chunk['amount']).astype(float)
+    return chunk.assign(year=chunk['date'].dt.year)
+
+
+def _write_rows(connection, directory, where="", params=None):
+    """Writes the transactions matching where into directory's year partitions. Returns the row count."""
+    rows = 0
+    for chunk in pd.read_sql(text(f"SELECT * FROM transactions {where}"), connection, params=params,
+                             chunksize=CHUNK_ROWS):
+        _snapshot_chunk(chunk).to_parquet(directory, partition_cols=['year'], compression='zstd', index=False)
+        rows += len(chunk)
+    return rows
+
+
+def _write_meta(directory, version, rows):
+    tmp_file = os.path.join(directory, f"{META_FILE}.{os.getpid()}.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump({'version': version, 'rows': rows}, f)
+    os.replace(tmp_file, os.path.join(directory, META_FILE))
+
+
+def _replace_directory(target, staging):
+    """Moves staging to target, removing what target held before"""
+    retired = f"{target}.{os.getpid()}.old"
+    if os.path.exists(target):
+        os.replace(target, retired)
+    os.replace(staging, target)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def write_snapshot(connection_uri, version=None):
+    """
+    Writes transactions to a zstd-compressed Parquet dataset partitioned by
+    year, tagged with version (the current data version by default). The
+    table is read in chunks and the new snapshot replaces the old one only
+    once complete. Returns the number of rows written.
+    """
+    version = get_data_version() if version is None else version
+    target = snapshot_path(connection_uri)
+    staging = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    with connect(connection_uri) as connection:
+        rows = _write_rows(connection, staging)
+    _write_meta(staging, version, rows)
+    _replace_directory(target, staging)
+    return rows
+
+
+def update_snapshot(connection_uri, batch_id, version):
+    """
+    Rewrites only the year partitions that the transactions of one upload
+    batch fall into, then tags the snapshot with version. Only possible
+    when the snapshot matched the data just before this change (version -
+    1); otherwise, or when no batch rows are found, the whole snapshot is
+    written. Returns the number of rows written.
+    """
+    target = snapshot_path(connection_uri)
+    if snapshot_version(connection_uri) != version - 1:
+        return write_snapshot(connection_uri, version)
+
+    staging = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    with connect(connection_uri) as connection:
+        dates = pd.read_sql(text("SELECT DISTINCT date FROM transactions WHERE batch_id = :batch_id"),
+                            connection, params={'batch_id': batch_id})
+        years = sorted(pd.to_datetime(dates['date']).dt.year.unique())
+        rows = 0
+        for year in years:
+            rows += _write_rows(connection, staging, "WHERE date >= :start AND date < :end",
+                                {'start': f"{year}-01-01", 'end': f"{year + 1}-01-01"})
+        total = connection.execute(text("SELECT COUNT(*) FROM transactions")).scalar()
+
+    # The snapshot is already stale for the new version, so no reader uses
+    # it while its partitions are swapped one at a time
+    for year in years:
+        _replace_directory(os.path.join(target, f"year={year}"), os.path.join(staging, f"year={year}"))
+    shutil.rmtree(staging, ignore_errors=True)
+    _write_meta(target, version, total)
+    return rows
+
+
+def refresh_snapshot(connection_uri, version=None, batch_id=None):
+    """
+    write_snapshot for after a load, or update_snapshot after appending the
+    batch batch_id; a failure only costs the faster reads
+    """
+    try:
+        if batch_id is not None and version is not None:
+            rows = update_snapshot(connection_uri, batch_id, version)
+        else:
+            rows = write_snapshot(connection_uri, version)
+        print(f"Wrote Parquet snapshot of {rows} transactions")
+    except Exception as e:
+        print(f"Could not write Parquet snapshot, dashboard reads will use the database: {e}")
+
+
+def read_snapshot(path, columns=AGGREGATE_COLUMNS, start_date=None, end_before=None):
+    """
+    Reads columns of the snapshot, only opening the year partitions that
+    overlap [start_date, end_before)
+    """
+    filters = []
+    if start_date is not None:
+        filters.append(('year', '>=', start_date.year))
+    if end_before is not None:
+        filters.append(('year', '<=', end_before.year))
+    if not any(name.startswith('year=') for name in os.listdir(path)):
+        # Empty table: no partitions were written
+        return pd.DataFrame({column: pd.Series(dtype='datetime64[ns]' if column == 'date' else object)
+                             for column in columns})
+    df = pd.read_parquet(path, columns=columns, filters=filters or None)
+    return df.drop(columns='year', errors='ignore')
+
+
+def _filtered(df, params, dates=True):
+    """Rows of df matching the query filter parameters"""
+    mask = np.ones(len(df), dtype=bool)
+    if dates and 'start_date' in params:
+        mask &= (df['date'] >= pd.Timestamp(params['start_date'])).to_numpy()
+    if dates and 'end_before' in params:
+        mask &= (df['date'] < pd.Timestamp(params['end_before'])).to_numpy()
+    for param, column in LIST_FILTERS:
+        if not params.get('all_' + param, True):
+            mask &= df[column].isin(params[param]).to_numpy()
+    return df[mask]
+
+
+def _round_half_away(amounts):
+    """ROUND() of a DECIMAL: halves round away from zero"""
+    return np.sign(amounts) * np.floor(np.abs(amounts) + 0.5)
+
+
+# How each dialect's queries label the month, week and day buckets
+BUCKET_LABELS = {
+    'mysql': {
+        'month': lambda dates: dates.dt.strftime('%Y-%m'),
+        'week': lambda dates: (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).dt.date,
+        'day': lambda dates: dates.dt.date,
+    },
+    'postgresql': {
+        'month': lambda dates: dates.dt.to_period('M').dt.start_time,
+        # Weeks are labelled by their last day (Sunday)
+        'week': lambda dates: dates.dt.normalize() + pd.to_timedelta(6 - dates.dt.weekday, unit='D'),
+        'day': lambda dates: dates.dt.date,
+    },
+}
+
+
+def _snapshot_rows(df, bucket, labels):
+    """(bucket, type, account, category, amount) sums, like the {view}_snapshot queries"""
+    grouped = df.assign(**{bucket: labels[bucket](df['date'])})
+    return grouped.groupby([bucket, 'type', 'account', 'category'], sort=False)['amount'].sum().reset_index()
+
+
+def _account_amounts(df, bucket, labels, dialect):
+    """(bucket, account, amount) rounded sums, like the {view}_account_amounts queries"""
+    grouped = df.assign(**{bucket: labels[bucket](df['date'])})
+    if dialect == 'mysql':
+        # ROUND(SUM(amount)) over the DECIMAL rollup
+        amounts = grouped.groupby([bucket, 'account'])['amount'].sum()
+        amounts = _round_half_away(amounts.round(2))
+    else:
+        # SUM(ROUND(amount)) over double precision amounts, which round half to even
+        grouped['amount'] = np.round(grouped['amount'])
+        amounts = grouped.groupby([bucket, 'account'])['amount'].sum()
+    return amounts.reset_index()
+
+
+def _filter_options(df):
+    options = df.groupby(['account', 'category', 'type'])['date'].agg(first_day='min', last_day='max').reset_index()
+    options['first_day'] = options['first_day'].dt.date
+    options['last_day'] = options['last_day'].dt.date
+    return options
+
+
+def _aggregate(path, query_name, params, dialect):
+    labels = BUCKET_LABELS[dialect]
+    if query_name == 'opening_balances':
+        df = _filtered(read_snapshot(path, end_before=params['start_date']), params, dates=False)
+        df = df[df['date'] < pd.Timestamp(params['start_date'])]
+        return df.groupby('account')['amount'].sum().reset_index()
+    if query_name == 'filter_options':
+        return _filter_options(read_snapshot(path))
+
+    view, _, kind = query_name.partition('_')
+    bucket = BUCKETS[view]
+    if kind == 'account_amounts':
+        amounts = _account_amounts(read_snapshot(path), bucket, labels, dialect)
+        return amounts.sort_values(bucket, kind='stable', ignore_index=True)
+    df = read_snapshot(path, start_date=params.get('start_date'), end_before=params.get('end_before'))
+    return _snapshot_rows(_filtered(df, params), bucket, labels)
+
+
+def snapshot_query(connection_uri, query_name, params=None):
+    """
+    Answers a dashboard named query from the fresh Parquet snapshot of
+    connection_uri's transactions. Returns None when there is no fresh
+    snapshot, the query isn't one of the snapshot aggregates or the
+    snapshot can't be read, so the caller falls back to the database.
+    """
+    view, _, kind = query_name.partition('_')
+    aggregate = query_name in ('filter_options', 'opening_balances') or (
+        view in BUCKETS and kind in ('snapshot', 'snapshot_by_day', 'account_amounts'))
+    dialect = make_url(str(connection_uri)).get_backend_name()
+    if not aggregate or dialect not in BUCKET_LABELS:
+        return None
+    path = fresh_snapshot(connection_uri)
+    if path is None:
+        return None
+    try:
+        return _aggregate(path, query_name, params or {}, dialect)
+    except Exception as e:
+        print(f"Error reading Parquet snapshot for {query_name}: {e}")
+        return None
@@ -0,0 +1,96 @@
+"""
+Staging Table Loads for Personal Finance Dashboard
+Replaces tables by filling staging copies and swapping them in together, so
+readers never see a missing, partial or unindexed table. On MySQL the
+CREATE TABLE and RENAME TABLE statements commit implicitly, so a load isn't
+one transaction there: what keeps it atomic for readers is that all the
+staging tables are filled first and then swapped in by one RENAME TABLE,
+and a load that fails before the swap leaves the live tables untouched.
+"""
+
+from sqlalchemy import inspect, text
+from bulk_load import write_frame
+
+STAGING_SUFFIX = '_staging'
+RETIRED_SUFFIX = '_old'
+
+
+def create_staging(conn, table, ddl=None):
+    """
+    Creates an empty staging table for table from ddl, a CREATE TABLE
+    template with a {table} placeholder, so it has the live table's columns
+    and indexes. Returns the staging table name.
+    """
+    staging = table + STAGING_SUFFIX
+    conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    if ddl is not None:
+        conn.execute(text(ddl.format(table=staging)))
+    return staging
+
+
+def swap_all(conn, swaps):
+    """
+    Replace every table of swaps, a {table: staging} dict, with its staging
+    table in one step and drop the old copies
+    """
+    retired = {table: table + RETIRED_SUFFIX for table in swaps}
+    for old in retired.values():
+        conn.execute(text(f"DROP TABLE IF EXISTS {old}"))
+    existing = [table for table in swaps if inspect(conn).has_table(table)]
+    if conn.dialect.name == 'mysql':
+        # A single RENAME TABLE renames all the tables atomically
+        renames = []
+        for table, staging in swaps.items():
+            if table in existing:
+                renames.append(f"{table} TO {retired[table]}")
+            renames.append(f"{staging} TO {table}")
+        conn.execute(text(f"RENAME TABLE {', '.join(renames)}"))
+    else:
+        # Transactional DDL: readers see the old tables until commit
+        for table, staging in swaps.items():
+            if table in existing:
+                conn.execute(text(f"ALTER TABLE {table} RENAME TO {retired[table]}"))
+            conn.execute(text(f"ALTER TABLE {staging} RENAME TO {table}"))
+    for old in retired.values():
+        conn.execute(text(f"DROP TABLE IF EXISTS {old}"))
+
+
+def swap_in(conn, table, staging):
+    """Replace table with staging in one step and drop the old copy"""
+    swap_all(conn, {table: staging})
+
+
+def staged_columns(conn, staging, df):
+    """The columns of df that the staging table has"""
+    columns = {column['name'].lower() for column in inspect(conn).get_columns(staging)}
+    kept = [column for column in df.columns if str(column).lower() in columns]
+    dropped = [column for column in df.columns if column not in kept]
+    if dropped:
+        print(f"Skipping columns not in the {staging} schema: {dropped}")
+    return kept
+
+
+def fill_staging(df, table, conn, ddl=None, dtype=None):
+    """
+    Writes df to a new staging table for table. With ddl the rows go into an
+    indexed copy built from it (columns it lacks are skipped); without, the
+    staging table takes df's schema. Returns the staging table name and the
+    number of rows written.
+    """
+    staging = create_staging(conn, table, ddl)
+    if ddl is not None:
+        rows = write_frame(df[staged_columns(conn, staging, df)], staging, conn, 'append', dtype)
+    else:
+        rows = write_frame(df, staging, conn, 'replace', dtype)
+    return staging, rows
+
+
+def staged_load(df, table, conn, ddl=None, dtype=None):
+    """
+    Replaces the contents of table with df through fill_staging, so the
+    table is only swapped in once fully loaded. Returns the number of rows
+    written.
+    """
+    staging, rows = fill_staging(df, table, conn, ddl, dtype)
+    swap_in(conn, table, staging)
+    return rows
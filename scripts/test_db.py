@@ -1,4 +1,4 @@
-from database_sqlite import get_sqlite_connection, load
+from database_sqlite import get_sqlite_connection, load, transform, DATABASE_FILE
 import os
 import pandas as pd
 from sqlalchemy import create_engine, text
@@ -11,7 +11,7 @@ def test_database_connection():
     print(f"Database connection URI: {conn_uri}")
     
     # Check if database file exists
-    db_path = "personal_finance_dashboard.db"
+    db_path = DATABASE_FILE
     if os.path.exists(db_path):
         print(f"✅ Database file exists: {db_path}")
         size = os.path.getsize(db_path)
@@ -39,7 +39,8 @@ def test_data_loading():
         # Load sample data
         sample_df = pd.read_csv("../sample_transactions.csv")
         print(f"📋 Sample data shape: {sample_df.shape}")
-        load(sample_df, "transactions")
+        load(sample_df, "raw_transactions")
+        load(transform(sample_df), "transactions")
         print("✅ Sample data loaded successfully!")
         return True
     except Exception as e:
@@ -0,0 +1,166 @@
+"""
+Transaction Browser for Personal Finance Dashboard
+Pages through the transactions table with keyset pagination on
+(sort column, id), so each page is one index range scan of page_size rows
+however deep into the history it is, and only that page is sent to the browser
+"""
+
+import time
+from datetime import date
+import pandas as pd
+import streamlit as st
+from sqlalchemy import bindparam, text
+from engine_registry import connect
+from query_filters import QueryFilters
+from query_stats import query_stats, elapsed_ms
+from data_version import get_data_version
+from dashboard_cache import frame
+
+BROWSER_COLUMNS = ['id', 'date', 'type', 'item', 'amount', 'currency', 'category', 'account', 'status']
+
+# Sort order label -> (indexed column, descending); id breaks ties
+SORTS = {
+    'Newest first': ('date', True),
+    'Oldest first': ('date', False),
+    'Largest amount': ('amount', True),
+    'Smallest amount': ('amount', False),
+}
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# LIKE escape character for the search text
+ESCAPE = '!'
+
+
+def page_sql(column, descending, keyset, date_range=True):
+    """
+    SELECT of one page ordered by (column, id). With keyset the page starts
+    after the row (:after_value, :after_id) in that order. Without a
+    date_range the date predicate is left out, so sorting by amount can
+    walk the amount index instead of the date range.
+    """
+    direction, comparison = ('DESC', '<') if descending else ('ASC', '>')
+    # Spelled out rather than as a row comparison, which MySQL doesn't turn
+    # into a range scan; the leading bound on the column alone is what both
+    # MySQL and SQLite seek the column's index with
+    after = (f"AND {column} {comparison}= :after_value"
+             f" AND ({column} {comparison} :after_value OR id {comparison} :after_id)" if keyset else "")
+    dates = "date >= :start_date AND date < :end_before" if date_range else "TRUE"
+    return f"""
+        SELECT {', '.join(BROWSER_COLUMNS)}
+        FROM transactions
+        WHERE {dates}
+            AND (:all_accounts OR account IN :accounts)
+            AND (:all_categories OR category IN :categories)
+            AND (:all_types OR type IN :types)
+            AND (:all_items OR item LIKE :search ESCAPE '{ESCAPE}')
+            {after}
+        ORDER BY {column} {direction}, id {direction}
+        LIMIT :limit
+    """
+
+
+def search_pattern(search):
+    """LIKE pattern matching search anywhere in the item, taken literally"""
+    for char in (ESCAPE, '%', '_'):
+        search = search.replace(char, ESCAPE + char)
+    return f"%{search}%"
+
+
+def _page_query(connection, filters, sort, search, after, page_size):
+    """The page SELECT of fetch_page and its parameters for connection's dialect"""
+    column, descending = SORTS[sort]
+    filters = filters or QueryFilters()
+    search = search.strip()
+    params = {
+        **filters.params(),
+        'all_items': not search,
+        'search': search_pattern(search),
+        # One extra row tells whether there is a next page
+        'limit': page_size + 1,
+    }
+    if after is not None:
+        params['after_value'], params['after_id'] = after
+    if connection.dialect.name == 'sqlite':
+        # SQLite stores dates as ISO text
+        params = {name: value.isoformat() if isinstance(value, date) else value
+                  for name, value in params.items()}
+    sql = page_sql(column, descending, after is not None, filters.has_date_range())
+    return sql, params
+
+
+def _bound(sql):
+    """sql with the list filters expanded into IN lists"""
+    return text(sql).bindparams(*[bindparam(name, expanding=True) for name in ('accounts', 'categories', 'types')])
+
+
+def fetch_page(connection_uri, filters=None, sort='Newest first', search='', after=None, page_size=50):
+    """
+    Returns (page, next_after): up to page_size transactions matching
+    filters and the item search, in sort order, starting after the
+    (value, id) key after. next_after is the key to pass for the following
+    page, or None on the last page.
+    """
+    start = time.perf_counter()
+    column = SORTS[sort][0]
+    try:
+        with connect(connection_uri) as connection:
+            sql, params = _page_query(connection, filters, sort, search, after, page_size)
+            db_start = time.perf_counter()
+            page = pd.read_sql(_bound(sql), connection, params=params)
+            db_ms = elapsed_ms(db_start)
+    except Exception as e:
+        query_stats.record('transactions_page', wall_ms=elapsed_ms(start), db_ms=None, rows=0, bytes=None, cache='error')
+        print(f"Error executing query transactions_page: {e}")
+        return pd.DataFrame(columns=BROWSER_COLUMNS), None
+    next_after = None
+    if len(page) > page_size:
+        page = page.iloc[:page_size]
+        last = page.iloc[-1]
+        next_after = (last[column], int(last['id']))
+    query_stats.record('transactions_page', wall_ms=elapsed_ms(start), db_ms=db_ms, rows=len(page),
+                       bytes=int(page.memory_usage(deep=True).sum()), cache='miss')
+    return page, next_after
+
+
+def explain_page(connection_uri, filters=None, sort='Newest first', search='', after=None, page_size=50):
+    """The database's plan for the page fetch_page would read with these arguments"""
+    with connect(connection_uri) as connection:
+        sql, params = _page_query(connection, filters, sort, search, after, page_size)
+        explain = "EXPLAIN QUERY PLAN" if connection.dialect.name == 'sqlite' else "EXPLAIN"
+        return pd.read_sql(_bound(f"{explain} {sql}"), connection, params=params)
+
+
+def transaction_browser(connection_uri, filters=None, key='browser'):
+    """
+    Draws the paginated transactions table with its sort, search and page
+    controls. filters are the sidebar's; the search matches item names.
+    The keys of the pages visited so far are kept in session state, so
+    Previous goes back without a reverse query.
+    """
+    c1, c2, c3 = st.columns([3, 2, 1])
+    search = c1.text_input('Search items:', key=f'{key}_search')
+    sort = c2.selectbox('Sort by:', list(SORTS), key=f'{key}_sort')
+    page_size = c3.selectbox('Rows per page:', PAGE_SIZES, index=1, key=f'{key}_page_size')
+
+    # Start over from the first page when the listing changes
+    listing = (connection_uri, filters, sort, search.strip(), page_size, get_data_version())
+    if st.session_state.get(f'{key}_listing') != listing:
+        st.session_state[f'{key}_listing'] = listing
+        st.session_state[f'{key}_pages'] = [None]
+    pages = st.session_state[f'{key}_pages']
+
+    page, next_after = frame(fetch_page, connection_uri, filters, sort, search, pages[-1], page_size)
+    if page.empty:
+        st.info("No transactions match. Upload a CSV file or change the filters.")
+        return
+    st.dataframe(page.set_index('id'), height=400, use_container_width=True)
+
+    p1, p2, p3 = st.columns([1, 1, 4])
+    if p1.button('Previous', key=f'{key}_previous', disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    if p2.button('Next', key=f'{key}_next', disabled=next_after is None):
+        pages.append(next_after)
+        st.rerun()
+    p3.caption(f"Page {len(pages)}, {len(page)} transactions")
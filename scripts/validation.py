@@ -0,0 +1,93 @@
+"""
+Upload Validation for Personal Finance Dashboard
+Column-wise checks of a Bluecoins export, reported as one issue table
+"""
+
+import numpy as np
+import pandas as pd
+
+ISSUE_COLUMNS = ['row', 'column', 'rule', 'severity', 'value']
+
+# CSV line number of the first data row (line 1 is the header)
+FIRST_DATA_LINE = 2
+
+REQUIRED_TEXT_COLUMNS = ['Name', 'Category', 'Account']
+
+VALID_TYPES = ['Income', 'Expense', 'Transfer']
+VALID_STATUSES = ['Reconciled', 'Pending', 'Cleared']
+
+
+def _issues(df, mask, column, rule, severity='error'):
+    """One issue row for every row of df where mask is True"""
+    positions = np.flatnonzero(mask.to_numpy(dtype=bool))
+    values = df[column].iloc[positions].to_numpy(dtype=object) if column is not None else None
+    return pd.DataFrame({
+        'row': positions + FIRST_DATA_LINE,
+        'column': column,
+        'rule': rule,
+        'severity': severity,
+        'value': values,
+    }, columns=ISSUE_COLUMNS)
+
+
+def parse_dates(dates):
+    """
+    Parses a date column, one vectorized pass over its distinct values
+    (exports repeat each date many times) using the format of the first
+    date. Values that don't match that format are retried one by one, so
+    exports with mixed date formats are still accepted.
+    """
+    codes, uniques = pd.factorize(dates)
+    uniques = pd.Series(uniques)
+    parsed = pd.to_datetime(uniques, errors='coerce')
+    retry = parsed.isna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(uniques[retry], errors='coerce', format='mixed')
+    # Missing dates have code -1 and come out as NaT
+    return pd.Series(parsed.to_numpy()[codes], index=dates.index).where(codes >= 0)
+
+
+def _blank(values):
+    return values.isna() | values.astype('string').str.strip().eq('')
+
+
+def validate_transactions(df, valid_types=VALID_TYPES, valid_statuses=VALID_STATUSES):
+    """
+    Checks every column of an export at once and returns the issues as a
+    DataFrame with one row per failed check: the CSV row, column, rule,
+    severity ('error' blocks the upload, 'warning' doesn't) and the
+    offending value. No issues means an empty table.
+    """
+    if df.empty:
+        return pd.DataFrame([{'row': None, 'column': None, 'rule': 'empty_file',
+                              'severity': 'error', 'value': None}], columns=ISSUE_COLUMNS)
+
+    checks = [_issues(df, ~df['Type'].isin(valid_types), 'Type', 'invalid_type')]
+
+    date_present = df['Date'].notna()
+    checks.append(_issues(df, ~date_present, 'Date', 'missing'))
+    checks.append(_issues(df, date_present & parse_dates(df['Date']).isna(), 'Date', 'invalid_date'))
+
+    amount_present = df['Amount'].notna()
+    amounts = pd.to_numeric(df['Amount'], errors='coerce')
+    checks.append(_issues(df, ~amount_present, 'Amount', 'missing'))
+    checks.append(_issues(df, amount_present & amounts.isna(), 'Amount', 'invalid_amount'))
+
+    for column in REQUIRED_TEXT_COLUMNS:
+        checks.append(_issues(df, _blank(df[column]), column, 'missing'))
+
+    unusual_status = df['Status'].notna() & ~df['Status'].isin(valid_statuses)
+    checks.append(_issues(df, unusual_status, 'Status', 'unusual_status', 'warning'))
+    checks.append(_issues(df, df.duplicated(), None, 'duplicate_row', 'warning'))
+
+    found = [check for check in checks if not check.empty]
+    if not found:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(found, ignore_index=True)
+    return issues.sort_values('row', kind='stable', ignore_index=True)
+
+
+def issue_summary(issues):
+    """Issue counts per severity, column and rule, most frequent first"""
+    return (issues.groupby(['severity', 'column', 'rule'], dropna=False).size()
+            .rename('count').sort_values(ascending=False).reset_index())
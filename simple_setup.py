@@ -8,6 +8,11 @@ import os
 import sys
 from sqlalchemy import create_engine, text
 from urllib.parse import quote_plus
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from rollups import refresh_rollups
+from snapshot import refresh_snapshot
+from data_version import bump_data_version
 
 def load_env_directly():
     """Load environment variables directly from .env file"""
@@ -129,6 +134,19 @@ def create_database_tables(engine):
         print(f"❌ Error creating tables: {e}")
         return False
 
+def create_rollup_tables(engine):
+    """Build the rollup tables the dashboard reads from any existing transactions"""
+    try:
+        print("📈 Building rollup tables...")
+        connection_uri = engine.url.render_as_string(hide_password=False)
+        refresh_rollups(connection_uri)
+        refresh_snapshot(connection_uri, bump_data_version())
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error building rollup tables: {e}")
+        return False
+
 def insert_default_data(engine):
     """Insert default categories and accounts"""
     try:
@@ -207,6 +225,10 @@ def main():
     if not create_database_tables(engine):
         return False
     
+    # Create the daily/weekly/monthly rollups of transactions
+    if not create_rollup_tables(engine):
+        return False
+    
     # Insert default data
     if not insert_default_data(engine):
         return False
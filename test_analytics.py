@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test the in-process dashboard analytics
+"""
+
+import os
+import sys
+import pandas as pd
+from datetime import date
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from query_filters import QueryFilters
+from analytics import balance_matrix, account_columns, split_snapshot
+from compact import compact_frame, storage_frame
+
+def test_balance_matrix():
+    print("🔍 Testing balance matrix...")
+    amounts = pd.DataFrame({
+        'month': ['2024-02', '2024-01', '2024-01', '2024-03'],
+        'account': ['Wallet', 'Wallet', 'BDO', 'New Bank'],
+        'amount': [-100, 500, 1000, 50],
+    })
+    balances = balance_matrix(amounts, 'month')
+    print(balances)
+    assert list(balances['month']) == ['2024-01', '2024-02', '2024-03']
+    assert list(balances['Wallet']) == [500, 400, 400]
+    assert list(balances['BDO']) == [1000, 1000, 1000]
+    assert list(balances['New Bank']) == [0, 0, 50]
+    assert list(balances['net_worth']) == [1500, 1400, 1450]
+    assert account_columns(balances) == ['net_worth', 'BDO', 'New Bank', 'Wallet']
+    print("✅ Balance matrix correct")
+
+def test_empty_balance_matrix():
+    balances = balance_matrix(pd.DataFrame(), 'day')
+    assert balances.empty
+    assert account_columns(balances) == ['net_worth']
+
+def test_split_snapshot():
+    print("🔍 Testing dashboard snapshot split...")
+    rows = pd.DataFrame({
+        'week': ['2024-01-01', '2024-01-01', '2024-01-08', '2024-01-08'],
+        'type': ['Income', 'Expense', 'Expense', 'Expense'],
+        'account': ['BDO', 'Wallet', 'Wallet', 'GCash'],
+        'category': ['Salary', 'Food', 'Food', 'Transport'],
+        'amount': [1000.0, -200.0, -100.4, -50.0],
+    })
+    snapshot = split_snapshot(rows, 'week')
+    assert list(snapshot['balances']['net_worth']) == [800, 650]
+    assert snapshot['payment_methods'].to_dict('list') == {'account': ['Wallet', 'GCash'], 'amount': [300, 50]}
+    assert snapshot['receiving_methods'].to_dict('list') == {'account': ['BDO'], 'amount': [1000]}
+    assert snapshot['expenses_per_category'].to_dict('list') == {'category': ['Food', 'Transport'], 'expenses': [300, 50]}
+    assert snapshot['income_per_category'].to_dict('list') == {'category': ['Salary'], 'income': [1000]}
+    assert snapshot['expenses'].to_dict('list') == {'week': ['2024-01-01', '2024-01-08'], 'expenses': [200, 150]}
+    assert all(df.empty for df in split_snapshot(pd.DataFrame(), 'week').values())
+    print("✅ Snapshot panels correct")
+
+def test_opening_balances():
+    amounts = pd.DataFrame({'day': ['2024-02-01'], 'account': ['Wallet'], 'amount': [50.0]})
+    opening = pd.DataFrame({'account': ['Wallet', 'BDO'], 'amount': [100.0, 1000.0]})
+    balances = balance_matrix(amounts, 'day', opening)
+    assert balances.to_dict('list') == {'day': ['2024-02-01'], 'net_worth': [1150], 'BDO': [1000], 'Wallet': [150]}
+
+def test_query_filter_params():
+    print("🔍 Testing query filter parameters...")
+    params = QueryFilters().params()
+    assert params['all_accounts'] and params['accounts'] == ['']
+    params = QueryFilters(start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), accounts=('BDO',)).params()
+    assert params['start_date'] == date(2024, 1, 1)
+    assert params['end_before'] == date(2024, 2, 1)
+    assert not params['all_accounts'] and params['accounts'] == ['BDO']
+    assert params['all_categories'] and params['all_types']
+    print("✅ Filter parameters correct")
+
+def test_compact_frame():
+    print("🗜️ Testing compact transaction layout...")
+    df = pd.DataFrame({'type': ['Expense', 'Income'], 'item': ['Coffee', 'Salary'],
+                       'amount': [-150.1, 50000.0], 'account': ['GCash', 'BDO']})
+    compact = compact_frame(df)
+    assert list(compact.columns) == ['type', 'item', 'amount_cents', 'account']
+    assert isinstance(compact['type'].dtype, pd.CategoricalDtype)
+    assert list(compact['amount_cents']) == [-15010, 5000000]
+    # The database sees the original columns and amounts again
+    stored = storage_frame(compact)
+    assert stored.to_dict('list') == df.to_dict('list')
+    print("✅ Compact layout round-trips")
+
+if __name__ == "__main__":
+    test_balance_matrix()
+    test_empty_balance_matrix()
+    test_split_snapshot()
+    test_opening_balances()
+    test_query_filter_params()
+    test_compact_frame()
+    print("🎉 Analytics tests passed!")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test parallel multi-file ingestion
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from unittest import mock
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+import batch_ingest
+from batch_ingest import expand_sources, ingest_files, report_table
+from database import transform
+
+HEADER = "Type,Date,Name,Amount,Currency,Category,Account,Status\n"
+
+FILES = {
+    'alice.csv': HEADER + """Expense,2024-01-15,Coffee,-150.00,PHP,Food & Dining,GCash,Reconciled
+Income,2024-01-16,Monthly Salary,50000.00,PHP,Salary,BDO,Reconciled
+""",
+    # Bob's export shares the joint BDO account, so the salary appears twice
+    'bob.csv': HEADER + """Income,2024-01-16,Monthly Salary,50000.00,PHP,Salary,BDO,Reconciled
+Expense,2024-01-17,Taxi,-300.00,PHP,Transportation,Wallet,Pending
+""",
+    'broken.csv': HEADER + """Expense,2024-01-18,Lunch,lots,PHP,Food & Dining,Wallet,Reconciled
+""",
+    'notes.csv': "Date,Note\n2024-01-18,hello\n",
+}
+
+def test_ingest_files():
+    print("📚 Testing parallel batch ingest...")
+    with tempfile.TemporaryDirectory() as folder:
+        for name, content in FILES.items():
+            with open(os.path.join(folder, name), 'w') as file:
+                file.write(content)
+        paths = expand_sources(folder)
+        assert [os.path.basename(path) for path in paths] == sorted(FILES)
+
+        progress = []
+        reports, raw, cleaned = ingest_files(paths, transform, workers=2, progress=progress.append)
+
+    # Failing files are reported without stopping the others
+    table = report_table(reports).set_index('file')
+    assert table.loc['broken.csv', 'errors'] == 1
+    assert 'Missing required columns' in table.loc['notes.csv', 'error']
+    assert table['error'].isna().sum() == 2
+    assert progress[-1] == {'files': 4, 'total': 4, 'rows': int(table['rows'].sum()),
+                            'valid_rows': int(table.loc[table['error'].isna(), 'rows'].sum())}
+
+    # The shared transaction is loaded once
+    assert len(raw) == 3
+    assert list(cleaned['item']) == ['Coffee', 'Monthly Salary']
+    assert cleaned['fingerprint'].is_unique
+    print("✅ Files prepared in parallel and merged")
+
+def test_ingest_bytes():
+    print("📤 Testing uploaded file contents...")
+    reports, raw, cleaned = ingest_files([('alice.csv', FILES['alice.csv'].encode())], transform)
+    assert reports[0]['file'] == 'alice.csv'
+    assert len(cleaned) == 2
+    print("✅ Uploaded bytes ingested")
+
+def test_workers_are_not_forked():
+    print("🧵 Testing worker start method...")
+    pools = []
+    executor = batch_ingest.ProcessPoolExecutor
+    def recording_executor(*args, **kwargs):
+        pools.append(kwargs.get('mp_context'))
+        return executor(*args, **kwargs)
+    files = [(name, FILES[name].encode()) for name in ('alice.csv', 'bob.csv')]
+    # Ingest runs on the upload job thread while the app's own threads are alive
+    results = []
+    with mock.patch.object(batch_ingest, 'ProcessPoolExecutor', side_effect=recording_executor):
+        worker = threading.Thread(target=lambda: results.append(ingest_files(files, transform, workers=2)))
+        worker.start()
+        worker.join(60)
+    assert [pool.get_start_method() for pool in pools] in (['forkserver'], ['spawn'])
+    reports, raw, cleaned = results[0]
+    assert all(report['error'] is None for report in reports) and len(raw) == 3
+    print(f"✅ Workers started with {pools[0].get_start_method()}")
+
+if __name__ == "__main__":
+    test_ingest_files()
+    test_ingest_bytes()
+    test_workers_are_not_forked()
+    print("🎉 Batch ingest tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the bulk loaders' serialisation and their fallback to INSERTs
+"""
+
+import os
+import sys
+from unittest import mock
+import numpy as np
+import pandas as pd
+import pymysql
+from sqlalchemy import create_engine, text
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+import bulk_load
+from bulk_load import _mysql_csv, write_frame, LOCAL_INFILE_DISABLED
+
+# Escape sequences LOAD DATA decodes with its default ESCAPED BY '\\'
+ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+TRICKY = pd.DataFrame({
+    'item': ['Tab\there', 'Two\nlines', 'C:\\new\\temp\\', 'The "best" coffee, hot', None, '\\N', ''],
+    'amount': [1.5, -2.25, np.nan, 4.0, 5.0, 6.0, 7.0],
+    'date': pd.to_datetime(['2024-01-15', '2024-01-16', None, '2024-01-18', '2024-01-19', '2024-01-20',
+                            '2024-01-21']),
+})
+
+def parse_load_data(data):
+    """
+    Rows of data as LOAD DATA reads them with FIELDS TERMINATED BY ','
+    OPTIONALLY ENCLOSED BY '"' LINES TERMINATED BY '\\n': an unquoted \\N is
+    NULL and backslash sequences are unescaped
+    """
+    rows, row, i = [], [], 0
+    while i < len(data):
+        value = ''
+        if data[i] == '"':
+            i += 1
+            while True:
+                if data[i] == '\\':
+                    value += ESCAPES.get(data[i + 1], data[i + 1])
+                    i += 2
+                elif data[i] == '"' and data[i + 1:i + 2] == '"':
+                    value += '"'
+                    i += 2
+                elif data[i] == '"':
+                    i += 1
+                    break
+                else:
+                    value += data[i]
+                    i += 1
+        else:
+            start = i
+            while data[i] not in ',\n':
+                if data[i] == '\\':
+                    value += ESCAPES.get(data[i + 1], data[i + 1])
+                    i += 2
+                else:
+                    value += data[i]
+                    i += 1
+            if data[start:i] == '\\N':
+                value = None
+        row.append(value)
+        if data[i] == '\n':
+            rows.append(row)
+            row = []
+        i += 1
+    return rows
+
+def test_mysql_csv_escaping():
+    print("🔍 Testing LOAD DATA serialisation...")
+    rows = parse_load_data(_mysql_csv(TRICKY))
+    assert len(rows) == len(TRICKY) and all(len(row) == 3 for row in rows)
+    # Tabs, newlines, backslashes, quotes and commas come back as they were
+    assert [row[0] for row in rows] == [None if pd.isna(item) else item for item in TRICKY['item']]
+    # Missing values of any type are NULL, the text '\N' and '' are not
+    assert [row[1] for row in rows] == ['1.5', '-2.25', None, '4.0', '5.0', '6.0', '7.0']
+    assert rows[2][2] is None and rows[0][2] == '2024-01-15'
+    print("✅ Values survive LOAD DATA's escaping")
+
+def test_refused_local_infile_falls_back():
+    print("🔍 Testing the INSERT fallback...")
+    engine = create_engine('sqlite://')
+    for code in sorted(LOCAL_INFILE_DISABLED):
+        # Route writes through the MySQL loader, refusing LOAD DATA LOCAL INFILE with code
+        refused = mock.Mock(side_effect=pymysql.err.OperationalError(code, "LOAD DATA LOCAL INFILE is disabled"))
+        with mock.patch.object(bulk_load, 'load_data_infile', refused), \
+                mock.patch.dict(bulk_load.BULK_LOADERS, {'pysqlite': refused}), engine.begin() as conn:
+            assert write_frame(TRICKY, 'items', conn, 'replace') == len(TRICKY)
+            stored = pd.read_sql(text("SELECT item FROM items"), conn)
+        assert refused.called, code
+        assert stored['item'].tolist() == TRICKY['item'].tolist(), code
+
+    # Other MySQL errors are raised
+    failed = mock.Mock(side_effect=pymysql.err.OperationalError(1045, "Access denied"))
+    with mock.patch.object(bulk_load, 'load_data_infile', failed), \
+            mock.patch.dict(bulk_load.BULK_LOADERS, {'pysqlite': failed}), engine.begin() as conn:
+        try:
+            write_frame(TRICKY, 'items', conn, 'replace')
+            assert False, "write_frame should have raised"
+        except pymysql.err.OperationalError as e:
+            assert e.args[0] == 1045
+    print(f"✅ Errors {sorted(LOCAL_INFILE_DISABLED)} fall back to INSERTs")
+
+if __name__ == "__main__":
+    test_mysql_csv_escaping()
+    test_refused_local_infile_falls_back()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test LTTB downsampling and the reduced line charts
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+import chart_reduction
+from chart_reduction import lttb, reduced_line
+
+def daily_balances(days=3653):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({'day': pd.date_range('2015-01-01', periods=days, freq='D').strftime('%Y-%m-%d')})
+    for account in ['BDO', 'GCash', 'Wallet']:
+        df[account] = np.cumsum(rng.normal(0, 500, days)).round()
+    df.insert(1, 'net_worth', df[['BDO', 'GCash', 'Wallet']].sum(axis=1))
+    return df
+
+def test_lttb():
+    print("🔍 Testing LTTB...")
+    y = np.zeros(1000)
+    y[417], y[733] = 50.0, -20.0
+    kept = lttb(np.arange(1000), y, 100)
+    assert len(kept) == 100 and kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    # Spikes are what the triangles keep
+    assert 417 in kept and 733 in kept
+    assert list(lttb(np.arange(10), np.arange(10), 100)) == list(range(10))
+    print("✅ Endpoints and extremes kept")
+
+def test_reduced_line():
+    print("🔍 Testing reduced line charts...")
+    df = daily_balances()
+    fig = reduced_line(df, 'day', ['net_worth', 'BDO'], 'Account Balance Over Time', budget=500)
+    assert [trace.name for trace in fig.data] == ['net_worth', 'BDO']
+    # Balances this small stay exact to the cent in float32
+    assert all(len(trace.y) == 500 and trace.y.dtype == np.float32 for trace in fig.data)
+    assert fig.data[0].type == 'scatter'
+    # The kept points are points of the series, in order
+    kept = df.set_index('day').loc[list(fig.data[0].x), 'net_worth']
+    assert kept.index.is_monotonic_increasing and np.array_equal(kept.to_numpy(), fig.data[0].y)
+
+    # Larger ones would be rounded to the peso or worse, so they stay float64
+    rich = df.assign(net_worth=df['net_worth'] + 250_000_000.37)
+    fig = reduced_line(rich, 'day', ['net_worth', 'BDO'], 'Account Balance Over Time', budget=500)
+    assert [trace.y.dtype for trace in fig.data] == [np.float64, np.float32]
+    kept = rich.set_index('day').loc[list(fig.data[0].x), 'net_worth']
+    assert np.array_equal(kept.to_numpy(), fig.data[0].y)
+
+    threshold = chart_reduction.WEBGL_THRESHOLD
+    try:
+        chart_reduction.WEBGL_THRESHOLD = 900
+        fig = reduced_line(df, 'day', ['net_worth', 'BDO'], 'Account Balance Over Time', budget=500)
+    finally:
+        chart_reduction.WEBGL_THRESHOLD = threshold
+    assert fig.data[0].type == 'scattergl'
+
+    # Short series and labels that aren't dates are drawn as they are
+    months = pd.DataFrame({'month': ['01 2024', '02 2024', '03 2024'], 'expenses': [10.0, 20.0, 15.0]})
+    fig = reduced_line(months, 'month', ['expenses'], 'Monthly Expenses', legend=False)
+    assert list(fig.data[0].x) == list(months['month']) and not fig.data[0].showlegend
+    print("✅ Charts reduced to the point budget")
+
+if __name__ == "__main__":
+    test_lttb()
+    test_reduced_line()
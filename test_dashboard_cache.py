@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the Streamlit caches behind the dashboard
+"""
+
+import os
+import sys
+import tempfile
+import pandas as pd
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from analytics import BUCKETS, split_snapshot
+from dashboard_cache import frame, figure, FIGURES
+from data_version import bump_data_version
+from query_filters import QueryFilters
+from query_stats import query_stats
+
+ROWS = pd.DataFrame({
+    'month': ['2024-01', '2024-01', '2024-02', '2024-02'],
+    'type': ['Expense', 'Income', 'Expense', 'Income'],
+    'account': ['GCash', 'BDO', 'Wallet', 'BDO'],
+    'category': ['Food & Dining', 'Salary', 'Transportation', 'Salary'],
+    'amount': [-150.25, 1000.50, -300.50, 50000.00],
+})
+
+reads = []
+
+def dashboard_snapshot(view, filters):
+    reads.append((view, filters))
+    return split_snapshot(ROWS.rename(columns={'month': BUCKETS[view]}), BUCKETS[view])
+
+def test_frames_follow_data_version():
+    print("🔍 Testing cached frames...")
+    reads.clear()
+    filters = QueryFilters(accounts=('BDO', 'GCash'))
+    first = frame(dashboard_snapshot, 'monthly', filters)
+    assert frame(dashboard_snapshot, 'monthly', filters)['expenses'].equals(first['expenses'])
+    assert len(reads) == 1
+    frame(dashboard_snapshot, 'monthly', QueryFilters())
+    assert len(reads) == 2
+    bump_data_version()
+    frame(dashboard_snapshot, 'monthly', filters)
+    assert len(reads) == 3
+    print("✅ Read once per view, filters and data version")
+
+def test_figures():
+    print("🔍 Testing cached figures...")
+    reads.clear()
+    filters = QueryFilters()
+    for panel in FIGURES:
+        fig = figure(dashboard_snapshot, panel, 'weekly', filters, ['net_worth'])
+        assert fig.data, panel
+    assert len(reads) == 1
+    # Only the balance chart depends on the selected accounts
+    builds = []
+    build_expenses = FIGURES['expenses']
+    FIGURES['expenses'] = lambda *args: builds.append(args) or build_expenses(*args)
+    try:
+        figure(dashboard_snapshot, 'expenses', 'weekly', filters, ['BDO'])
+    finally:
+        FIGURES['expenses'] = build_expenses
+    assert builds == []
+    balances = figure(dashboard_snapshot, 'balances', 'weekly', filters, ['net_worth', 'BDO'])
+    assert [trace.name for trace in balances.data] == ['net_worth', 'BDO']
+    print("✅ Figures built once per panel")
+
+def flaky_snapshot(view, filters):
+    reads.append((view, filters))
+    if len(reads) == 1:
+        # What the read_queries functions do when the database is unreachable
+        query_stats.record('monthly_snapshot', wall_ms=1.0, db_ms=None, rows=0, bytes=None, cache='error')
+        return split_snapshot(ROWS.iloc[:0].rename(columns={'month': BUCKETS[view]}), BUCKETS[view])
+    return split_snapshot(ROWS.rename(columns={'month': BUCKETS[view]}), BUCKETS[view])
+
+def test_failed_reads_are_not_cached():
+    print("🔍 Testing failed reads...")
+    reads.clear()
+    filters = QueryFilters()
+    assert frame(flaky_snapshot, 'monthly', filters)['expenses'].empty
+    # The next rerun reads again instead of keeping the outage
+    assert not frame(flaky_snapshot, 'monthly', filters)['expenses'].empty
+    frame(flaky_snapshot, 'monthly', filters)
+    assert len(reads) == 2
+
+    reads.clear()
+    fig = figure(flaky_snapshot, 'expenses', 'daily', filters)
+    assert len(fig.data[0].x) == 0
+    assert len(figure(flaky_snapshot, 'expenses', 'daily', filters).data[0].x) > 0
+    print("✅ Failed reads are retried")
+
+if __name__ == "__main__":
+    test_frames_follow_data_version()
+    test_figures()
+    test_failed_reads_are_not_cached()
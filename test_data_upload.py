@@ -47,6 +47,7 @@ def test_data_upload():
         # Test the transform and load functions
         sys.path.append('scripts')
         from database_mysql import extract, transform, load
+        from compact import storage_frame
         
         print("🔍 Testing data upload process...")
         
@@ -64,7 +65,7 @@ def test_data_upload():
         
         # Test manual insert to transactions table
         with engine.connect() as conn:
-            for _, row in transformed_df.iterrows():
+            for _, row in storage_frame(transformed_df).iterrows():
                 conn.execute(text("""
                     INSERT IGNORE INTO transactions (type, date, item, amount, currency, category, account, status)
                     VALUES (:type, :date, :item, :amount, :currency, :category, :account, :status)
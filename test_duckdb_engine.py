@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the optional DuckDB query engine
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+import duckdb_engine
+from duckdb_engine import available, duckdb_sql, run_query, parquet_source, csv_source, duckdb_query
+from snapshot import _snapshot_chunk, _aggregate
+from query_filters import QueryFilters
+
+EXPORT = """Type,Date,Name,Amount,Currency,Category,Account,Status
+Income,2023-12-31,Bonus,1000.50,PHP,Salary,BDO,Reconciled
+Expense,2024-01-15,Coffee,-150.25,PHP,Food & Dining,GCash,Reconciled
+Expense,2024-01-15,Coffee,-150.25,PHP,Food & Dining,GCash,Reconciled
+Expense,2024-02-03,Taxi,-300.50,PHP,Transportation,Wallet,Reconciled
+Expense,2024-02-04,Lunch,-99.00,PHP,Food & Dining,Wallet,Pending
+Income,2024-02-29,Salary,50000.00,PHP,Salary,BDO,Reconciled
+"""
+
+def test_parameter_style():
+    sql = duckdb_sql('monthly_snapshot')
+    assert '$start_date' in sql and 'LIST_CONTAINS($accounts, account)' in sql
+    assert ':' not in sql.replace("'%Y-%m'", '')
+
+def test_csv_and_parquet_sources():
+    print("🔍 Testing DuckDB over CSV and Parquet...")
+    if not available():
+        print("⚠️  duckdb not installed, skipping")
+        return
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'export.csv')
+    with open(csv_path, 'w') as f:
+        f.write(EXPORT)
+
+    params = QueryFilters(start_date=date(2024, 1, 1), types=('Expense',)).params()
+    rows = run_query(csv_source(csv_path), 'monthly_snapshot', params).sort_values('month', ignore_index=True)
+    # The pending lunch is not a reconciled transaction
+    assert rows[['month', 'account', 'amount']].values.tolist() == [['2024-01', 'GCash', -300.5], ['2024-02', 'Wallet', -300.5]]
+
+    # Parquet answers match the pandas snapshot reader's MySQL semantics
+    cleaned = run_query(csv_source(csv_path), 'daily_snapshot', QueryFilters().params())
+    cleaned = cleaned.rename(columns={'day': 'date'}).assign(item='', date=lambda df: df['date'].astype('datetime64[ns]'))
+    snapshot_dir = os.path.join(directory, 'snapshot')
+    _snapshot_chunk(cleaned).to_parquet(snapshot_dir, partition_cols=['year'], index=False)
+    for name in ['monthly_account_amounts', 'weekly_account_amounts', 'filter_options']:
+        expected = _aggregate(snapshot_dir, name, {}, 'mysql')
+        actual = run_query(parquet_source(snapshot_dir), name)
+        key = list(expected.columns[:2])
+        expected = expected.sort_values(key, ignore_index=True).astype(str)
+        actual = actual.sort_values(key, ignore_index=True)[list(expected.columns)].astype(str)
+        assert expected.equals(actual), (name, expected, actual)
+    print("✅ DuckDB answers match")
+
+def test_duckdb_query_falls_back():
+    print("🔍 Testing DuckDB fallback...")
+    uri = 'mysql+pymysql://root:@localhost:3306/personal_finance_dashboard'
+    enabled = duckdb_engine.DUCKDB_ENABLED
+    try:
+        duckdb_engine.DUCKDB_ENABLED = False
+        assert duckdb_query(uri, 'monthly_snapshot', QueryFilters().params()) is None
+        duckdb_engine.DUCKDB_ENABLED = True
+        # No snapshot, a query without a DuckDB version, a dialect it doesn't follow
+        assert duckdb_query(uri, 'monthly_snapshot', QueryFilters().params()) is None
+        assert duckdb_query(uri, 'raw_transactions') is None
+        assert duckdb_query('sqlite:///finance.db', 'monthly_snapshot', QueryFilters().params()) is None
+    finally:
+        duckdb_engine.DUCKDB_ENABLED = enabled
+    print("✅ Falls back to the database")
+
+if __name__ == "__main__":
+    test_parameter_style()
+    test_csv_and_parquet_sources()
+    test_duckdb_query_falls_back()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test the background upload jobs
+"""
+
+import os
+import sys
+import tempfile
+import time
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from etl_jobs import submit_upload, job_status, ACTIVE_STATES
+from database_sqlite import stream_load, load_files
+from data_version import get_data_version
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_transactions.csv')
+URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'finance.db')}"
+BAD_EXPORT = b"Type,Date\nExpense,2024-01-15\n"
+
+def wait(job_id, timeout=60):
+    deadline = time.time() + timeout
+    while job_status(job_id)['state'] in ACTIVE_STATES:
+        assert time.time() < deadline, f"job {job_id} still running"
+        time.sleep(0.05)
+    return job_status(job_id)
+
+def test_single_file_job():
+    print("🔍 Testing a single-file upload job...")
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+    version = get_data_version()
+    job_id = submit_upload([('sample.csv', data)], stream_load, load_files, URI)
+    status = wait(job_id)
+    assert status['state'] == 'done' and status['error'] is None, status
+    assert status['parsed'] == status['loaded'] > 0 and status['fraction'] == 1.0
+    # The load bumped the data version the dashboards key their caches on
+    assert status['data_version'] == get_data_version() > version
+    print(f"✅ {status['loaded']} rows loaded in the background")
+
+def test_multi_file_job_reports():
+    print("🔍 Testing a multi-file upload job...")
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+    status = wait(submit_upload([('sample.csv', data), ('bad.csv', BAD_EXPORT)], stream_load, load_files, URI))
+    # Only the rows this upload loaded, the first file's reconciled transactions
+    assert status['state'] == 'done' and 0 < status['loaded'] <= status['validated']
+    assert status['loaded'] == load_files([('sample.csv', data)], URI)[1]
+    assert [report['error'] is None for report in status['reports']] == [True, False]
+
+    status = wait(submit_upload([('bad.csv', BAD_EXPORT), ('worse.csv', BAD_EXPORT)], stream_load, load_files, URI))
+    assert status['state'] == 'failed' and status['error'] == "No file passed validation"
+    assert len(status['reports']) == 2
+    print("✅ Skipped files reported, nothing to load is a failure")
+
+def test_unknown_job():
+    assert job_status('0' * 32) is None
+    assert job_status('../data_version') is None
+
+if __name__ == "__main__":
+    test_single_file_job()
+    test_multi_file_job_reports()
+    test_unknown_job()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test fingerprint-based incremental imports
+"""
+
+import io
+import os
+import sys
+import pandas as pd
+from sqlalchemy import create_engine, text
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from fingerprint import fingerprints, fingerprint_chunks, import_new_rows, backfill_fingerprints
+from pipeline import extract_chunks
+
+EXPORT = """Type,Date,Name,Amount,Currency,Category,Account,Status
+Expense,2024-01-15,Coffee,-150.00,PHP,Food & Dining,GCash,Reconciled
+Expense,2024-01-15,Coffee,-150.00,PHP,Food & Dining,GCash,Reconciled
+Income,2024-01-16,Monthly Salary,50000.00,PHP,Salary,BDO,Reconciled
+Expense,2024-01-17,Taxi,-300.00,PHP,Transportation,Wallet,Pending
+"""
+
+NEXT_WEEK = """Expense,2024-01-22,Coffee,-150.00,PHP,Food & Dining,GCash,Reconciled
+"""
+
+RAW_DDL = """
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY, Type TEXT, Date TEXT, Name TEXT, Amount REAL, Currency TEXT,
+        Category TEXT, Account TEXT, Status TEXT, batch_id TEXT, fingerprint TEXT UNIQUE
+    )
+"""
+
+def export(text_):
+    return pd.read_csv(io.StringIO(text_))
+
+def test_fingerprints():
+    print("🔑 Testing row fingerprints...")
+    df = export(EXPORT)
+    keys = fingerprints(df)
+    # Identical rows are told apart by their occurrence, and the hash is stable
+    assert keys.is_unique
+    assert list(keys) == list(fingerprints(df))
+    # Formatting and status don't change a transaction's fingerprint
+    reformatted = df.assign(Date=['01/15/2024'] * 2 + ['01/16/2024', '01/17/2024'],
+                            Name=' ' + df['Name'], Status='Reconciled')
+    assert list(fingerprints(reformatted)) == list(keys)
+
+    # Occurrences are counted across chunks of the same file
+    chunks = fingerprint_chunks(extract_chunks(io.StringIO(EXPORT), chunksize=1))
+    assert list(pd.concat(chunks)['fingerprint']) == list(keys)
+    print("✅ Fingerprints are stable and unique")
+
+def test_import_new_rows():
+    print("📥 Testing incremental import...")
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text(RAW_DDL.format(table='raw_transactions')))
+
+    first = export(EXPORT)
+    with engine.begin() as conn:
+        assert import_new_rows(first.assign(batch_id='a', fingerprint=fingerprints(first)),
+                               'raw_transactions', conn, RAW_DDL) == (4, 0)
+
+    # The next full export has one new row and the taxi is now reconciled
+    second = export(EXPORT.replace('Pending', 'Reconciled') + NEXT_WEEK)
+    with engine.begin() as conn:
+        assert import_new_rows(second.assign(batch_id='b', fingerprint=fingerprints(second)),
+                               'raw_transactions', conn, RAW_DDL) == (1, 1)
+        raw = pd.read_sql('SELECT * FROM raw_transactions ORDER BY id', conn)
+    assert len(raw) == 5
+    assert list(raw['batch_id']) == ['a', 'a', 'a', 'b', 'b']
+    assert (raw['Status'] == 'Reconciled').all()
+    print("✅ Only new and changed rows written")
+
+def test_backfill_fingerprints():
+    print("🔧 Testing fingerprint backfill...")
+    engine = create_engine('sqlite://')
+    df = export(EXPORT)
+    with engine.begin() as conn:
+        conn.execute(text(RAW_DDL.format(table='raw_transactions')))
+        df.to_sql('raw_transactions', conn, if_exists='append', index=False)
+        assert backfill_fingerprints(conn) == 4
+        assert backfill_fingerprints(conn) == 0
+        stored = pd.read_sql('SELECT fingerprint FROM raw_transactions ORDER BY id', conn)
+    assert list(stored['fingerprint']) == list(fingerprints(df))
+    print("✅ Existing rows fingerprinted like a fresh export")
+
+def test_backfill_transaction_fingerprints():
+    print("🔧 Testing fingerprint backfill of processed transactions...")
+    engine = create_engine('sqlite://')
+    df = export(EXPORT)
+    reconciled = df[df['Status'] == 'Reconciled']
+    # A transactions table from before fingerprints, with the lowercase columns
+    legacy = reconciled.rename(columns={'Type': 'type', 'Date': 'date', 'Name': 'item', 'Amount': 'amount',
+                                        'Currency': 'currency', 'Category': 'category', 'Account': 'account',
+                                        'Status': 'status'})
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT, date DATE, item TEXT, amount REAL,
+                currency TEXT, category TEXT, account TEXT, status TEXT, fingerprint TEXT)
+        """))
+        legacy.to_sql('transactions', conn, if_exists='append', index=False)
+        assert backfill_fingerprints(conn, 'transactions') == len(reconciled)
+        stored = pd.read_sql('SELECT fingerprint FROM transactions ORDER BY id', conn)
+    # The same fingerprints the export's rows get, so a re-upload skips them
+    assert list(stored['fingerprint']) == list(fingerprints(df)[reconciled.index])
+    print("✅ Processed rows fingerprinted like their raw rows")
+
+if __name__ == "__main__":
+    test_fingerprints()
+    test_import_new_rows()
+    test_backfill_fingerprints()
+    test_backfill_transaction_fingerprints()
+    print("🎉 Fingerprint tests passed!")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Test the MySQL backend against a scratch database on a live server.
+Set MYSQL_USER/MYSQL_PASSWORD/MYSQL_HOST/MYSQL_PORT as for the app; the tests
+use MYSQL_TEST_DATABASE (personal_finance_dashboard_test by default) and skip
+when no server is reachable.
+"""
+
+import io
+import os
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+from sqlalchemy import text
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+os.environ.setdefault('FINANCE_SNAPSHOT_DIR', tempfile.mkdtemp())
+os.environ['MYSQL_DATABASE'] = os.getenv('MYSQL_TEST_DATABASE', 'personal_finance_dashboard_test')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from engine_registry import connect
+import data_upload_manager
+import pipeline
+from data_upload_manager import DataUploadManager, clean_export
+from database_mysql import get_mysql_connection, stream_load, load_files
+from schema_mysql import TABLE_DDL
+from backup_restore_manager import BackupRestoreManager
+from read_queries_mysql import dashboard_snapshot
+from rollups import check_rollups
+from data_version import get_data_version
+from bulk_load import write_frame
+from transaction_browser import fetch_page, explain_page, SORTS
+
+NEXT_WEEK = b"""Type,Date,Name,Amount,Currency,Category,Account,Status
+Expense,2024-02-22,Coffee,-150.00,PHP,Food & Dining,GCash,Reconciled
+"""
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_transactions.csv')
+
+def scratch_database():
+    """Empty scratch database with the app's tables, or None when MySQL isn't reachable"""
+    uri = get_mysql_connection()
+    try:
+        with connect(uri.rsplit('/', 1)[0]) as connection:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {os.environ['MYSQL_DATABASE']}"))
+            connection.execute(text(f"CREATE DATABASE {os.environ['MYSQL_DATABASE']}"))
+    except Exception as e:
+        print(f"⚠️  MySQL not reachable, skipping: {e}")
+        return None
+    with connect(uri) as connection:
+        for table, ddl in TABLE_DDL.items():
+            connection.execute(text(ddl.format(table=table)))
+    return uri
+
+def read_table(uri, table):
+    with connect(uri) as connection:
+        return pd.read_sql(text(f"SELECT * FROM {table} ORDER BY id"), connection)
+
+def test_data_backup_round_trip():
+    print("🔍 Testing data backup and restore...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    stream_load(SAMPLE, uri)
+    before = read_table(uri, 'transactions')
+
+    manager = BackupRestoreManager(backup_dir=tempfile.mkdtemp())
+    backup_file = manager.create_data_backup()
+    assert backup_file
+    with mock.patch('builtins.input', return_value='yes'):
+        # The generated week_start/month_start columns are computed again, not inserted
+        assert manager.restore_data_backup(backup_file)
+
+    after = read_table(uri, 'transactions')
+    columns = ['id', 'type', 'date', 'item', 'amount', 'account', 'fingerprint', 'week_start', 'month_start']
+    pd.testing.assert_frame_equal(after[columns], before[columns])
+    print(f"✅ {len(after)} transactions restored with their bucket columns")
+
+def test_restore_refreshes_dashboard():
+    print("🔍 Testing the dashboard after a restore...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    stream_load(SAMPLE, uri)
+    expected = dashboard_snapshot('monthly')['balances']
+    manager = BackupRestoreManager(backup_dir=tempfile.mkdtemp())
+    backup_file = manager.create_data_backup()
+
+    # Replace the data with the first rows of the export
+    with connect(uri) as connection:
+        connection.execute(text("DROP TABLE transactions, raw_transactions"))
+    with open(SAMPLE, 'rb') as f:
+        head = b''.join(f.readlines()[:5])
+    stream_load(io.BytesIO(head), uri)
+    assert not dashboard_snapshot('monthly')['balances'].equals(expected)
+
+    with mock.patch('builtins.input', return_value='yes'):
+        assert manager.restore_data_backup(backup_file)
+    # The rollups, snapshot and cached results all follow the restored rows
+    assert not any(check_rollups(uri).values())
+    pd.testing.assert_frame_equal(dashboard_snapshot('monthly')['balances'], expected)
+    print("✅ Dashboard shows the restored data")
+
+def test_append_batch_with_rollup_delta():
+    print("🔍 Testing batch appends and rollup deltas...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    stream_load(SAMPLE, uri)
+    manager = DataUploadManager()
+    assert manager.connect_to_database()
+    count = len(read_table(uri, 'transactions'))
+
+    # A failing rollup upsert rolls the batch insert back with it
+    new_rows = clean_export(pd.read_csv(io.BytesIO(NEXT_WEEK)))
+    with mock.patch.object(data_upload_manager, 'apply_rollup_delta', side_effect=RuntimeError("upsert failed")):
+        assert manager.upload_to_database(new_rows, 'raw_transactions', 'append')
+    assert len(read_table(uri, 'transactions')) == count
+    assert not any(check_rollups(uri).values())
+
+    batch_id = read_table(uri, 'raw_transactions')['batch_id'].iloc[-1]
+    assert manager.append_batch(batch_id) == 1
+    assert manager.append_batch(batch_id) == 0
+    assert len(read_table(uri, 'transactions')) == count + 1
+    assert not any(check_rollups(uri).values())
+    print("✅ Batch and rollup delta commit together")
+
+def test_keyset_pages_use_range_scans():
+    print("🔍 Testing keyset page plans on MySQL...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    rows = 5000
+    export = pd.DataFrame({
+        'Type': 'Expense', 'Date': pd.date_range('2015-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'),
+        'Name': [f"Item {i}" for i in range(rows)], 'Amount': [-(i % 700) - 1.0 for i in range(rows)],
+        'Currency': 'PHP', 'Category': 'Food & Dining', 'Account': 'GCash', 'Status': 'Reconciled',
+    })
+    stream_load(io.BytesIO(export.to_csv(index=False).encode('utf-8')), uri)
+    with connect(uri) as connection:
+        connection.execute(text("ANALYZE TABLE transactions"))
+    for sort, (column, descending) in SORTS.items():
+        after = fetch_page(uri, sort=sort, page_size=50)[1]
+        plan = explain_page(uri, sort=sort, after=after, page_size=50).iloc[0]
+        # idx_date or the idx_date_cover index that starts with date
+        assert plan['type'] == 'range' and plan['key'].startswith(f"idx_{column}"), (sort, plan.to_dict())
+    print("✅ Later pages are index range scans")
+
+def test_load_files_swaps_both_tables():
+    print("🔍 Testing staged loads of both tables...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+    with connect(uri) as connection:
+        # A fresh database: the first load swaps both tables in
+        connection.execute(text("DROP TABLE transactions, raw_transactions"))
+    reports, rows = load_files([('sample.csv', data)], uri)
+    raw = read_table(uri, 'raw_transactions')
+    assert rows == len(read_table(uri, 'transactions')) > 0
+    # The same export again inserts nothing and says so
+    assert load_files([('sample.csv', data)], uri)[1] == 0
+    pd.testing.assert_frame_equal(read_table(uri, 'raw_transactions'), raw)
+
+    # A load that fails writing the transactions leaves both live tables alone
+    write_frame = pipeline.write_frame
+    def failing_write(df, table, *args, **kwargs):
+        if table.startswith('transactions'):
+            raise RuntimeError("write failed")
+        return write_frame(df, table, *args, **kwargs)
+    with mock.patch.object(pipeline, 'write_frame', side_effect=failing_write):
+        try:
+            load_files([('next.csv', NEXT_WEEK)], uri)
+            assert False, "load_files should have failed"
+        except RuntimeError:
+            pass
+    pd.testing.assert_frame_equal(read_table(uri, 'raw_transactions'), raw)
+
+    # The swapped-in tables have init_database.sql's indexes and foreign keys
+    with connect(uri) as connection:
+        indexes = connection.execute(text(
+            "SELECT DISTINCT table_name, index_name FROM information_schema.statistics"
+            " WHERE table_schema = DATABASE()")).fetchall()
+        references = connection.execute(text(
+            "SELECT column_name, referenced_table_name FROM information_schema.key_column_usage"
+            " WHERE table_schema = DATABASE() AND table_name = 'transactions'"
+            " AND referenced_table_name IS NOT NULL")).fetchall()
+        categories = set(connection.execute(text("SELECT name FROM categories")).scalars())
+    assert {(table.lower(), 'idx_status') for table in ('raw_transactions', 'transactions')} <= \
+        {(table.lower(), index) for table, index in indexes}
+    assert {(column.lower(), table.lower()) for column, table in references} == \
+        {('category', 'categories'), ('account', 'accounts')}
+    # Categories and accounts new to the database were added for the foreign keys
+    assert set(read_table(uri, 'transactions')['category']) <= categories
+    print("✅ Both tables swapped in together with their indexes and foreign keys")
+
+def test_reupload_inserts_only_new_rows():
+    print("🔍 Testing re-uploads of a full-history export...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+    stats = stream_load(io.BytesIO(data), uri)
+    before = read_table(uri, 'transactions')
+    assert stats['new_rows'] == len(before)
+
+    # The same export again writes nothing
+    assert stream_load(io.BytesIO(data), uri)['new_rows'] == 0
+    pd.testing.assert_frame_equal(read_table(uri, 'transactions'), before)
+
+    # The export a week later only adds that week, with its rollup delta
+    version = get_data_version()
+    later = data + NEXT_WEEK.split(b"\n", 1)[1]
+    assert stream_load(io.BytesIO(later), uri)['new_rows'] == 1
+    after = read_table(uri, 'transactions')
+    pd.testing.assert_frame_equal(after.iloc[:len(before)][['id', 'fingerprint']], before[['id', 'fingerprint']])
+    assert len(after) == len(before) + 1 and after['item'].iloc[-1] == 'Coffee'
+    assert not any(check_rollups(uri).values())
+    assert get_data_version() > version
+    with connect(uri) as connection:
+        staging = connection.execute(text("SHOW TABLES LIKE '%\\_staging'")).fetchall()
+    assert not staging
+    print("✅ Only the new week was written")
+
+def test_load_data_round_trip():
+    print("🔍 Testing LOAD DATA LOCAL INFILE...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    from test_bulk_load import TRICKY
+    with connect(uri) as connection:
+        connection.execute(text("CREATE TABLE items (item TEXT, amount DOUBLE, date DATE)"))
+        write_frame(TRICKY, 'items', connection)
+        stored = pd.read_sql(text("SELECT * FROM items"), connection)
+        connection.commit()
+    assert stored['item'].tolist() == [None if pd.isna(item) else item for item in TRICKY['item']]
+    assert stored['amount'].isna().tolist() == TRICKY['amount'].isna().tolist()
+    assert stored['date'].isna().tolist() == TRICKY['date'].isna().tolist()
+    print("✅ Tabs, newlines, backslashes, quotes and NULLs loaded as they were")
+
+def test_legacy_tables_are_not_duplicated():
+    print("🔍 Testing uploads into tables from before fingerprints...")
+    uri = scratch_database()
+    if uri is None:
+        return
+    stream_load(SAMPLE, uri)
+    before = read_table(uri, 'transactions')
+
+    def make_legacy():
+        with connect(uri) as connection:
+            for table in ('raw_transactions', 'transactions'):
+                connection.execute(text(f"ALTER TABLE {table} DROP INDEX idx_fingerprint, DROP COLUMN fingerprint"))
+
+    # The upload manager's migration fingerprints the existing processed rows
+    make_legacy()
+    manager = DataUploadManager()
+    assert manager.connect_to_database()
+    manager.ensure_batch_columns()
+    migrated = read_table(uri, 'transactions')
+    assert migrated['fingerprint'].notna().all()
+    assert migrated['fingerprint'].tolist() == before['fingerprint'].tolist()
+    assert stream_load(SAMPLE, uri)['new_rows'] == 0
+    assert len(read_table(uri, 'transactions')) == len(before)
+    assert not any(check_rollups(uri).values())
+
+    # Rows still without fingerprints make the upload replace the tables
+    with connect(uri) as connection:
+        connection.execute(text("UPDATE transactions SET fingerprint = NULL"))
+        connection.commit()
+    stream_load(SAMPLE, uri)
+    after = read_table(uri, 'transactions')
+    assert len(after) == len(before) and after['fingerprint'].notna().all()
+    assert not any(check_rollups(uri).values())
+    print("✅ Existing history kept once, not duplicated")
+
+if __name__ == "__main__":
+    test_data_backup_round_trip()
+    test_restore_refreshes_dashboard()
+    test_append_batch_with_rollup_delta()
+    test_keyset_pages_use_range_scans()
+    test_load_files_swaps_both_tables()
+    test_reupload_inserts_only_new_rows()
+    test_load_data_round_trip()
+    test_legacy_tables_are_not_duplicated()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the chunked extract -> transform -> load pipeline
+"""
+
+import io
+import os
+import sys
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from pipeline import extract_chunks, transform_chunks, load_chunks
+from database import transform
+from staging import staged_load
+
+EXPORT = """Type,Date,Name,Amount,Currency,Category,Account,Status,Notes
+Expense,2024-01-15,Grocery Store,-2500.00,PHP,Food & Dining,Wallet,Reconciled,weekly run
+Income,2024-01-16,Monthly Salary,50000.00,PHP,Salary,BDO,Reconciled,
+Expense,2024-01-17,Coffee,-150.00,PHP,Food & Dining,GCash,Pending,
+Expense,2024-01-18,Taxi,-300.00,PHP,Transportation,Wallet,Reconciled,
+Transfer,2024-01-19,Load GCash,1000.00,PHP,Transfer,GCash,Reconciled,
+"""
+
+def test_extract_chunks():
+    print("📦 Testing chunked extract...")
+    chunks = list(extract_chunks(io.StringIO(EXPORT), chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    # Unused export columns are never parsed
+    assert 'Notes' not in chunks[0].columns
+    assert chunks[0]['Amount'].dtype == 'float64'
+    print("✅ Export read in bounded chunks")
+
+def test_load_chunks():
+    print("🚚 Testing chunked load...")
+    engine = create_engine('sqlite://')
+    reports = []
+    pairs = transform_chunks(extract_chunks(io.StringIO(EXPORT), chunksize=2), transform)
+    with engine.begin() as conn:
+        stats = load_chunks(pairs, conn, 'raw_transactions', 'transactions', progress=reports.append)
+    assert stats == {'chunks': 3, 'raw_rows': 5, 'rows': 4}
+    assert [report['rows'] for report in reports] == [2, 3, 4]
+
+    with engine.connect() as conn:
+        raw = pd.read_sql('SELECT * FROM raw_transactions', conn)
+        transactions = pd.read_sql('SELECT * FROM transactions', conn)
+    assert len(raw) == 5
+    assert list(transactions['item']) == ['Grocery Store', 'Monthly Salary', 'Taxi', 'Load GCash']
+    print("✅ Chunks transformed and loaded")
+
+def test_staged_load():
+    print("🔁 Testing staging table swap...")
+    engine = create_engine('sqlite://')
+    ddl = "CREATE TABLE {table} (id INTEGER PRIMARY KEY, item TEXT NOT NULL, amount REAL)"
+    with engine.begin() as conn:
+        conn.execute(text(ddl.format(table='transactions')))
+        conn.execute(text("INSERT INTO transactions (item, amount) VALUES ('old', 1)"))
+
+    df = pd.DataFrame({'item': ['Taxi', 'Coffee'], 'amount': [-300.0, -150.0], 'note': ['x', 'y']})
+    with engine.begin() as conn:
+        # The staging table is built from the DDL, so columns outside it are skipped
+        rows = staged_load(df, 'transactions', conn, ddl)
+    assert rows == 2
+
+    with engine.connect() as conn:
+        loaded = pd.read_sql('SELECT * FROM transactions', conn)
+        tables = inspect(conn).get_table_names()
+        columns = inspect(conn).get_columns('transactions')
+    assert list(loaded.columns) == ['id', 'item', 'amount']
+    assert list(loaded['item']) == ['Taxi', 'Coffee']
+    assert tables == ['transactions']
+    assert not columns[1]['nullable']
+    print("✅ Staging table swapped in")
+
+if __name__ == "__main__":
+    test_extract_chunks()
+    test_load_chunks()
+    test_staged_load()
+    print("🎉 Pipeline tests passed!")
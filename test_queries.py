@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.append('scripts')
 
-from read_queries_mysql import query
+from read_queries_mysql import query, amount_over_time
 
 def test_queries():
     try:
@@ -21,8 +21,8 @@ def test_queries():
             print(f"📋 Columns: {list(df.columns)}")
         
         # Test monthly_amount_over_time query
-        print("\n📈 Testing monthly_amount_over_time query...")
-        df = query('monthly_amount_over_time')
+        print("\n📈 Testing monthly amount over time...")
+        df = amount_over_time('monthly')
         print(f"✅ Monthly query successful! Rows: {len(df)}")
         
         # Test expenses_per_category query
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the named query registry
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from query_registry import QueryRegistry, get_registry
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
+
+def test_query_files():
+    print("🔍 Testing query files...")
+    for file_name in ['queries.sql', 'queries_mysql.sql']:
+        registry = get_registry(os.path.join(SCRIPTS_DIR, file_name))
+        names = registry.names()
+        print(f"✅ {file_name}: {len(names)} queries")
+        assert 'transactions' in names
+        assert 'payment_methods' in names
+        assert registry.get('payment_methods').columns == ['account', 'amount']
+        assert registry.sql('transactions').startswith('SELECT')
+        registry.require(['transactions', 'payment_methods'])
+
+def test_reload_on_change():
+    print("🔄 Testing registry reload...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'queries.sql')
+        with open(path, 'w') as f:
+            f.write("--@name: one\n--@columns: a\nSELECT 1 AS a WHERE 1 = :flag;\n")
+        registry = QueryRegistry(path)
+        assert registry.names() == ['one']
+        assert registry.get('one').params == ['flag']
+
+        with open(path, 'w') as f:
+            f.write("--@name: one\nSELECT 1;\n\n--@name: two\nSELECT 2;\n")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        assert registry.names() == ['one', 'two']
+
+        try:
+            registry.get('three')
+            assert False, "missing query should raise"
+        except ValueError:
+            print("✅ Missing query raises ValueError")
+
+if __name__ == "__main__":
+    test_query_files()
+    test_reload_on_change()
+    print("🎉 Query registry tests passed!")
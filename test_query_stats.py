@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the query timing statistics
+"""
+
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from query_stats import QueryStats
+
+def test_run_records():
+    print("⏱️ Testing per-run records...")
+    stats = QueryStats(max_records=3)
+    first = stats.start_run()
+    stats.record('transactions', wall_ms=5.0, cache='miss')
+    second = stats.start_run()
+    stats.record('transactions', wall_ms=1.0, cache='hit')
+    with stats.timer('chart'):
+        pass
+    assert [r['name'] for r in stats.records(second)] == ['transactions', 'chart']
+    assert stats.records(second)[1]['kind'] == 'render'
+
+    # The window only keeps the newest max_records
+    stats.record('filter_options', wall_ms=2.0, cache='miss')
+    assert stats.records(first) == []
+    print("✅ Records tagged by run and bounded")
+
+def test_runs_are_per_thread():
+    stats = QueryStats()
+    stats.start_run()
+    thread = threading.Thread(target=lambda: stats.record('other', wall_ms=1.0))
+    thread.start()
+    thread.join()
+    assert stats.records()[0]['run_id'] is None
+
+def test_slowest():
+    print("🐢 Testing slowest query summary...")
+    stats = QueryStats()
+    stats.record('daily_snapshot', wall_ms=40.0, cache='miss')
+    stats.record('daily_snapshot', wall_ms=2.0, cache='hit')
+    stats.record('filter_options', wall_ms=10.0, cache='miss')
+    stats.record('chart', kind='render', wall_ms=100.0)
+    slowest = stats.slowest()
+    assert [s['name'] for s in slowest] == ['daily_snapshot', 'filter_options']
+    assert slowest[0]['calls'] == 2 and slowest[0]['cache_hits'] == 1
+    assert slowest[0]['avg_ms'] == 21.0 and slowest[0]['max_ms'] == 40.0
+    print("✅ Slowest queries summarised")
+
+if __name__ == "__main__":
+    test_run_records()
+    test_runs_are_per_thread()
+    test_slowest()
+    print("🎉 Query stats tests passed!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test the query result cache and data version counter
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+import pytest
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from result_cache import ResultCache, make_key
+import data_version
+from data_version import get_data_version, bump_data_version
+
+def test_lru_eviction():
+    print("🔍 Testing LRU eviction...")
+    cache = ResultCache(max_entries=2)
+    for name in ['a', 'b', 'c']:
+        cache.put(make_key('db', name, None, 0), pd.DataFrame({'x': [1, 2, 3]}))
+    assert cache.get(make_key('db', 'a', None, 0)) is None
+    assert cache.get(make_key('db', 'c', None, 0)) is not None
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['hits'] == 1 and stats['misses'] == 1
+    print(f"✅ Cache stats: {stats}")
+
+def test_memory_budget():
+    print("🔍 Testing memory budget...")
+    df = pd.DataFrame({'x': range(1000)})
+    nbytes = int(df.memory_usage(deep=True).sum())
+    cache = ResultCache(max_bytes=nbytes * 2)
+    for i in range(3):
+        cache.put(make_key('db', 'q', {'i': i}, 0), df)
+    assert cache.stats()['entries'] == 2
+    assert cache.total_bytes <= nbytes * 2
+    assert not cache.put(make_key('db', 'big', None, 0), pd.concat([df] * 3))
+    print("✅ Memory budget enforced")
+
+def test_data_version_changes_key(monkeypatch, tmp_path):
+    print("🔍 Testing data version bump...")
+    # Earlier test modules may have imported data_version already, so point
+    # the counter at tmp_path rather than the repo's .cache
+    monkeypatch.setattr(data_version, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(data_version, 'VERSION_FILE', str(tmp_path / 'data_version'))
+    monkeypatch.setattr(data_version, '_state', {'mtime': None, 'version': 0})
+    cache = ResultCache()
+    params = {'accounts': ['Wallet', 'BDO']}
+    cache.put(make_key('db', 'q', params, get_data_version()), pd.DataFrame({'x': [1]}))
+    assert cache.get(make_key('db', 'q', params, get_data_version())) is not None
+    version = bump_data_version()
+    assert get_data_version() == version
+    assert cache.get(make_key('db', 'q', params, get_data_version())) is None
+    assert version == 1 and (tmp_path / 'data_version').exists()
+    print(f"✅ Data version now {version}")
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_memory_budget()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_data_version_changes_key(monkeypatch, Path(tempfile.mkdtemp()))
+    print("🎉 Result cache tests passed!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the Parquet snapshot of the transactions table
+"""
+
+import os
+import sys
+import tempfile
+import pandas as pd
+from datetime import date
+from sqlalchemy import create_engine
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+os.environ.setdefault('FINANCE_SNAPSHOT_DIR', tempfile.mkdtemp())
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from snapshot import (snapshot_path, write_snapshot, update_snapshot, snapshot_version, fresh_snapshot, read_snapshot,
+                      snapshot_query, _aggregate)
+from data_version import get_data_version, bump_data_version
+from query_filters import QueryFilters
+
+TRANSACTIONS = pd.DataFrame({
+    'type': ['Income', 'Expense', 'Expense', 'Expense', 'Income'],
+    'date': pd.to_datetime(['2023-12-31', '2024-01-15', '2024-01-15', '2024-02-03', '2024-02-29']),
+    'item': ['Bonus', 'Coffee', 'Coffee', 'Taxi', 'Salary'],
+    'amount': [1000.5, -150.25, -150.25, -300.5, 50000.0],
+    'currency': ['PHP'] * 5,
+    'category': ['Salary', 'Food & Dining', 'Food & Dining', 'Transportation', 'Salary'],
+    'account': ['BDO', 'GCash', 'GCash', 'Wallet', 'BDO'],
+    'status': ['Reconciled'] * 5,
+})
+
+def sqlite_uri():
+    path = os.path.join(tempfile.mkdtemp(), 'finance.db')
+    uri = f"sqlite:///{path}"
+    TRANSACTIONS.assign(batch_id=None).to_sql('transactions', create_engine(uri), index=False)
+    return uri
+
+def test_write_and_read_snapshot():
+    print("🔍 Testing snapshot write and read...")
+    uri = sqlite_uri()
+    assert fresh_snapshot(uri) is None
+    assert write_snapshot(uri) == len(TRANSACTIONS)
+    assert snapshot_version(uri) == get_data_version()
+    path = fresh_snapshot(uri)
+    assert sorted(name for name in os.listdir(path) if name.startswith('year=')) == ['year=2023', 'year=2024']
+
+    df = read_snapshot(path)
+    assert list(df.columns) == ['date', 'type', 'account', 'category', 'amount']
+    assert len(df) == len(TRANSACTIONS)
+    assert abs(df['amount'].sum() - TRANSACTIONS['amount'].sum()) < 1e-9
+
+    recent = read_snapshot(path, start_date=date(2024, 1, 1))
+    assert len(recent) == 4
+    print("✅ Snapshot round trip and year pruning work")
+
+def test_snapshot_goes_stale():
+    print("🔍 Testing snapshot freshness...")
+    uri = sqlite_uri()
+    write_snapshot(uri)
+    bump_data_version()
+    assert fresh_snapshot(uri) is None
+    write_snapshot(uri, get_data_version())
+    assert fresh_snapshot(uri) is not None
+    # Only MySQL and PostgreSQL query labels are reproduced
+    assert snapshot_query(uri, 'monthly_snapshot', QueryFilters().params()) is None
+    print("✅ Stale snapshots are skipped")
+
+def test_snapshot_aggregates():
+    print("🔍 Testing snapshot aggregates...")
+    uri = sqlite_uri()
+    write_snapshot(uri)
+    path = fresh_snapshot(uri)
+
+    params = QueryFilters(start_date=date(2024, 1, 1), end_date=date(2024, 1, 31)).params()
+    rows = _aggregate(path, 'monthly_snapshot', params, 'mysql')
+    assert rows.to_dict('records') == [
+        {'month': '2024-01', 'type': 'Expense', 'account': 'GCash', 'category': 'Food & Dining', 'amount': -300.5}]
+
+    opening = _aggregate(path, 'opening_balances', params, 'postgresql')
+    assert opening.to_dict('records') == [{'account': 'BDO', 'amount': 1000.5}]
+
+    # ROUND of a MySQL DECIMAL sum rounds halves away from zero, while
+    # PostgreSQL rounds each double precision amount half to even
+    mysql = _aggregate(path, 'monthly_account_amounts', {}, 'mysql')
+    postgres = _aggregate(path, 'monthly_account_amounts', {}, 'postgresql')
+    assert list(mysql['amount']) == [1001.0, -301.0, 50000.0, -301.0]
+    assert list(postgres['amount']) == [1000.0, -300.0, 50000.0, -300.0]
+    assert list(postgres['month']) == list(pd.to_datetime(['2023-12-01', '2024-01-01', '2024-02-01', '2024-02-01']))
+    print("✅ Snapshot aggregates match the SQL queries")
+
+def partition_files(path, year):
+    folder = os.path.join(path, f"year={year}")
+    return {name: os.stat(os.path.join(folder, name)).st_mtime_ns for name in os.listdir(folder)}
+
+def test_update_snapshot_rewrites_touched_years():
+    print("🔍 Testing partition updates after an append...")
+    uri = sqlite_uri()
+    engine = create_engine(uri)
+    write_snapshot(uri)
+    untouched = partition_files(snapshot_path(uri), 2023)
+
+    batch = TRANSACTIONS.iloc[[3]].assign(item='Bus', batch_id='b1')
+    batch.to_sql('transactions', engine, index=False, if_exists='append')
+    version = bump_data_version()
+    assert fresh_snapshot(uri) is None
+    # Only 2024 is read back and rewritten
+    assert update_snapshot(uri, 'b1', version) == 5
+    path = fresh_snapshot(uri)
+    assert path is not None and partition_files(path, 2023) == untouched
+    assert len(read_snapshot(path)) == len(TRANSACTIONS) + 1
+    assert (read_snapshot(path)['amount'] == -300.5).sum() == 2
+
+    # A snapshot that missed an earlier change is written in full
+    bump_data_version()
+    version = bump_data_version()
+    assert update_snapshot(uri, 'b1', version) == len(TRANSACTIONS) + 1
+    assert snapshot_version(uri) == version
+    print("✅ Untouched years kept, touched years rewritten")
+
+if __name__ == "__main__":
+    test_write_and_read_snapshot()
+    test_snapshot_goes_stale()
+    test_snapshot_aggregates()
+    test_update_snapshot_rewrites_touched_years()
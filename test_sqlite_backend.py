@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the embedded SQLite backend
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+from sqlalchemy import text
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+os.environ['SQLITE_DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'finance.db')}"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from engine_registry import connect
+from database_sqlite import get_sqlite_connection, stream_load, drop
+from read_queries_sqlite import query, dashboard_snapshot, filter_options, explain
+from query_filters import QueryFilters
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_transactions.csv')
+
+def index_names(table):
+    with connect(get_sqlite_connection()) as connection:
+        rows = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+                                  {'table': table})
+        return sorted(row[0] for row in rows)
+
+def test_stream_load_and_queries():
+    print("🔍 Testing SQLite load and dashboard queries...")
+    stats = stream_load(SAMPLE)
+    transactions = query('transactions')
+    assert stats['rows'] == len(transactions) > 0
+    assert transactions['fingerprint'].notna().all()
+
+    options = filter_options()
+    assert options['first_day'].min() == transactions['date'].min()
+    snapshot = dashboard_snapshot('weekly')
+    # Weeks start on Monday, as in the MySQL queries
+    assert all(date.fromisoformat(week).weekday() == 0 for week in snapshot['balances']['week'])
+    assert abs(snapshot['balances']['net_worth'].iloc[-1] - transactions['amount'].round().sum()) < 1e-6
+
+    filtered = dashboard_snapshot('daily', QueryFilters(start_date=date(2024, 1, 15), accounts=('BDO',)))
+    assert list(filtered['balances'].columns) == ['day', 'net_worth', 'BDO']
+    assert filtered['balances']['day'].min() >= '2024-01-15'
+    print("✅ SQLite queries answer the dashboard")
+
+def test_reload_keeps_indexes():
+    print("🔍 Testing reload indexes and WAL mode...")
+    stream_load(SAMPLE)
+    before = index_names('transactions')
+    stream_load(SAMPLE)
+    assert index_names('transactions') == before
+    assert 'idx_transactions_date_cover' in before and 'idx_raw_transactions_fingerprint' in index_names('raw_transactions')
+    with connect(get_sqlite_connection()) as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+    plan = ' '.join(explain('daily_snapshot')['detail'])
+    assert 'COVERING INDEX idx_transactions_date_cover' in plan
+    print("✅ Indexes rebuilt on every reload")
+
+def test_drop():
+    stream_load(SAMPLE)
+    drop('transactions')
+    assert query('transactions').empty
+
+if __name__ == "__main__":
+    test_stream_load_and_queries()
+    test_reload_keeps_indexes()
+    test_drop()
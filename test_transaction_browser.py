@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the keyset-paginated transaction browser
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+import pandas as pd
+os.environ.setdefault('FINANCE_CACHE_DIR', tempfile.mkdtemp())
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from database_sqlite import stream_load
+from transaction_browser import fetch_page, explain_page, search_pattern, SORTS
+from query_filters import QueryFilters
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_transactions.csv')
+URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'finance.db')}"
+
+def all_pages(filters=None, sort='Newest first', search='', page_size=3):
+    ids, after = [], None
+    while True:
+        page, after = fetch_page(URI, filters, sort, search, after, page_size)
+        assert len(page) <= page_size
+        ids += page['id'].tolist()
+        if after is None:
+            return ids
+
+def test_pages_follow_sort_order():
+    print("🔍 Testing keyset pages...")
+    stream_load(SAMPLE, URI)
+    transactions = fetch_page(URI, page_size=10_000)[0]
+    for sort, (column, descending) in SORTS.items():
+        expected = transactions.sort_values([column, 'id'], ascending=not descending)['id'].tolist()
+        assert all_pages(sort=sort) == expected, sort
+    print(f"✅ {len(transactions)} transactions paged in every sort order")
+
+def test_filters_and_search():
+    print("🔍 Testing filters and search...")
+    transactions = fetch_page(URI, page_size=10_000)[0]
+    filters = QueryFilters(start_date=date(2024, 1, 15), types=('Expense',))
+    dates = pd.to_datetime(transactions['date'])
+    expected = transactions[(dates >= '2024-01-15') & (transactions['type'] == 'Expense')]
+    assert sorted(all_pages(filters, 'Largest amount')) == sorted(expected['id'])
+
+    item = transactions['item'].iloc[0]
+    matches = transactions[transactions['item'].str.contains(item[1:-1], regex=False)]
+    assert sorted(all_pages(search=f"  {item[1:-1]} ")) == sorted(matches['id'])
+    # LIKE wildcards in the search are taken literally
+    assert search_pattern('50%_off!') == '%50!%!_off!!%'
+    assert all_pages(search='%') == []
+    print("✅ Filters and search narrow the pages")
+
+def test_later_pages_seek_the_index():
+    print("🔍 Testing keyset page plans...")
+    for sort, (column, descending) in SORTS.items():
+        after = fetch_page(URI, sort=sort, page_size=3)[1]
+        plan = ' '.join(explain_page(URI, sort=sort, after=after, page_size=3)['detail'])
+        assert f"SEARCH transactions USING INDEX idx_transactions_{column} ({column}" in plan, plan
+    print("✅ Later pages start with an index search")
+
+if __name__ == "__main__":
+    test_pages_follow_sort_order()
+    test_filters_and_search()
+    test_later_pages_seek_the_index()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the column-wise upload validation
+"""
+
+import io
+import os
+import sys
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from validation import validate_transactions, issue_summary, parse_dates
+
+VALID_TYPES = ['Expense', 'Income', 'Transfer']
+VALID_STATUSES = ['Reconciled', 'Pending', 'Void']
+
+EXPORT = """Type,Date,Name,Amount,Currency,Category,Account,Status
+Expense,2024-01-15,Grocery Store,-2500.00,PHP,Food & Dining,Wallet,Reconciled
+Refund,2024-01-16,Monthly Salary,50000.00,PHP,Salary,BDO,Reconciled
+Expense,not a date,Coffee,-150.00,PHP,Food & Dining,GCash,Pending
+Expense,2024-01-18,Taxi,abc,PHP,Transportation,Wallet,Cleared
+Expense,01/19/2024,  ,-300.00,PHP,Transportation,Wallet,Reconciled
+Expense,2024-01-15,Grocery Store,-2500.00,PHP,Food & Dining,Wallet,Reconciled
+"""
+
+def test_validate_transactions():
+    print("🔍 Testing column-wise validation...")
+    df = pd.read_csv(io.StringIO(EXPORT), dtype={'Amount': 'str'})
+    issues = validate_transactions(df, VALID_TYPES, VALID_STATUSES)
+    found = set(zip(issues['row'], issues['column'].fillna(''), issues['rule'], issues['severity']))
+    assert found == {
+        (3, 'Type', 'invalid_type', 'error'),
+        (4, 'Date', 'invalid_date', 'error'),
+        (5, 'Amount', 'invalid_amount', 'error'),
+        (5, 'Status', 'unusual_status', 'warning'),
+        (6, 'Name', 'missing', 'error'),
+        (7, '', 'duplicate_row', 'warning'),
+    }
+    # Issues are reported in CSV line order with the offending value
+    assert list(issues['row']) == sorted(issues['row'])
+    assert issues.loc[issues['rule'] == 'invalid_type', 'value'].item() == 'Refund'
+
+    summary = issue_summary(issues)
+    assert summary['count'].sum() == len(issues)
+    print("✅ Every failed check reported once")
+
+def test_clean_and_empty_exports():
+    print("📭 Testing clean and empty exports...")
+    df = pd.read_csv(io.StringIO(EXPORT)).iloc[[0]]
+    assert validate_transactions(df, VALID_TYPES, VALID_STATUSES).empty
+
+    issues = validate_transactions(df.head(0), VALID_TYPES, VALID_STATUSES)
+    assert list(issues['rule']) == ['empty_file']
+    print("✅ Clean export passes, empty export is rejected")
+
+def test_parse_dates():
+    print("📅 Testing date parsing...")
+    dates = pd.Series(['2024-01-15', '2024-01-15', '01/19/2024', None, 'garbage'])
+    parsed = parse_dates(dates)
+    assert parsed[0] == parsed[1] == pd.Timestamp('2024-01-15')
+    # Dates in a second format are still accepted
+    assert parsed[2] == pd.Timestamp('2024-01-19')
+    assert parsed[3:].isna().all()
+    print("✅ Mixed date formats parsed")
+
+if __name__ == "__main__":
+    test_validate_transactions()
+    test_clean_and_empty_exports()
+    test_parse_dates()
+    print("🎉 Validation tests passed!")
@@ -8,6 +8,11 @@ import sys
 import os
 from urllib.parse import quote_plus
 from sqlalchemy import create_engine, text
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from rollups import refresh_rollups
+from snapshot import refresh_snapshot
+from data_version import bump_data_version
 
 def load_env_directly():
     """Load environment variables directly from .env file"""
@@ -75,6 +80,11 @@ def upload_sample_data():
             
             conn.commit()
         
+        # The dashboard reads the rollup tables and the Parquet snapshot, not transactions
+        print("📈 Refreshing rollup tables...")
+        refresh_rollups(connection_string)
+        refresh_snapshot(connection_string, bump_data_version())
+        
         print("✅ Sample data uploaded successfully!")
         
         # Show summary